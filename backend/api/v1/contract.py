@@ -1,6 +1,16 @@
+from http import HTTPStatus
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
 from fastapi.responses import StreamingResponse
 
 from app.container import Container
@@ -10,7 +20,11 @@ from app.contract.contract_models import (
     ContractResponse,
     ContractResponseWithReview,
     ContractReviewCreateRequest,
+    ContractReviewJobResponse,
+    ContractReviewSharingRequest,
+    ContractSummary,
 )
+from app.contract.contract_upload import ContractUpload, ContractUploadTooLarge
 from app.user.user_models import User
 from core.dependencies.authentication import AuthenticationRequired
 from core.dependencies.current_user import get_current_user
@@ -27,6 +41,8 @@ contract_router = APIRouter()
 async def upload_contract(
     title: str = Form(...),
     file: UploadFile = File(...),
+    link_review: bool = Form(False),
+    previous_contract_id: Optional[str] = Form(None),
     current_user: User = Depends(get_current_user),
     contract_controller: ContractController = Depends(
         Container.get_contract_controller
@@ -37,31 +53,48 @@ async def upload_contract(
 
     print("Creating contract 0")
 
-    pdf_content = await file.read()
-    return await contract_controller.create_contract(
-        title=title,
-        file_content=pdf_content,
-        current_user=current_user,
-    )
+    # Read in chunks into a spooled buffer, rather than into memory at once
+    try:
+        upload = await ContractUpload.from_upload_file(file)
+    except ContractUploadTooLarge as e:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+        )
+
+    try:
+        return await contract_controller.create_contract(
+            title=title,
+            upload=upload,
+            current_user=current_user,
+            link_review=link_review,
+            previous_contract_id=previous_contract_id,
+        )
+    finally:
+        upload.close()
 
 
 @contract_router.get(
     "/all",
-    response_model=List[ContractResponse],
+    response_model=List[ContractSummary],
     dependencies=[Depends(AuthenticationRequired)],
 )
 async def get_all_contracts(
+    response: Response,
     current_user: User = Depends(get_current_user),
     contract_controller: ContractController = Depends(
         Container.get_contract_controller
     ),
     limit: Optional[int] = Query(None, gt=0),
     page: Optional[int] = Query(None, gt=0),
-) -> List[ContractResponse]:
+    cursor: Optional[str] = Query(None),
+) -> List[ContractSummary]:
+    # The cursor of the next page is returned in the X-Next-Cursor header
     contracts = await contract_controller.get_all_contracts(
-        current_user=current_user, limit=limit, page=page
+        current_user=current_user, limit=limit, page=page, cursor=cursor
     )
-    return contracts
+    if contracts.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = contracts.next_cursor
+    return contracts.items
 
 
 @contract_router.get(
@@ -101,6 +134,95 @@ async def review_contract(
     return contract
 
 
+@contract_router.post(
+    "/{contract_id}/review/stream",
+    dependencies=[Depends(AuthenticationRequired)],
+)
+async def review_contract_stream(
+    contract_id: str,
+    payload: ContractReviewCreateRequest,
+    current_user: User = Depends(get_current_user),
+    contract_controller: ContractController = Depends(
+        Container.get_contract_controller
+    ),
+) -> StreamingResponse:
+    return await contract_controller.review_contract_stream(
+        contract_id=contract_id, current_user=current_user, payload=payload
+    )
+
+
+@contract_router.post(
+    "/{contract_id}/review/resume",
+    response_model=ContractResponseWithReview,
+    dependencies=[Depends(AuthenticationRequired)],
+)
+async def resume_contract_review(
+    contract_id: str,
+    current_user: User = Depends(get_current_user),
+    contract_controller: ContractController = Depends(
+        Container.get_contract_controller
+    ),
+) -> ContractResponseWithReview:
+    return await contract_controller.resume_contract_review(
+        contract_id=contract_id, current_user=current_user
+    )
+
+
+@contract_router.post(
+    "/{contract_id}/review/jobs",
+    response_model=ContractReviewJobResponse,
+    status_code=202,
+    dependencies=[Depends(AuthenticationRequired)],
+)
+async def create_contract_review_job(
+    contract_id: str,
+    payload: ContractReviewCreateRequest,
+    current_user: User = Depends(get_current_user),
+    contract_controller: ContractController = Depends(
+        Container.get_contract_controller
+    ),
+) -> ContractReviewJobResponse:
+    return await contract_controller.enqueue_review_job(
+        contract_id=contract_id, current_user=current_user, payload=payload
+    )
+
+
+@contract_router.get(
+    "/{contract_id}/review/jobs/{job_id}",
+    response_model=ContractReviewJobResponse,
+    dependencies=[Depends(AuthenticationRequired)],
+)
+async def get_contract_review_job(
+    contract_id: str,
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    contract_controller: ContractController = Depends(
+        Container.get_contract_controller
+    ),
+) -> ContractReviewJobResponse:
+    return await contract_controller.get_review_job(
+        contract_id=contract_id, job_id=job_id, current_user=current_user
+    )
+
+
+@contract_router.put(
+    "/{contract_id}/review/sharing",
+    response_model=ContractResponse,
+    dependencies=[Depends(AuthenticationRequired)],
+)
+async def set_contract_review_sharing(
+    contract_id: str,
+    payload: ContractReviewSharingRequest,
+    current_user: User = Depends(get_current_user),
+    contract_controller: ContractController = Depends(
+        Container.get_contract_controller
+    ),
+) -> ContractResponse:
+    return await contract_controller.set_review_sharing(
+        contract_id=contract_id, current_user=current_user, shared=payload.shared
+    )
+
+
 @contract_router.post(
     "/{contract_id}/explain-clause",
     dependencies=[Depends(AuthenticationRequired)],
@@ -1,5 +1,6 @@
 from app.analytics.analytics_models import Analytics, AnalyticsIncrementRequest
 from app.analytics.analytics_repository import AnalyticsRepository, AnalyticsResponse
+from app.shared.models.mongodb_models import PyObjectId
 from app.user.user_models import User
 
 
@@ -13,11 +14,22 @@ class AnalyticsController:
         """
         Increment analytics fields for a user.
         """
+        return await self.increment_analytics_fields_by_user_id(
+            user_id=current_user.id, increment_data=increment_data
+        )
+
+    async def increment_analytics_fields_by_user_id(
+        self, user_id: PyObjectId, increment_data: AnalyticsIncrementRequest
+    ) -> AnalyticsResponse:
+        """
+        Increment analytics fields for a user, e.g. from a background job where
+        no authenticated user is available.
+        """
         analytics = await self.analytics_repo.increment_analytics(
-            current_user.id, increment_data
+            user_id, increment_data
         )
         if analytics is None:
-            analytics = Analytics(user_id=current_user.id)
+            analytics = Analytics(user_id=user_id)
             for key, value in increment_data.model_dump().items():
                 if key == "contracts_reviewed":
                     for contract_type, count in value.items():
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Dict
 
-from pydantic import Field
+from pydantic import Field, computed_field
 
 from app.contract.contract_models import ContractType
 from app.shared.models.mongodb_models import CoreBaseModel, PyObjectId
@@ -21,6 +21,8 @@ class Analytics(CoreBaseModel):
     total_contracts: int = 0
     total_pages: int = 0
     total_tokens_used: int = 0
+    total_uploads: int = 0
+    deduplicated_uploads: int = 0  # Uploads that reused an earlier upload's parse
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow)
 
@@ -37,6 +39,8 @@ class AnalyticsUpdateRequest(CoreBaseModel):
     total_contracts: int = 0
     total_pages: int = 0
     total_tokens_used: int = 0
+    total_uploads: int = 0
+    deduplicated_uploads: int = 0
 
 
 class AnalyticsIncrementRequest(CoreBaseModel):
@@ -46,6 +50,8 @@ class AnalyticsIncrementRequest(CoreBaseModel):
     total_contracts: int = 0
     total_pages: int = 0
     total_tokens_used: int = 0
+    total_uploads: int = 0
+    deduplicated_uploads: int = 0
 
 
 #####################################################################
@@ -54,4 +60,10 @@ class AnalyticsIncrementRequest(CoreBaseModel):
 
 
 class AnalyticsResponse(Analytics):
-    pass
+    @computed_field
+    @property
+    def upload_dedup_hit_rate(self) -> float:
+        """Fraction of uploads that reused an earlier upload's parse."""
+        if not self.total_uploads:
+            return 0.0
+        return self.deduplicated_uploads / self.total_uploads
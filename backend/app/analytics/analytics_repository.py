@@ -1,4 +1,6 @@
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import IndexModel
 
 from app.analytics.analytics_models import (
     Analytics,
@@ -6,10 +8,22 @@ from app.analytics.analytics_models import (
     AnalyticsResponse,
     AnalyticsUpdateRequest,
 )
+from core.database.indexes import IndexedRepository, RepositoryQuery
 from core.utils.datetime import utcnow
 
 
-class AnalyticsRepository:
+class AnalyticsRepository(IndexedRepository):
+    INDEXES = {
+        "collection": [IndexModel([("user_id", 1)], name="user_id", unique=True)],
+    }
+    QUERIES = [
+        RepositoryQuery(
+            name="get analytics by user",
+            collection="collection",
+            filter={"user_id": ObjectId()},
+        ),
+    ]
+
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
 
@@ -1,9 +1,21 @@
+from typing import List
+
 from app.analytics.analytics_controller import AnalyticsController
 from app.analytics.analytics_repository import AnalyticsRepository
 from app.contract.contract_controller import ContractController, ContractRepository
+from app.contract.contract_models import ContractReviewJob
+from app.contract.contract_review_cache import ClauseReviewCache
+from app.contract.contract_review_queue import (
+    BaseReviewJobQueue,
+    InProcessReviewJobQueue,
+    MongoReviewJobQueue,
+)
 from app.user.user_controller import UserController
 from app.user.user_repository import UserRepository
+from core.cache import MongoBackend, RedisBackend
 from core.config import config
+from core.database.codecs import get_text_codec
+from core.database.indexes import IndexedRepository, QueryPlan
 from core.database.mongodb import get_collection
 
 
@@ -13,6 +25,8 @@ class Container:
     Provides static access to dependencies.
     """
 
+    _in_process_review_job_queue: InProcessReviewJobQueue = None
+
     @classmethod
     async def get_user_repository(cls) -> UserRepository:
         collection = await get_collection(
@@ -25,11 +39,27 @@ class Container:
         contracts_collection = await get_collection(
             config.MONGODB_DATABASES.CORE, config.MONGODB_COLLECTIONS.CONTRACTS
         )
+        contract_bodies_collection = await get_collection(
+            config.MONGODB_DATABASES.CORE, config.MONGODB_COLLECTIONS.CONTRACT_BODIES
+        )
         contract_reviews_collection = await get_collection(
             config.MONGODB_DATABASES.CORE, config.MONGODB_COLLECTIONS.CONTRACT_REVIEWS
         )
 
-        return ContractRepository(contracts_collection, contract_reviews_collection)
+        contract_review_jobs_collection = await get_collection(
+            config.MONGODB_DATABASES.CORE,
+            config.MONGODB_COLLECTIONS.CONTRACT_REVIEW_JOBS,
+        )
+
+        return ContractRepository(
+            contracts_collection,
+            contract_reviews_collection,
+            contract_review_jobs_collection,
+            contract_bodies_collection,
+            body_codec=get_text_codec(config.CONTRACT_BODY_CODEC),
+            body_min_bytes=config.CONTRACT_BODY_MIN_COMPRESS_BYTES,
+            html_patch=config.CONTRACT_BODY_HTML_PATCH,
+        )
 
     @classmethod
     async def get_analytics_repository(cls) -> AnalyticsRepository:
@@ -38,6 +68,39 @@ class Container:
         )
         return AnalyticsRepository(analytics_collection)
 
+    @classmethod
+    async def get_clause_review_cache(cls) -> ClauseReviewCache | None:
+        if not config.CLAUSE_REVIEW_CACHE_ENABLED:
+            return None
+
+        if config.CLAUSE_REVIEW_CACHE_BACKEND == "redis":
+            return ClauseReviewCache(RedisBackend())
+
+        cache_collection = await get_collection(
+            config.MONGODB_DATABASES.CORE,
+            config.MONGODB_COLLECTIONS.CLAUSE_REVIEW_CACHE,
+        )
+        return ClauseReviewCache(MongoBackend(cache_collection))
+
+    @classmethod
+    async def get_review_job_queue(cls) -> BaseReviewJobQueue:
+        contract_repo = await cls.get_contract_repository()
+
+        if config.REVIEW_JOB_QUEUE_BACKEND == "in_process":
+            # Shared by every request so that its workers outlive them
+            if cls._in_process_review_job_queue is None:
+                cls._in_process_review_job_queue = InProcessReviewJobQueue(
+                    contract_repo, handler=cls.run_review_job
+                )
+            return cls._in_process_review_job_queue
+
+        return MongoReviewJobQueue(contract_repo)
+
+    @classmethod
+    async def run_review_job(cls, job: ContractReviewJob) -> None:
+        contract_controller = await cls.get_contract_controller()
+        await contract_controller.run_review_job(job)
+
     @classmethod
     async def get_user_controller(cls) -> UserController:
         user_repo = await cls.get_user_repository()
@@ -47,11 +110,40 @@ class Container:
     async def get_contract_controller(cls) -> ContractController:
         contract_repo = await cls.get_contract_repository()
         analytics_controller = await cls.get_analytics_controller()
+        clause_review_cache = await cls.get_clause_review_cache()
+        review_job_queue = await cls.get_review_job_queue()
         return ContractController(
-            contract_repo=contract_repo, analytics_controller=analytics_controller
+            contract_repo=contract_repo,
+            analytics_controller=analytics_controller,
+            clause_review_cache=clause_review_cache,
+            review_job_queue=review_job_queue,
         )
 
     @classmethod
     async def get_analytics_controller(cls) -> AnalyticsController:
         analytics_repo = await cls.get_analytics_repository()
         return AnalyticsController(analytics_repo=analytics_repo)
+
+    @classmethod
+    async def get_indexed_repositories(cls) -> List[IndexedRepository]:
+        return [
+            await cls.get_user_repository(),
+            await cls.get_contract_repository(),
+            await cls.get_analytics_repository(),
+        ]
+
+    @classmethod
+    async def ensure_indexes(cls) -> List[str]:
+        """Create the indexes every repository declares, if they do not exist."""
+        names = []
+        for repository in await cls.get_indexed_repositories():
+            names += await repository.ensure_indexes()
+        return names
+
+    @classmethod
+    async def explain_queries(cls) -> List[QueryPlan]:
+        """Explain the queries every repository declares."""
+        plans = []
+        for repository in await cls.get_indexed_repositories():
+            plans += await repository.explain_queries()
+        return plans
@@ -0,0 +1,300 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from app.contract.contract_models import Clause
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def _get_encoding(model: str):
+    """
+    Load (once per process) the tiktoken encoding for a model, or None if the
+    tokenizer is unavailable, e.g. when its BPE files cannot be downloaded.
+    """
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(
+            f"Tokenizer unavailable for {model}, falling back to estimates: {e}"
+        )
+        return None
+
+
+class ClauseBatchPlanner:
+    """
+    Packs contract clauses into LLM request batches by token count.
+
+    Each batch is filled until either the prompt token budget or the expected
+    completion token budget would be exceeded. Clauses too large to fit into a
+    single request on their own are split into parts whose keys are suffixed
+    with `PART_SEPARATOR`; use `source_key` to map results back.
+    """
+
+    PART_SEPARATOR = "#part-"
+    # Tokens used by the per-clause framing in the batch prompt,
+    # e.g. "Clause 12 (Key: clause-345):\n"
+    CLAUSE_FRAMING_TOKENS = 16
+    # Rough characters per token, used when the tokenizer is unavailable
+    CHARS_PER_TOKEN = 4
+    # Tokens kept of each clause in a digest, however many clauses there are
+    MIN_DIGEST_CLAUSE_TOKENS = 24
+
+    def __init__(
+        self,
+        model: str,
+        prompt_token_budget: int,
+        completion_token_budget: int,
+        completion_tokens_per_clause: int,
+        max_clauses_per_batch: Optional[int] = None,
+    ):
+        self.model = model
+        self.prompt_token_budget = prompt_token_budget
+        self.completion_token_budget = completion_token_budget
+        self.completion_tokens_per_clause = completion_tokens_per_clause
+        self.max_clauses_per_batch = max_clauses_per_batch
+
+    @staticmethod
+    def source_key(key: str) -> str:
+        """
+        Return the key of the clause a (possibly split) clause part came from.
+        """
+        return key.split(ClauseBatchPlanner.PART_SEPARATOR, 1)[0]
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens in a text for the planner's model.
+
+        Args:
+            text (str): The text to count.
+
+        Returns:
+            int: The exact token count, or an estimate if no tokenizer is available.
+        """
+        encoding = _get_encoding(self.model)
+        if encoding is None:
+            return -(-len(text) // self.CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def plan(
+        self,
+        clauses: List[Clause],
+        fixed_prompt: str,
+        max_clauses_per_batch: Optional[int] = None,
+        sections: Optional[Dict[str, str]] = None,
+    ) -> List[List[Clause]]:
+        """
+        Plan the request batches for a list of clauses.
+
+        With `sections`, consecutive clauses of the same section are kept in
+        the same batch: a batch that cannot fit the next section as a whole
+        is closed, and the section starts a new batch. Sections too large for
+        a single batch start a new batch and are split across as few batches
+        as possible. Small sections still share batches.
+
+        Args:
+            clauses (List[Clause]): The clauses to be analyzed, in contract order.
+            fixed_prompt (str): The parts of the prompt sent with every batch
+                (system prompt and instructions), used to size the clause budget.
+            max_clauses_per_batch (Optional[int]): Overrides the planner's cap on
+                the number of clauses per batch.
+            sections (Optional[Dict[str, str]]): The section of each clause, by
+                clause key. Clauses without one are batched on their own terms.
+
+        Returns:
+            List[List[Clause]]: The batches, preserving clause order.
+        """
+        clause_budget = self.prompt_token_budget - self.count_tokens(fixed_prompt)
+        max_clause_tokens = clause_budget - self.CLAUSE_FRAMING_TOKENS
+        if max_clause_tokens <= 0:
+            raise ValueError(
+                "Prompt token budget is too small to fit any clause alongside the prompt."
+            )
+
+        max_clauses = max(
+            1, self.completion_token_budget // self.completion_tokens_per_clause
+        )
+        max_clauses_per_batch = max_clauses_per_batch or self.max_clauses_per_batch
+        if max_clauses_per_batch:
+            max_clauses = min(max_clauses, max_clauses_per_batch)
+
+        batches = []
+        batch: List[Clause] = []
+        batch_tokens = 0
+
+        for group in self._group_by_section(clauses, sections):
+            parts = [
+                (part, self.count_tokens(part.content) + self.CLAUSE_FRAMING_TOKENS)
+                for clause in group
+                for part in self._split_oversized_clause(clause, max_clause_tokens)
+            ]
+            group_tokens = sum(part_tokens for _, part_tokens in parts)
+            if batch and (
+                batch_tokens + group_tokens > clause_budget
+                or len(batch) + len(parts) > max_clauses
+            ):
+                # Start the section in a new batch rather than splitting it
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+
+            for part, part_tokens in parts:
+                if batch and (
+                    batch_tokens + part_tokens > clause_budget
+                    or len(batch) >= max_clauses
+                ):
+                    batches.append(batch)
+                    batch, batch_tokens = [], 0
+                batch.append(part)
+                batch_tokens += part_tokens
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def digest(
+        self,
+        clauses: List[Clause],
+        token_budget: int,
+        sections: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Condense a contract's clauses into a digest of about `token_budget`
+        tokens, to summarize the contract without sending it whole.
+
+        Each clause is cut to an equal share of the budget (its beginning,
+        where a clause usually says what it is about). The first clause of
+        every section is included before any other, so that the digest spans
+        the whole contract; if even those do not fit, they are sampled evenly
+        across it. The remaining budget goes to the other clauses in contract
+        order. Clauses left out are counted at the end.
+
+        Args:
+            clauses (List[Clause]): The contract's clauses, in contract order.
+            token_budget (int): The tokens the digest may take.
+            sections (Optional[Dict[str, str]]): The section of each clause, by
+                clause key. Without them, every clause is a section of its own.
+
+        Returns:
+            str: The digest, one line per clause, under their sections.
+        """
+        if not clauses:
+            return ""
+
+        clause_tokens = max(self.MIN_DIGEST_CLAUSE_TOKENS, token_budget // len(clauses))
+        lines = {
+            clause.key: f"- {clause.key}: {self._truncate(clause.content, clause_tokens)}"
+            for clause in clauses
+        }
+        line_tokens = {key: self.count_tokens(line) + 1 for key, line in lines.items()}
+
+        groups = self._group_by_section(clauses, sections)
+        firsts = [group[0] for group in groups]
+        firsts_tokens = sum(line_tokens[clause.key] for clause in firsts)
+        if firsts_tokens > token_budget:
+            stride = firsts_tokens / token_budget
+            firsts = [firsts[int(i * stride)] for i in range(int(len(firsts) / stride))]
+
+        included = set()
+        used_tokens = 0
+        for clause in firsts + [clause for group in groups for clause in group[1:]]:
+            if used_tokens + line_tokens[clause.key] > token_budget:
+                break
+            included.add(clause.key)
+            used_tokens += line_tokens[clause.key]
+
+        digest_lines = []
+        for group in groups:
+            group_lines = [lines[c.key] for c in group if c.key in included]
+            section = sections.get(group[0].key) if sections else None
+            if group_lines and section is not None:
+                digest_lines.append(f"Section {section}:")
+            digest_lines.extend(group_lines)
+        if len(included) < len(clauses):
+            digest_lines.append(f"({len(clauses) - len(included)} clauses not shown)")
+        return "\n".join(digest_lines)
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut a text to about its first `max_tokens` tokens, on a word boundary."""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        return self._pack_units(text.split(), max_tokens, None)[0] + " ..."
+
+    @staticmethod
+    def _group_by_section(
+        clauses: List[Clause], sections: Optional[Dict[str, str]]
+    ) -> List[List[Clause]]:
+        """
+        Group consecutive clauses of the same section. Without sections (or
+        for clauses without one), every clause is a group of its own.
+        """
+        groups: List[List[Clause]] = []
+        previous_section = None
+        for clause in clauses:
+            section = sections.get(clause.key) if sections else None
+            if groups and section is not None and section == previous_section:
+                groups[-1].append(clause)
+            else:
+                groups.append([clause])
+            previous_section = section
+        return groups
+
+    def _split_oversized_clause(self, clause: Clause, max_tokens: int) -> List[Clause]:
+        """
+        Split a clause that does not fit into a single request into parts.
+
+        Sentences are kept whole where possible; a single sentence larger than
+        the budget is split on word boundaries.
+        """
+        if self.count_tokens(clause.content) <= max_tokens:
+            return [clause]
+
+        pieces = self._pack_units(
+            re.split(r"(?<=[.;:])\s+", clause.content),
+            max_tokens,
+            lambda sentence: self._pack_units(sentence.split(), max_tokens, None),
+        )
+        logger.debug(f"Split oversized clause {clause.key} into {len(pieces)} parts")
+
+        return [
+            Clause(key=f"{clause.key}{self.PART_SEPARATOR}{number}", content=piece)
+            for number, piece in enumerate(pieces, start=1)
+        ]
+
+    def _pack_units(
+        self,
+        units: List[str],
+        max_tokens: int,
+        split_unit: Optional[Callable[[str], List[str]]],
+    ) -> List[str]:
+        """
+        Greedily join text units (sentences or words) into pieces of at most
+        `max_tokens` tokens, splitting units that are too large on their own.
+        """
+        pieces = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for unit in units:
+            unit_tokens = self.count_tokens(unit) + 1
+            if unit_tokens > max_tokens and split_unit is not None:
+                if current:
+                    pieces.append(" ".join(current))
+                    current, current_tokens = [], 0
+                pieces.extend(split_unit(unit))
+                continue
+            if current and current_tokens + unit_tokens > max_tokens:
+                pieces.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit_tokens
+
+        if current:
+            pieces.append(" ".join(current))
+        return pieces
@@ -0,0 +1,117 @@
+import hashlib
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+from app.contract.contract_clause_index import NUMBER_PATTERN
+from app.contract.contract_models import Clause, ClauseDiff
+from app.contract.contract_review_cache import ClauseReviewCache
+
+# Minimum similarity (0 to 1) of the normalized texts of two clauses for the
+# new one to be a modification of the old one, rather than a removed and an
+# added clause
+MODIFIED_CLAUSE_MIN_SIMILARITY = 0.5
+
+
+def normalize_clause_text(text: str) -> str:
+    """
+    Normalize clause text for comparing versions: formatting-only differences
+    are ignored (as by the clause review cache), and so is the clause number,
+    so that clauses renumbered by an insertion earlier in the contract are
+    unchanged.
+    """
+    text = ClauseReviewCache.normalize_clause_text(text)
+    match = NUMBER_PATTERN.match(text)
+    return text[match.end() :].lstrip() if match else text
+
+
+def diff_clauses(previous: List[Clause], current: List[Clause]) -> ClauseDiff:
+    """
+    Compute the clause-level diff between two versions of a contract.
+
+    Clauses are aligned by the hashes of their normalized text (longest
+    matching runs first, as `difflib` does). A clause in place of others is a
+    modification of the most similar of them, if it is similar enough, and an
+    addition otherwise. Added clauses whose text matches a removed one
+    (clauses moved elsewhere in the contract) are unchanged.
+
+    Args:
+        previous (List[Clause]): The clauses of the previous version.
+        current (List[Clause]): The clauses of the new version.
+
+    Returns:
+        ClauseDiff: The diff, with the clauses of the new version by key.
+    """
+    previous_texts = [normalize_clause_text(clause.content) for clause in previous]
+    current_texts = [normalize_clause_text(clause.content) for clause in current]
+    previous_hashes = [_hash(text) for text in previous_texts]
+    current_hashes = [_hash(text) for text in current_texts]
+
+    unchanged: Dict[str, str] = {}
+    modified: Dict[str, str] = {}
+    added: List[int] = []
+    removed: List[int] = []
+
+    matcher = SequenceMatcher(None, previous_hashes, current_hashes, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                unchanged[current[j].key] = previous[i].key
+            continue
+
+        # Pair each new clause with the most similar replaced clause, if any
+        candidates = list(range(i1, i2))
+        for j in range(j1, j2):
+            best, best_similarity = None, MODIFIED_CLAUSE_MIN_SIMILARITY
+            for i in candidates:
+                similarity = _similarity(
+                    previous_texts[i], current_texts[j], best_similarity
+                )
+                if similarity >= best_similarity:
+                    best, best_similarity = i, similarity
+            if best is None:
+                added.append(j)
+            else:
+                candidates.remove(best)
+                modified[current[j].key] = previous[best].key
+        removed.extend(candidates)
+
+    # Clauses moved to another position
+    removed_by_hash: Dict[str, List[int]] = {}
+    for i in removed:
+        removed_by_hash.setdefault(previous_hashes[i], []).append(i)
+    moved_from = set()
+    added_keys = []
+    for j in sorted(added):
+        matches = removed_by_hash.get(current_hashes[j])
+        if matches:
+            i = matches.pop(0)
+            moved_from.add(i)
+            unchanged[current[j].key] = previous[i].key
+        else:
+            added_keys.append(current[j].key)
+
+    order = {clause.key: position for position, clause in enumerate(current)}
+    return ClauseDiff(
+        unchanged=dict(sorted(unchanged.items(), key=lambda item: order[item[0]])),
+        modified=modified,
+        added=added_keys,
+        removed=[previous[i].key for i in sorted(removed) if i not in moved_from],
+    )
+
+
+def _hash(normalized_text: str) -> str:
+    return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+
+def _similarity(previous_text: str, current_text: str, minimum: float) -> float:
+    """
+    The similarity (0 to 1) of two clause texts, or 0 when it is below
+    `minimum`, cheaply ruled out first.
+    """
+    # Compare words rather than characters, which is much faster on long clauses
+    matcher = SequenceMatcher(
+        None, previous_text.split(), current_text.split(), autojunk=False
+    )
+    if matcher.real_quick_ratio() < minimum or matcher.quick_ratio() < minimum:
+        return 0.0
+    return matcher.ratio()
@@ -0,0 +1,187 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from app.contract.contract_clause_marker import VOID_ELEMENTS
+from app.contract.contract_models import ClauseIndex, ClauseIndexEntry
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# A clause or heading number at the start of its text, e.g. "1.", "1.1",
+# "2.3.4" or "Section 4"
+NUMBER_PATTERN = re.compile(
+    r"^(?:(?:section|article|clause)\s+(\d+(?:\.\d+)*)\.?"
+    r"|(\d+(?:\.\d+)+)\.?|(\d+)[.)])(?:\s|$)",
+    re.IGNORECASE,
+)
+# Maximum length of the heading text used as the section of unnumbered clauses
+MAX_SECTION_TITLE_LENGTH = 80
+
+
+def build_clause_index(html: str) -> ClauseIndex:
+    """
+    Build the hierarchical index of the clauses marked in contract HTML.
+
+    Clauses are the list items with a `data-clause-id`. A clause nested in
+    another one (directly or through unmarked list items) is its child. The
+    number of a clause is read from the start of its text (e.g. "1.1"), and
+    its section is the top-level part of its number, or else the section of
+    its parent, or else the section of the heading it follows. Pages are read
+    from the `data-page-start` and `data-page-end` attributes of list items,
+    when the PDF to HTML engine provides them.
+
+    Args:
+        html (str): The HTML with marked clauses, as stored with the contract.
+
+    Returns:
+        ClauseIndex: The index, in contract order.
+    """
+    parser = _ClauseIndexParser(html)
+    parser.feed(html)
+    parser.close()
+    return ClauseIndex(entries=parser.entries)
+
+
+def number_of(text: str) -> Optional[str]:
+    """The clause or section number at the start of a text, e.g. "2.3"."""
+    match = NUMBER_PATTERN.match(text.strip())
+    if match is None:
+        return None
+    return next(group for group in match.groups() if group)
+
+
+class _OpenElement:
+    def __init__(self, tag: str, entry: Optional[ClauseIndexEntry] = None):
+        self.tag = tag
+        self.entry = entry  # For clauses
+        self.text: List[str] = []  # Own text, up to a nested list item or heading
+
+
+class _ClauseIndexParser(HTMLParser):
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self.entries: Dict[str, ClauseIndexEntry] = {}
+        self._line_offsets = [0] + [
+            match.end() for match in re.finditer(r"\r\n|\r|\n", html)
+        ]
+        self._open: List[_OpenElement] = []
+        self._open_tag_counts: Dict[str, int] = {}
+        self._section: Optional[str] = None  # From the last heading
+        # The element collecting the text that numbers it (a clause or heading)
+        self._numbered: Optional[_OpenElement] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in VOID_ELEMENTS:
+            return
+        element = _OpenElement(tag)
+        if tag in HEADING_TAGS:
+            self._end_numbering()
+            self._numbered = element
+        elif tag == "li":
+            self._end_numbering()
+            attributes = dict(attrs)
+            key = attributes.get("data-clause-id")
+            if key:
+                element.entry = self._add_entry(key, attributes)
+                self._numbered = element
+        self._push(element)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._pop_to(tag, self._offset())
+
+    def handle_endtag(self, tag: str):
+        start = self._offset()
+        end = self.html.find(">", start)
+        self._pop_to(tag, end + 1 if end >= 0 else len(self.html))
+
+    def handle_data(self, data: str):
+        if self._numbered is not None:
+            self._numbered.text.append(data)
+
+    def close(self):
+        super().close()
+        while self._open:
+            self._pop(len(self.html))
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_offsets[line - 1] + column
+
+    def _add_entry(self, key: str, attributes: Dict[str, Optional[str]]):
+        parent = next(
+            (element.entry for element in reversed(self._open) if element.entry),
+            None,
+        )
+        entry = ClauseIndexEntry(
+            key=key,
+            parent=parent.key if parent is not None else None,
+            depth=parent.depth + 1 if parent is not None else 0,
+            page_start=_page(attributes.get("data-page-start")),
+            page_end=_page(attributes.get("data-page-end")),
+            offset_start=self._offset(),
+            offset_end=len(self.html),
+        )
+        if parent is not None:
+            parent.children.append(key)
+            entry.page_start = entry.page_start or parent.page_start
+            entry.page_end = entry.page_end or parent.page_end
+        self.entries[key] = entry
+        return entry
+
+    def _end_numbering(self) -> None:
+        """Number the clause or heading whose leading text was collected."""
+        element, self._numbered = self._numbered, None
+        if element is None:
+            return
+
+        text = " ".join("".join(element.text).split())
+        number = number_of(text)
+        if element.entry is None:
+            # A heading starts a section
+            if number is not None:
+                self._section = number.split(".")[0]
+            elif text:
+                self._section = text[:MAX_SECTION_TITLE_LENGTH]
+            return
+
+        entry = element.entry
+        entry.number = number
+        parent = self.entries.get(entry.parent) if entry.parent else None
+        if number is not None and (parent is None or parent.section is None):
+            entry.section = number.split(".")[0]
+        elif parent is not None:
+            entry.section = parent.section
+        else:
+            entry.section = self._section
+        if entry.parent is None and number is not None:
+            # Later unnumbered clauses (e.g. after a list) stay in its section
+            self._section = entry.section
+
+    def _push(self, element: _OpenElement) -> None:
+        self._open.append(element)
+        self._open_tag_counts[element.tag] = (
+            self._open_tag_counts.get(element.tag, 0) + 1
+        )
+
+    def _pop_to(self, tag: str, end_offset: int) -> None:
+        # End tags close the most recent open element with the same name and
+        # the elements opened after it (as the clause markers do)
+        if not self._open_tag_counts.get(tag):
+            return
+        while self._pop(end_offset) != tag:
+            pass
+
+    def _pop(self, end_offset: int) -> str:
+        element = self._open.pop()
+        self._open_tag_counts[element.tag] -= 1
+        if element is self._numbered:
+            self._end_numbering()
+        if element.entry is not None:
+            element.entry.offset_end = end_offset
+        return element.tag
+
+
+def _page(value: Optional[str]) -> Optional[int]:
+    return int(value) if value and value.isdigit() else None
@@ -0,0 +1,309 @@
+import html
+from abc import ABC, abstractmethod
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple, Type
+
+from bs4 import BeautifulSoup
+
+from app.contract.contract_models import Clause
+from core.config import config
+
+CLAUSE_LOCATION = "section"
+
+# Elements without content or end tag (as treated by BeautifulSoup)
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "basefont",
+    "bgsound",
+    "br",
+    "col",
+    "command",
+    "embed",
+    "frame",
+    "hr",
+    "image",
+    "img",
+    "input",
+    "isindex",
+    "keygen",
+    "link",
+    "menuitem",
+    "meta",
+    "nextid",
+    "param",
+    "source",
+    "spacer",
+    "track",
+    "wbr",
+}
+# Elements whose text is not part of the text of the elements containing them
+# (BeautifulSoup's string containers: scripts, stylesheets, templates, ruby)
+NON_CONTENT_ELEMENTS = {"script", "style", "template", "rt", "rp"}
+
+
+class BaseClauseMarker(ABC):
+    """
+    Marks the clauses of contract HTML.
+    """
+
+    name: str
+
+    @abstractmethod
+    def mark(self, html: str) -> Tuple[str, List[Clause]]:
+        """
+        Mark the clauses in the HTML.
+
+        Every `<li>` with text is a clause, marked with the `data-is-clause`,
+        `data-location` and `data-clause-id` attributes. Clause ids are
+        "clause-N", counting all list items (with text or not) in document
+        order, and the content of a clause is the stripped text of its list
+        item, nested list items included.
+
+        Args:
+            html (str): The HTML of the contract.
+
+        Returns:
+            Tuple[str, List[Clause]]: The HTML with marked clauses, and the
+                clauses in document order.
+        """
+
+
+class SoupClauseMarker(BaseClauseMarker):
+    """
+    Marks clauses on a BeautifulSoup tree, re-serializing the whole document.
+    """
+
+    name = "soup"
+
+    def mark(self, html: str) -> Tuple[str, List[Clause]]:
+        soup = BeautifulSoup(html, "html.parser")
+        clauses = []
+
+        for clause_counter, li in enumerate(
+            soup.find_all("li", recursive=True), start=1
+        ):
+            content = li.get_text(strip=True)
+            if content:
+                li["data-is-clause"] = "true"
+                li["data-location"] = CLAUSE_LOCATION
+                li["data-clause-id"] = f"clause-{clause_counter}"
+                clauses.append(
+                    Clause(
+                        key=f"clause-{clause_counter}",
+                        content=content,
+                        location=CLAUSE_LOCATION,
+                    )
+                )
+
+        return str(soup), clauses
+
+
+class StreamingClauseMarker(BaseClauseMarker):
+    """
+    Marks clauses in a single pass over the HTML tokens, without building a
+    tree or re-serializing the document.
+
+    The HTML is copied through as it is, apart from the start tags of the
+    clauses, so it can differ from the output of `SoupClauseMarker` only in
+    serialization details (entities, quoting, void tags) that parse to the
+    same document. Text is attributed to list items with the same rules for
+    open elements, entities and non-content strings as BeautifulSoup's
+    html.parser tree builder, so the clauses are identical.
+    """
+
+    name = "streaming"
+
+    def mark(self, html: str) -> Tuple[str, List[Clause]]:
+        parser = _ClauseMarkingParser()
+        parser.feed(html)
+        parser.close()
+        return "".join(parser.output), [
+            clause for clause in parser.clauses if clause is not None
+        ]
+
+
+class _OpenListItem:
+    """A list item whose end has not been reached yet."""
+
+    def __init__(self, number: int, output_index: int, attrs: Dict[str, str]):
+        self.number = number
+        self.output_index = output_index  # Where its start tag is in the output
+        self.attrs = attrs
+        self.texts: List[str] = []
+
+
+class _ClauseMarkingParser(HTMLParser):
+    def __init__(self):
+        # Character references are decoded here, like BeautifulSoup does, so
+        # that the source can be copied to the output as it is
+        super().__init__(convert_charrefs=False)
+        self.output: List[str] = []
+        # Clauses by list item number (None for list items without text)
+        self.clauses: List[Optional[Clause]] = []
+        self._open_tags: List[str] = []
+        self._open_tag_counts: Dict[str, int] = {}
+        self._open_items: List[_OpenListItem] = []
+        self._non_content_depth = 0
+        # Consecutive text (data and references) forms a single string
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._end_text()
+        self.output.append(self.get_starttag_text())
+        if tag not in VOID_ELEMENTS:
+            self._push(tag, attrs)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._end_text()
+        self.output.append(self.get_starttag_text())
+        if tag not in VOID_ELEMENTS:
+            self._push(tag, attrs)
+            self._pop_to(tag)
+
+    def handle_endtag(self, tag: str):
+        self._end_text()
+        self.output.append(f"</{tag}>")
+        self._pop_to(tag)
+
+    def handle_data(self, data: str):
+        self.output.append(data)
+        self._text.append(data)
+
+    def handle_entityref(self, name: str):
+        self.output.append(f"&{name};")
+        # Unknown entities are kept as text, without the semicolon
+        self._text.append(html5.get(f"{name};", f"&{name}"))
+
+    def handle_charref(self, name: str):
+        self.output.append(f"&#{name};")
+        self._text.append(_decode_charref(name))
+
+    def handle_comment(self, data: str):
+        self._end_text()
+        self.output.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl: str):
+        self._end_text()
+        self.output.append(f"<!{decl}>")
+
+    def handle_pi(self, data: str):
+        self._end_text()
+        self.output.append(f"<?{data}>")
+
+    def unknown_decl(self, data: str):
+        self._end_text()
+        is_cdata = data.upper().startswith("CDATA[")
+        # Conditional sections (e.g. "<![if !IE]>") end with "]>"
+        self.output.append(f"<![{data}]]>" if is_cdata else f"<![{data}]>")
+        if is_cdata:
+            # CDATA sections are text of their own
+            self._text.append(data[len("CDATA[") :])
+            self._end_text()
+
+    def close(self):
+        super().close()
+        self._end_text()
+        while self._open_tags:
+            self._pop()
+
+    def _end_text(self) -> None:
+        if not self._text:
+            return
+        text = "".join(self._text).strip()
+        self._text = []
+        if text and not self._non_content_depth:
+            for item in self._open_items:
+                item.texts.append(text)
+
+    def _push(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._open_tags.append(tag)
+        self._open_tag_counts[tag] = self._open_tag_counts.get(tag, 0) + 1
+        if tag in NON_CONTENT_ELEMENTS:
+            self._non_content_depth += 1
+        if tag == "li":
+            self.clauses.append(None)
+            self._open_items.append(
+                _OpenListItem(
+                    number=len(self.clauses),
+                    output_index=len(self.output) - 1,
+                    # Duplicate attributes keep the last value
+                    attrs={key: value or "" for key, value in attrs},
+                )
+            )
+
+    def _pop_to(self, tag: str) -> None:
+        # End tags close the most recent open element with the same name and
+        # the elements opened after it; stray end tags are ignored
+        if not self._open_tag_counts.get(tag):
+            return
+        while self._pop() != tag:
+            pass
+
+    def _pop(self) -> str:
+        tag = self._open_tags.pop()
+        self._open_tag_counts[tag] -= 1
+        if tag in NON_CONTENT_ELEMENTS:
+            self._non_content_depth -= 1
+        if tag == "li":
+            self._end_list_item(self._open_items.pop())
+        return tag
+
+    def _end_list_item(self, item: _OpenListItem) -> None:
+        content = "".join(item.texts)
+        if not content:
+            return
+
+        key = f"clause-{item.number}"
+        attrs = {
+            **item.attrs,
+            "data-is-clause": "true",
+            "data-location": CLAUSE_LOCATION,
+            "data-clause-id": key,
+        }
+        self.output[item.output_index] = (
+            "<li"
+            + "".join(
+                f' {name}="{html.escape(value, quote=True)}"'
+                for name, value in attrs.items()
+            )
+            + ">"
+        )
+        self.clauses[item.number - 1] = Clause(
+            key=key, content=content, location=CLAUSE_LOCATION
+        )
+
+
+def _decode_charref(name: str) -> str:
+    """
+    Decode a numeric character reference as the HTML spec (and BeautifulSoup)
+    does, including references to Windows-1252 characters, e.g. &#147;.
+    """
+    code_point = int(name[1:], 16) if name[:1] in "xX" else int(name)
+    if code_point == 0 or code_point > 0x10FFFF or 0xD800 <= code_point <= 0xDFFF:
+        return "\N{REPLACEMENT CHARACTER}"
+    if 0x80 <= code_point <= 0x9F:
+        try:
+            return bytes([code_point]).decode("windows-1252")
+        except UnicodeDecodeError:
+            pass
+    return chr(code_point)
+
+
+CLAUSE_MARKERS: Dict[str, Type[BaseClauseMarker]] = {
+    SoupClauseMarker.name: SoupClauseMarker,
+    StreamingClauseMarker.name: StreamingClauseMarker,
+}
+
+
+def get_clause_marker(name: Optional[str] = None) -> BaseClauseMarker:
+    """
+    Return the clause marker with the given name, or the one selected by
+    `CLAUSE_MARKER`.
+    """
+    name = name or config.CLAUSE_MARKER
+    try:
+        return CLAUSE_MARKERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown clause marker: {name}") from None
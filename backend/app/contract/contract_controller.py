@@ -1,3 +1,4 @@
+import asyncio
 from typing import AsyncGenerator, List, Optional
 
 from bson import ObjectId
@@ -6,18 +7,42 @@ from fastapi.responses import StreamingResponse
 
 from app.analytics.analytics_controller import AnalyticsController
 from app.analytics.analytics_models import AnalyticsIncrementRequest
+from app.contract.contract_conversion import (
+    BasePdfToHtmlEngine,
+    get_pdf_to_html_engine,
+)
+from app.contract.contract_ingestion import ContractIngestor
 from app.contract.contract_models import (
     Contract,
     ContractExplainClauseRequest,
+    ContractIngestionTimings,
     ContractResponse,
     ContractResponseWithReview,
     ContractReview,
     ContractReviewCreateRequest,
+    ContractReviewEvent,
+    ContractReviewEventType,
+    ContractReviewJob,
+    ContractReviewJobResponse,
+    ContractReviewJobStatus,
+    ContractSummaryPage,
+    ContractType,
+    ReviewAnalytics,
+    ReviewBatch,
+    ReviewCoverage,
+    RiskyClause,
+    TokenUsage,
 )
-from app.contract.contract_processor import ContractProcessor
-from app.contract.contract_repository import ContractRepository
+from app.contract.contract_repository import ContractRepository, ReviewJobLeaseLost
 from app.contract.contract_review import ContractReviewer
+from app.contract.contract_review_cache import ClauseReviewCache
+from app.contract.contract_review_queue import BaseReviewJobQueue
+from app.contract.contract_upload import ContractUpload
+from app.shared.models.mongodb_models import PyObjectId
 from app.user.user_models import User
+from core.config import config
+from core.database.pagination import InvalidCursor
+from core.executors import IngestionExecutorBusy
 
 
 class ContractController:
@@ -25,46 +50,169 @@ class ContractController:
         self,
         contract_repo: ContractRepository,
         analytics_controller: AnalyticsController,
+        clause_review_cache: Optional[ClauseReviewCache] = None,
+        review_job_queue: Optional[BaseReviewJobQueue] = None,
+        pdf_to_html_engine: Optional[BasePdfToHtmlEngine] = None,
     ):
         self.contract_repo = contract_repo
-        self.contract_reviewer = ContractReviewer()
+        self.contract_ingestor = ContractIngestor(
+            pdf_to_html_engine or get_pdf_to_html_engine()
+        )
+        self.contract_reviewer = ContractReviewer(review_cache=clause_review_cache)
         self.analytics_controller = analytics_controller
+        self.review_job_queue = review_job_queue
 
     async def create_contract(
-        self, title: str, file_content: bytes, current_user: User
+        self,
+        title: str,
+        upload: ContractUpload,
+        current_user: User,
+        link_review: bool = False,
+        previous_contract_id: Optional[str] = None,
     ) -> ContractResponse:
         """
         Create a new contract and process its clauses.
+
+        If the same PDF was ingested before by the user (or by another user
+        who shared its review), its HTML, clauses and page count are reused
+        instead of converting it again. Other users' uploads are never reused
+        otherwise, so that the response does not disclose them. The new
+        contract still belongs to the current user only. With `link_review`,
+        the review of the earlier upload is copied to the new contract too.
+
+        With `previous_contract_id`, the contract is a new version of one of
+        the user's contracts, and its clauses are diffed against it so that
+        its review only analyzes the added and modified clauses.
         """
+        previous_version = None
+        if previous_contract_id is not None:
+            previous_version = await self._get_previous_version(
+                previous_contract_id, current_user
+            )
+
         try:
-            # Convert PDF to HTML and get the number of pages
-            original_html_content, pages = ContractProcessor.convert_pdf_to_html(
-                file_content
-            )
-            processed_html_content, clauses = ContractProcessor.mark_clauses(
-                original_html_content
-            )
-
-            # Prepare and save the contract
-            contract = await self.contract_repo.create_contract(
-                Contract(
-                    title=title,
-                    processed_html=processed_html_content,
-                    original_html=original_html_content,
-                    uploaded_by=current_user.id,
-                    clauses=clauses,
-                    pages=pages,
+            engine_name = self.contract_ingestor.pdf_to_html_engine.name
+            source = await self._find_ingested_contract(
+                upload.sha256, engine_name, current_user, link_review
+            )
+
+            ingestion_timings = None
+            if source is not None:
+                original_html_content = source.original_html
+                processed_html_content = source.processed_html
+                clauses = source.clauses
+                pages = source.pages
+                clause_index = source.clause_index
+            else:
+                # Convert PDF to HTML, get the number of pages and mark the
+                # clauses (off the event loop)
+                ingestion_timings = ContractIngestionTimings()
+                (
+                    original_html_content,
+                    processed_html_content,
+                    clauses,
+                    clause_index,
+                    pages,
+                ) = await self.contract_ingestor.ingest(upload.file, ingestion_timings)
+
+            clause_diff = None
+            if previous_version is not None:
+                clause_diff = await self.contract_ingestor.diff_versions(
+                    previous_version.clauses, clauses
+                )
+
+            contract = Contract(
+                title=title,
+                processed_html=processed_html_content,
+                original_html=original_html_content,
+                uploaded_by=current_user.id,
+                clauses=clauses,
+                pages=pages,
+                clause_index=clause_index,
+                content_sha256=upload.sha256,
+                file_size=upload.size,
+                ingestion_engine=engine_name,
+                ingestion_timings=ingestion_timings,
+                # Only the user's own contracts, so that other users' ids are
+                # not disclosed
+                deduplicated_from=(
+                    source.id
+                    if source is not None and source.uploaded_by == current_user.id
+                    else None
+                ),
+                version=previous_version.version + 1 if previous_version else 1,
+                previous_version_id=(
+                    previous_version.id if previous_version is not None else None
+                ),
+                clause_diff=clause_diff,
+            )
+            # Save the contract
+            contract = await self.contract_repo.create_contract(contract)
+
+            # Only once the contract is saved, so that no review is left
+            # without a contract if saving it fails
+            if (
+                link_review
+                and source is not None
+                and source.has_review
+                and (source.uploaded_by == current_user.id or source.review_shared)
+                and await self._link_contract_review(source.id, contract.id)
+            ):
+                await self.contract_repo.update_contract(
+                    contract_id=contract.id,
+                    update_data={"has_review": True},
+                    include_body=False,
                 )
+                contract.has_review = True
+
+            await self.analytics_controller.increment_analytics_fields_by_user_id(
+                user_id=current_user.id,
+                increment_data=AnalyticsIncrementRequest(
+                    total_uploads=1,
+                    deduplicated_uploads=int(source is not None),
+                ),
             )
 
             return ContractResponse(**contract.model_dump(by_alias=True))
 
+        except IngestionExecutorBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many contracts are being processed. Please try again.",
+                headers={"Retry-After": str(int(config.INGESTION_ADMISSION_TIMEOUT))},
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"An error occurred: {str(e)}",
             )
 
+    async def set_review_sharing(
+        self, contract_id: str, current_user: User, shared: bool
+    ) -> ContractResponse:
+        """
+        Allow (or stop allowing) other users who upload the same PDF to link
+        this contract's review to their upload.
+        """
+        contract = await self.contract_repo.get_contract_by_id(contract_id)
+
+        if contract is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Contract not found.",
+            )
+
+        if contract.uploaded_by != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not authorized to share this contract's review.",
+            )
+
+        contract = await self.contract_repo.update_contract(
+            contract_id=contract_id, update_data={"review_shared": shared}
+        )
+        return ContractResponse(**contract.model_dump(by_alias=True))
+
     async def get_contract_by_id(
         self, contract_id: str, current_user: User
     ) -> ContractResponse:
@@ -79,6 +227,12 @@ class ContractController:
                 detail="Contract not found.",
             )
 
+        if contract.uploaded_by != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not authorized to view this contract.",
+            )
+
         return ContractResponse(**contract.model_dump(by_alias=True))
 
     async def get_all_contracts(
@@ -86,33 +240,32 @@ class ContractController:
         current_user: User,
         page: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> List[ContractResponse]:
+        cursor: Optional[str] = None,
+    ) -> ContractSummaryPage:
         """
-        Get all contracts for the current user with optional pagination.
+        Get a page of summaries of the current user's contracts, newest first.
+        Pages continue from the `next_cursor` of the previous page; `page`
+        numbers are still accepted, but deep pages are slower.
         """
-        try:
-            filter_criteria = {"uploaded_by": ObjectId(current_user.id)}
-
-            if page is not None and limit is not None:
-                # Calculate the offset for pagination
-                offset = (page - 1) * limit
-                contracts = await self.contract_repo.get_contracts(
-                    filter=filter_criteria,
-                    skip=offset,
-                    limit=limit,
-                )
-            else:
-                # Fetch all contracts without pagination
-                contracts = await self.contract_repo.get_contracts(
-                    filter=filter_criteria
-                )
+        limit = min(
+            limit or config.CONTRACT_LIST_DEFAULT_LIMIT, config.CONTRACT_LIST_MAX_LIMIT
+        )
+        skip = (page - 1) * limit if page is not None and cursor is None else None
 
-            # Convert the list of contracts to ContractResponse
-            return [
-                ContractResponse(**contract.model_dump(by_alias=True))
-                for contract in contracts
-            ]
+        try:
+            items, next_cursor = await self.contract_repo.get_contract_summaries(
+                filter={"uploaded_by": ObjectId(current_user.id)},
+                limit=limit,
+                cursor=cursor,
+                skip=skip,
+            )
+            return ContractSummaryPage(items=items, next_cursor=next_cursor)
 
+        except InvalidCursor as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -125,9 +278,280 @@ class ContractController:
         """
         Review a contract and save the review data.
         """
+        contract = await self._get_contract_for_review(
+            contract_id, current_user, include_body=False
+        )
+
+        # Analyze the contract using the ContractReviewer class
+        result = await self.contract_reviewer.create_high_risk_clauses(
+            contract=contract,
+            contract_type=payload.contract_type,
+            previous_version_review=await self._get_previous_version_review(
+                contract, payload.contract_type
+            ),
+        )
+
+        return await self._save_contract_review(
+            contract=contract,
+            user_id=current_user.id,
+            payload=payload,
+            high_risk_clauses=result.risky_clauses,
+            summary_checklist=result.summary_checklist,
+            analytics=result.analytics,
+            coverage=result.coverage,
+            batches=result.batches,
+            include_body=True,
+        )
+
+    async def resume_contract_review(
+        self, contract_id: str, current_user: User
+    ) -> ContractResponseWithReview:
+        """
+        Complete a partial review by analyzing only the clauses that failed or
+        were not reached, and merge the results into the existing review.
+        """
+        contract = await self._get_contract_for_review(contract_id, current_user)
 
+        contract_review = await self.contract_repo.get_contract_review_by_contract_id(
+            contract_id
+        )
+        if contract_review is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Contract review not found.",
+            )
+
+        if contract_review.coverage is None or contract_review.coverage.is_complete:
+            return ContractResponseWithReview(
+                **contract.model_dump(by_alias=True),
+                review=contract_review,
+            )
+
+        payload = ContractReviewCreateRequest(
+            contract_type=contract_review.contract_type,
+            industry=contract_review.contract_industry,
+            jurisdiction=contract_review.contract_jurisdiction,
+        )
+        result = await self.contract_reviewer.create_high_risk_clauses(
+            contract=contract,
+            contract_type=payload.contract_type,
+            resume_from=contract_review,
+        )
+
+        return await self._save_contract_review(
+            contract=contract,
+            user_id=current_user.id,
+            payload=payload,
+            high_risk_clauses=result.risky_clauses,
+            summary_checklist=result.summary_checklist,
+            analytics=result.analytics,
+            coverage=result.coverage,
+            batches=result.batches,
+            previous_review=contract_review,
+            include_body=True,
+        )
+
+    async def review_contract_stream(
+        self, contract_id: str, current_user: User, payload: ContractReviewCreateRequest
+    ) -> StreamingResponse:
+        """
+        Review a contract, streaming risky clauses and progress as NDJSON while the
+        batches complete. The saved review is the same as with `review_contract`.
+
+        Only streamed when served by uvicorn: the deployed API (Mangum behind an
+        API Gateway REST integration) buffers the whole response, and is cut
+        off after 60s. Clients of the deployed API use `enqueue_review_job`.
+        """
+        contract = await self._get_contract_for_review(
+            contract_id, current_user, include_body=False
+        )
+        previous_version_review = await self._get_previous_version_review(
+            contract, payload.contract_type
+        )
+
+        async def review_event_generator() -> AsyncGenerator[str, None]:
+            try:
+                async for event in self.contract_reviewer.stream_high_risk_clauses(
+                    contract=contract,
+                    contract_type=payload.contract_type,
+                    previous_version_review=previous_version_review,
+                ):
+                    if event.event == ContractReviewEventType.COMPLETE:
+                        response = await self._save_contract_review(
+                            contract=contract,
+                            user_id=current_user.id,
+                            payload=payload,
+                            high_risk_clauses=event.risky_clauses,
+                            summary_checklist=event.summary_checklist,
+                            analytics=event.analytics,
+                            coverage=event.coverage,
+                            batches=event.batches,
+                        )
+                        event.review = response.review
+                    yield event.model_dump_json(exclude_none=True) + "\n"
+            except Exception as e:
+                # Headers are already sent, so report failures in-band
+                error_event = ContractReviewEvent(
+                    event=ContractReviewEventType.ERROR,
+                    message=getattr(e, "detail", None) or str(e),
+                )
+                yield error_event.model_dump_json(exclude_none=True) + "\n"
+
+        return StreamingResponse(
+            review_event_generator(), media_type="application/x-ndjson"
+        )
+
+    async def enqueue_review_job(
+        self, contract_id: str, current_user: User, payload: ContractReviewCreateRequest
+    ) -> ContractReviewJobResponse:
+        """
+        Queue a contract review to run in the background, without the request
+        timeout. Poll `get_review_job` for its progress.
+        """
+        if self.review_job_queue is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Background reviews are not available.",
+            )
+
+        await self._get_contract_for_review(
+            contract_id, current_user, include_body=False
+        )
+
+        job = await self.review_job_queue.enqueue(
+            ContractReviewJob(
+                contract_id=ObjectId(contract_id),
+                user_id=current_user.id,
+                contract_type=payload.contract_type,
+                contract_industry=payload.industry,
+                contract_jurisdiction=payload.jurisdiction,
+            )
+        )
+        return ContractReviewJobResponse(**job.model_dump(by_alias=True))
+
+    async def get_review_job(
+        self, contract_id: str, job_id: str, current_user: User
+    ) -> ContractReviewJobResponse:
+        """
+        Get the status, progress and partial results of a background review.
+        """
+        job = await self.contract_repo.get_review_job_by_id(job_id)
+
+        if job is None or str(job.contract_id) != contract_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Review job not found.",
+            )
+
+        if job.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not authorized to view this review job.",
+            )
+
+        return ContractReviewJobResponse(**job.model_dump(by_alias=True))
+
+    async def run_review_job(self, job: ContractReviewJob) -> None:
+        """
+        Run a claimed background review job, checkpointing progress and partial
+        results after every batch and saving the review when done.
+
+        Every write to the job is made only while this attempt still holds it,
+        and the review stops with `ReviewJobLeaseLost` once another worker has
+        reclaimed the job.
+        """
+        try:
+            contract = await self.contract_repo.get_contract_by_id(
+                job.contract_id, include_body=False
+            )
+            if contract is None:
+                raise ValueError("Contract not found.")
+
+            payload = ContractReviewCreateRequest(
+                contract_type=job.contract_type,
+                industry=job.contract_industry,
+                jurisdiction=job.contract_jurisdiction,
+            )
+            reviewer = ContractReviewer(
+                review_cache=self.contract_reviewer.review_cache,
+                timeout=config.REVIEW_JOB_TIMEOUT,
+            )
+
+            new_risky_clauses: List[RiskyClause] = []
+            async for event in reviewer.stream_high_risk_clauses(
+                contract=contract,
+                contract_type=payload.contract_type,
+                previous_version_review=await self._get_previous_version_review(
+                    contract, payload.contract_type
+                ),
+            ):
+                if event.event == ContractReviewEventType.RISKY_CLAUSES:
+                    new_risky_clauses.extend(event.risky_clauses)
+                elif event.event == ContractReviewEventType.PROGRESS:
+                    await self.contract_repo.checkpoint_review_job(
+                        job_id=job.id,
+                        attempt=job.attempts,
+                        batches_done=event.batches_done,
+                        total_batches=event.total_batches,
+                        risky_clauses=new_risky_clauses,
+                        lease_seconds=config.REVIEW_JOB_LEASE_SECONDS,
+                    )
+                    new_risky_clauses = []
+                elif event.event == ContractReviewEventType.COMPLETE:
+                    await self.contract_repo.extend_review_job_lease(
+                        job_id=job.id,
+                        attempt=job.attempts,
+                        lease_seconds=config.REVIEW_JOB_LEASE_SECONDS,
+                    )
+                    response = await self._save_contract_review(
+                        contract=contract,
+                        user_id=job.user_id,
+                        payload=payload,
+                        high_risk_clauses=event.risky_clauses,
+                        summary_checklist=event.summary_checklist,
+                        analytics=event.analytics,
+                        coverage=event.coverage,
+                        batches=event.batches,
+                    )
+                    await self.contract_repo.update_review_job(
+                        job.id,
+                        {
+                            "status": ContractReviewJobStatus.COMPLETED.value,
+                            "risky_clauses": [
+                                risky_clause.model_dump()
+                                for risky_clause in event.risky_clauses
+                            ],
+                            "review_id": response.review.id,
+                            "locked_until": None,
+                        },
+                        attempt=job.attempts,
+                    )
+
+        except ReviewJobLeaseLost:
+            raise
+        except Exception as e:
+            await self.contract_repo.update_review_job(
+                job.id,
+                {
+                    "status": ContractReviewJobStatus.FAILED.value,
+                    "error": getattr(e, "detail", None) or str(e),
+                    "locked_until": None,
+                },
+                attempt=job.attempts,
+            )
+            raise
+
+    async def _get_contract_for_review(
+        self, contract_id: str, current_user: User, include_body: bool = True
+    ) -> Contract:
+        """
+        Fetch a contract the current user is allowed to review (reviews only
+        need its clauses, not its HTML body).
+        """
         # Fetch the contract from the repository
-        contract = await self.contract_repo.get_contract_by_id(contract_id)
+        contract = await self.contract_repo.get_contract_by_id(
+            contract_id, include_body=include_body
+        )
 
         if contract is None:
             raise HTTPException(
@@ -141,22 +565,140 @@ class ContractController:
                 detail="You are not authorized to review this contract.",
             )
 
-        # Analyze the contract using the ContractReviewer class
-        high_risk_clauses, summary_checklist, analytics = (
-            await self.contract_reviewer.create_high_risk_clauses(
-                contract=contract, contract_type=payload.contract_type
+        return contract
+
+    async def _get_previous_version(
+        self, contract_id: str, current_user: User
+    ) -> Contract:
+        """
+        Fetch the contract a new upload is a version of, which must be the
+        current user's.
+        """
+        contract = (
+            await self.contract_repo.get_contract_by_id(contract_id, include_body=False)
+            if ObjectId.is_valid(contract_id)
+            else None
+        )
+
+        if contract is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Previous contract version not found.",
+            )
+
+        if contract.uploaded_by != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not authorized to version this contract.",
+            )
+
+        return contract
+
+    async def _get_previous_version_review(
+        self, contract: Contract, contract_type: ContractType
+    ) -> Optional[ContractReview]:
+        """
+        Get the review of the previous version of a contract whose results
+        can be carried over to its unchanged clauses: one of the same type.
+        """
+        if contract.previous_version_id is None or contract.clause_diff is None:
+            return None
+
+        review = await self.contract_repo.get_contract_review_by_contract_id(
+            contract.previous_version_id
+        )
+        if review is None or review.contract_type != contract_type:
+            return None
+        return review
+
+    async def _find_ingested_contract(
+        self,
+        content_sha256: str,
+        ingestion_engine: str,
+        current_user: User,
+        link_review: bool,
+    ) -> Optional[Contract]:
+        """
+        Find an earlier upload of the same PDF the user may reuse (their own,
+        or a shared one), preferring one with a review when `link_review` is
+        set.
+        """
+        if not config.UPLOAD_DEDUP_ENABLED:
+            return None
+
+        source = None
+        if link_review:
+            source = await self.contract_repo.get_contract_by_content_sha256(
+                content_sha256,
+                ingestion_engine,
+                available_to=current_user.id,
+                reviewed=True,
+            )
+        if source is None:
+            source = await self.contract_repo.get_contract_by_content_sha256(
+                content_sha256, ingestion_engine, available_to=current_user.id
+            )
+        return source
+
+    async def _link_contract_review(
+        self, source_contract_id: PyObjectId, contract_id: PyObjectId
+    ) -> bool:
+        """
+        Copy the review of a contract to another contract of the same PDF.
+        Returns whether there was a review to copy.
+        """
+        source_review = await self.contract_repo.get_contract_review_by_contract_id(
+            source_contract_id
+        )
+        if source_review is None:
+            return False
+
+        await self.contract_repo.create_contract_review(
+            ContractReview(
+                **source_review.model_dump(
+                    exclude={"id", "contract_id", "created_at", "updated_at"}
+                ),
+                contract_id=contract_id,
             )
         )
+        return True
 
+    async def _save_contract_review(
+        self,
+        contract: Contract,
+        user_id: PyObjectId,
+        payload: ContractReviewCreateRequest,
+        high_risk_clauses: List[RiskyClause],
+        summary_checklist: str,
+        analytics: ReviewAnalytics,
+        coverage: Optional[ReviewCoverage] = None,
+        batches: Optional[List[ReviewBatch]] = None,
+        previous_review: Optional[ContractReview] = None,
+        include_body: bool = False,
+    ) -> ContractResponseWithReview:
+        """
+        Persist a finished (possibly partial) review, flag the contract as reviewed
+        and update the user's analytics. When a partial review is resumed, only the
+        work added since `previous_review` is counted in the analytics.
+
+        The review is saved in one upsert, then the contract flag and the
+        analytics, which are independent, are written concurrently. The
+        contract's HTML is only loaded into the response with `include_body`.
+        """
         contract_review_for_db = ContractReview(
-            contract_id=ObjectId(contract_id),
+            contract_id=contract.id,
             risky_clauses=high_risk_clauses,
             contract_type=payload.contract_type,
             contract_industry=payload.industry,
             contract_jurisdiction=payload.jurisdiction,
             summary_checklist=summary_checklist,
             analytics=analytics,
+            coverage=coverage,
+            batches=batches or [],
         )
+        if previous_review is not None:
+            contract_review_for_db.id = previous_review.id
+            contract_review_for_db.created_at = previous_review.created_at
 
         review_result = await self.contract_repo.create_contract_review(
             contract_review_for_db
@@ -167,33 +709,43 @@ class ContractController:
                 detail="An error occurred while saving the contract review.",
             )
 
-        contract = await self.contract_repo.update_contract(
-            contract_id=contract_id,
-            update_data={"has_review": True},
+        # Update analytics for the user
+        if previous_review is None:
+            analytics_to_increment = AnalyticsIncrementRequest(
+                contracts_reviewed={payload.contract_type: 1},
+                total_clauses=len(contract.clauses),
+                total_risky_clauses=len(high_risk_clauses),
+                total_contracts=1,
+                total_pages=contract.pages,
+                total_tokens_used=analytics.tokens_used,
+            )
+        else:
+            analytics_to_increment = AnalyticsIncrementRequest(
+                total_risky_clauses=len(high_risk_clauses)
+                - len(previous_review.risky_clauses),
+                total_tokens_used=analytics.tokens_used
+                - previous_review.analytics.tokens_used,
+            )
+
+        contract, updated_analytics = await asyncio.gather(
+            self.contract_repo.update_contract(
+                contract_id=contract.id,
+                update_data={"has_review": True},
+                include_body=include_body,
+            ),
+            self.analytics_controller.increment_analytics_fields_by_user_id(
+                user_id=user_id, increment_data=analytics_to_increment
+            ),
         )
         if contract is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An error occurred while updating the contract.",
             )
-
-        # Update analytics for the user
-        analytics_to_increment = AnalyticsIncrementRequest(
-            contracts_reviewed={payload.contract_type: 1},
-            total_clauses=len(contract.clauses),
-            total_risky_clauses=len(high_risk_clauses),
-            total_contracts=1,
-            total_pages=contract.pages,
-            total_tokens_used=analytics.tokens_used,
-        )
-
-        updated_analytics = await self.analytics_controller.increment_analytics_fields(
-            current_user=current_user, increment_data=analytics_to_increment
-        )
         if updated_analytics is None:
             logger.error(
                 "An error occurred while updating analytics for the user.",
-                extra={"user_id": current_user.id},
+                extra={"user_id": user_id},
             )
 
         return ContractResponseWithReview(
@@ -211,7 +763,9 @@ class ContractController:
         Explain the clauses in the specified contract.
         """
         # Fetch the contract by ID
-        contract = await self.contract_repo.get_contract_by_id(contract_id)
+        contract = await self.contract_repo.get_contract_by_id(
+            contract_id, include_body=False
+        )
         contract_review = await self.contract_repo.get_contract_review_by_contract_id(
             contract_id
         )
@@ -231,12 +785,22 @@ class ContractController:
 
         # Stream explanation for the specified clause
         async def explanation_generator() -> AsyncGenerator[str, None]:
+            usage = TokenUsage()
             async for chunk in self.contract_reviewer.explain_clause_stream(
-                clause=payload.clause, contract_type=contract_review.contract_type
+                clause=payload.clause,
+                contract_type=contract_review.contract_type,
+                usage=usage,
             ):
                 yield chunk
 
-        # Update analytics for the clause
+            # Update analytics for the clause
+            if usage.total_tokens:
+                await self.analytics_controller.increment_analytics_fields_by_user_id(
+                    user_id=current_user.id,
+                    increment_data=AnalyticsIncrementRequest(
+                        total_tokens_used=usage.total_tokens
+                    ),
+                )
 
         return StreamingResponse(explanation_generator(), media_type="text/plain")
 
@@ -254,6 +818,12 @@ class ContractController:
                 detail="Contract not found.",
             )
 
+        if contract.uploaded_by != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not authorized to view this contract's review.",
+            )
+
         contract_review = await self.contract_repo.get_contract_review_by_contract_id(
             contract_id
         )
@@ -0,0 +1,421 @@
+import html
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from app.contract.contract_processor import ContractProcessor, PdfContent
+from core.config import config
+
+
+class BasePdfToHtmlEngine(ABC):
+    """
+    Converts uploaded PDFs to the HTML that clauses are marked in.
+    """
+
+    name: str
+    # Whether conversion runs locally (in the ingestion process pool) rather
+    # than waiting on a web service (in the ingestion thread pool)
+    cpu_bound: bool = False
+
+    @abstractmethod
+    def convert(self, pdf_content: PdfContent) -> Tuple[str, int]:
+        """
+        Convert a PDF to HTML.
+
+        Args:
+            pdf_content (PdfContent): The content of the PDF file.
+
+        Returns:
+            Tuple[str, int]: The HTML and the number of pages of the PDF.
+        """
+
+
+class SplittablePdfToHtmlEngine(BasePdfToHtmlEngine):
+    """
+    Converts PDFs whose page ranges can be extracted separately (e.g. in
+    parallel) with `extract_pages`, then merged with `merge_pages`.
+    """
+
+    @abstractmethod
+    def extract_pages(
+        self,
+        pdf_content: PdfContent,
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+    ) -> Tuple[Any, int]:
+        """
+        Extract the content of a range of pages, independently of the other
+        pages, for `merge_pages`.
+
+        Args:
+            pdf_content (PdfContent): The content of the PDF file.
+            first_page (int): The first page of the range, numbered from 1.
+            last_page (Optional[int]): The last page of the range (inclusive),
+                or None for the last page of the PDF.
+
+        Returns:
+            Tuple[Any, int]: The content extracted from the pages, and the
+                number of pages of the PDF.
+        """
+
+    @abstractmethod
+    def merge_pages(self, page_ranges: List[Any], pages: int) -> str:
+        """
+        Convert the content extracted from consecutive page ranges, in page
+        order, to the HTML of the whole PDF, as `convert` would.
+
+        Args:
+            page_ranges (List[Any]): The content extracted from each range.
+            pages (int): The number of pages of the PDF.
+
+        Returns:
+            str: The HTML.
+        """
+
+
+class ConvertApiEngine(BasePdfToHtmlEngine):
+    """
+    Converts PDFs with the ConvertAPI web service.
+    """
+
+    name = "convertapi"
+
+    def convert(self, pdf_content: PdfContent) -> Tuple[str, int]:
+        return ContractProcessor.convert_pdf_to_html(pdf_content)
+
+
+class _TextLine:
+    """A line of text on a page, with the layout used to infer structure."""
+
+    def __init__(self, page: int, words: List[dict], page_height: float):
+        self.page = page
+        self.text = " ".join(word["text"] for word in words)
+        self.x0 = min(word["x0"] for word in words)
+        self.top = min(word["top"] for word in words)
+        self.bottom = max(word["bottom"] for word in words)
+        self.page_height = page_height
+
+        chars_by_size = Counter()
+        bold_chars = 0
+        for word in words:
+            chars_by_size[round(word["size"], 1)] += len(word["text"])
+            if _is_bold_font(word["fontname"]):
+                bold_chars += len(word["text"])
+        self.size = chars_by_size.most_common(1)[0][0]
+        self.bold = bold_chars > 0.8 * sum(chars_by_size.values())
+
+    @property
+    def in_margin(self) -> bool:
+        """Whether the line sits where running headers and footers go."""
+        margin = 0.08 * self.page_height
+        return self.top < margin or self.bottom > self.page_height - margin
+
+
+class _Block:
+    """A heading, paragraph or list item being assembled from lines."""
+
+    def __init__(self, tag: str, text: str, line: _TextLine, level: int = 0):
+        self.tag = tag  # "h1".."h4", "p" or "li"
+        self.text = text
+        self.level = level  # Heading level, or list nesting depth
+        self.list_type = None  # "ordered" or "bullet", for list items
+        self.label = None  # Enumerator of ordered list items, e.g. "1.1" or "(a)"
+        self.first_line = line
+        self.last_line = line
+
+
+class PdfPlumberEngine(SplittablePdfToHtmlEngine):
+    """
+    Converts PDFs locally with pdfplumber, without a network round trip.
+
+    Structure is inferred from the layout of the text: lines set larger (or in
+    bold) than the body text become headings, lines starting with an enumerator
+    ("1.1", "(a)", "iv.") or a bullet become list items (nested by indentation),
+    and other lines are joined into paragraphs, split on vertical gaps and
+    first-line indents. Paragraphs and list items continue across page breaks
+    (list items record the pages they span in `data-page-start` and
+    `data-page-end`), and running headers, footers and page numbers are
+    dropped.
+    """
+
+    name = "pdfplumber"
+    cpu_bound = True
+
+    BULLET_PATTERN = re.compile(r"^([•◦▪▫●○■□‣⁃∙·\-–—*])\s+(.+)$")
+    ENUMERATOR_PATTERN = re.compile(
+        r"^(\d+(?:\.\d+)+\.?|\d+[.)]|\(\d+\)|\(?[a-z][.)]|\([a-z]\)"
+        r"|\(?[ivxlc]+[.)]|\([ivxlc]+\))\s+(.+)$",
+        re.IGNORECASE,
+    )
+    PAGE_NUMBER_PATTERN = re.compile(
+        r"^(page\s+)?\d+(\s*(of|/)\s*\d+)?$|^-\s*\d+\s*-$", re.IGNORECASE
+    )
+    SENTENCE_END_PATTERN = re.compile(r"[.;:!?]['\")\]]?$")
+    # Font size ratio to the body text from which a line is a heading
+    HEADING_SIZE_RATIO = 1.15
+    # Maximum words in a bold body-size line for it to be a heading
+    MAX_BOLD_HEADING_WORDS = 12
+    # Horizontal tolerance (points) when comparing indentation
+    INDENT_TOLERANCE = 4.0
+
+    def convert(self, pdf_content: PdfContent) -> Tuple[str, int]:
+        lines, pages = self.extract_pages(pdf_content)
+        return self.merge_pages([lines], pages), pages
+
+    def extract_pages(
+        self,
+        pdf_content: PdfContent,
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+    ) -> Tuple[List[_TextLine], int]:
+        # Only the text lines and their layout are extracted per page; the
+        # structure depends on the whole document, so it is inferred on merge
+        lines: List[_TextLine] = []
+        pages = 0
+        for page_number, pages, page in ContractProcessor.iter_pdf_pages(
+            pdf_content, first_page, last_page
+        ):
+            lines.extend(self._extract_lines(page, page_number))
+        return lines, pages
+
+    def merge_pages(self, page_ranges: List[List[_TextLine]], pages: int) -> str:
+        # Running headers, body text size, and paragraphs and list items
+        # continuing across page breaks (including those between ranges) are
+        # resolved over all the lines at once
+        lines = [line for range_lines in page_ranges for line in range_lines]
+        lines = self._drop_running_headers_and_footers(lines, pages)
+        blocks = self._build_blocks(lines)
+        return self._render(blocks)
+
+    def _extract_lines(self, page, page_number: int) -> List[_TextLine]:
+        words = page.extract_words(extra_attrs=["size", "fontname"])
+        # Group words whose tops are within half a line of each other
+        grouped_words: List[List[dict]] = []
+        for word in sorted(words, key=lambda word: word["top"]):
+            if grouped_words and (
+                word["top"] - grouped_words[-1][0]["top"]
+                <= 0.5 * min(word["size"], grouped_words[-1][0]["size"])
+            ):
+                grouped_words[-1].append(word)
+            else:
+                grouped_words.append([word])
+
+        return [
+            _TextLine(
+                page_number,
+                sorted(line_words, key=lambda word: word["x0"]),
+                float(page.height),
+            )
+            for line_words in grouped_words
+        ]
+
+    def _drop_running_headers_and_footers(
+        self, lines: List[_TextLine], pages: int
+    ) -> List[_TextLine]:
+        # Lines in the margins repeated on most pages (ignoring page numbers)
+        def signature(line: _TextLine) -> str:
+            return re.sub(r"\d+", "#", line.text.lower())
+
+        repeated = set()
+        if pages >= 2:
+            pages_by_signature: Dict[str, set] = {}
+            for line in lines:
+                if line.in_margin:
+                    pages_by_signature.setdefault(signature(line), set()).add(line.page)
+            repeated = {
+                key
+                for key, line_pages in pages_by_signature.items()
+                if len(line_pages) >= max(2, pages // 2)
+            }
+
+        return [
+            line
+            for line in lines
+            if not (
+                line.in_margin
+                and (
+                    self.PAGE_NUMBER_PATTERN.match(line.text)
+                    or signature(line) in repeated
+                )
+            )
+        ]
+
+    def _build_blocks(self, lines: List[_TextLine]) -> List[_Block]:
+        if not lines:
+            return []
+
+        chars_by_size = Counter()
+        for line in lines:
+            chars_by_size[line.size] += len(line.text)
+        body_size = chars_by_size.most_common(1)[0][0]
+        # Larger sizes map to higher heading levels (h1 is the largest)
+        heading_sizes = sorted(
+            {
+                line.size
+                for line in lines
+                if line.size >= body_size * self.HEADING_SIZE_RATIO
+            },
+            reverse=True,
+        )
+
+        blocks: List[_Block] = []
+        # Indentation (x0) of the open list levels, outermost first
+        list_indents: List[float] = []
+
+        for line in lines:
+            previous = blocks[-1] if blocks else None
+            heading_level = self._heading_level(line, body_size, heading_sizes)
+            bullet = self.BULLET_PATTERN.match(line.text)
+            enumerator = None if bullet else self.ENUMERATOR_PATTERN.match(line.text)
+
+            if heading_level:
+                list_indents = []
+                if (
+                    previous is not None
+                    and previous.tag == f"h{heading_level}"
+                    and previous.last_line.page == line.page
+                    and line.top - previous.last_line.bottom < 0.5 * line.size
+                ):
+                    # Heading wrapped over several lines
+                    previous.text += " " + line.text
+                    previous.last_line = line
+                else:
+                    blocks.append(
+                        _Block(f"h{heading_level}", line.text, line, heading_level)
+                    )
+                continue
+
+            if bullet or enumerator:
+                while (
+                    list_indents and line.x0 < list_indents[-1] - self.INDENT_TOLERANCE
+                ):
+                    list_indents.pop()
+                if (
+                    not list_indents
+                    or line.x0 > list_indents[-1] + self.INDENT_TOLERANCE
+                ):
+                    list_indents.append(line.x0)
+                match = bullet or enumerator
+                block = _Block("li", match.group(2), line, level=len(list_indents) - 1)
+                block.list_type = "bullet" if bullet else "ordered"
+                block.label = None if bullet else match.group(1)
+                blocks.append(block)
+                continue
+
+            if previous is not None and self._continues(previous, line, body_size):
+                previous.text += " " + line.text
+                previous.last_line = line
+                continue
+
+            # A paragraph starting left of the outermost list ends the list
+            if list_indents and line.x0 <= list_indents[0] - self.INDENT_TOLERANCE:
+                list_indents = []
+            blocks.append(_Block("p", line.text, line))
+
+        return blocks
+
+    def _heading_level(
+        self, line: _TextLine, body_size: float, heading_sizes: List[float]
+    ) -> int:
+        if line.size in heading_sizes:
+            return min(heading_sizes.index(line.size) + 1, 3)
+        words = len(line.text.split())
+        if (
+            line.bold
+            and words <= self.MAX_BOLD_HEADING_WORDS
+            and not self.SENTENCE_END_PATTERN.search(line.text)
+        ) or (
+            line.text.isupper()
+            and words <= self.MAX_BOLD_HEADING_WORDS
+            and any(character.isalpha() for character in line.text)
+        ):
+            return min(len(heading_sizes) + 1, 4)
+        return 0
+
+    def _continues(self, block: _Block, line: _TextLine, body_size: float) -> bool:
+        """Whether a plain line continues the paragraph or list item before it."""
+        if block.tag not in ("p", "li"):
+            return False
+
+        last_line = block.last_line
+        if line.page != last_line.page:
+            # Across a page break, continue sentences that were cut off
+            return not self.SENTENCE_END_PATTERN.search(block.text)
+
+        line_height = max(line.size, last_line.size)
+        if line.top - last_line.bottom > 0.6 * line_height:
+            return False
+
+        if block.tag == "li":
+            # Wrapped list item text is indented at least as far as the item
+            return line.x0 >= block.first_line.x0 - self.INDENT_TOLERANCE
+
+        # An indented first line after a finished sentence starts a paragraph
+        return not (
+            line.x0 > last_line.x0 + self.INDENT_TOLERANCE
+            and self.SENTENCE_END_PATTERN.search(block.text)
+        )
+
+    def _render(self, blocks: List[_Block]) -> str:
+        parts = ["<html><body>"]
+        # Stack of the open lists (nesting depth, list type)
+        open_lists: List[Tuple[int, str]] = []
+
+        def close_lists(depth: int) -> None:
+            while open_lists and open_lists[-1][0] >= depth:
+                open_lists.pop()
+                parts.append("</li></ul>")
+
+        for block in blocks:
+            text = html.escape(block.text)
+            if block.tag != "li":
+                close_lists(0)
+                parts.append(f"<{block.tag}>{text}</{block.tag}>")
+                continue
+
+            close_lists(block.level + 1)
+            if open_lists and open_lists[-1][0] == block.level:
+                if open_lists[-1][1] == block.list_type:
+                    parts.append("</li>")
+                else:
+                    close_lists(block.level)
+
+            if not open_lists or open_lists[-1][0] < block.level:
+                # Enumerators are kept in the text, as they are referenced by
+                # other clauses, so ordered lists are not numbered again
+                style = ' style="list-style-type: none"' if block.label else ""
+                parts.append(f"<ul{style}>")
+                open_lists.append((block.level, block.list_type))
+
+            label = f"{html.escape(block.label)} " if block.label else ""
+            parts.append(
+                f'<li data-page-start="{block.first_line.page}" '
+                f'data-page-end="{block.last_line.page}">{label}{text}'
+            )
+
+        close_lists(0)
+        parts.append("</body></html>")
+        return "".join(parts)
+
+
+def _is_bold_font(fontname: str) -> bool:
+    return bool(re.search(r"bold|black|heavy|semibold|demi", fontname, re.IGNORECASE))
+
+
+PDF_TO_HTML_ENGINES: Dict[str, Type[BasePdfToHtmlEngine]] = {
+    ConvertApiEngine.name: ConvertApiEngine,
+    PdfPlumberEngine.name: PdfPlumberEngine,
+}
+
+
+def get_pdf_to_html_engine(name: Optional[str] = None) -> BasePdfToHtmlEngine:
+    """
+    Return the PDF to HTML conversion engine with the given name, or the one
+    selected by `PDF_TO_HTML_ENGINE`.
+    """
+    name = name or config.PDF_TO_HTML_ENGINE
+    try:
+        return PDF_TO_HTML_ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown PDF to HTML engine: {name}") from None
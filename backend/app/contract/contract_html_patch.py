@@ -0,0 +1,91 @@
+import re
+from typing import List, Optional, Tuple
+
+# Splits HTML into tags and the text between them (kept by the capture group)
+TOKEN_PATTERN = re.compile(r"(<[^>]*>)")
+# How many tokens ahead of a difference to look for where the HTMLs agree again
+RESYNC_WINDOW = 16
+# Patches larger than this share of the processed HTML are not worth storing
+MAX_PATCH_RATIO = 0.5
+
+# A patch replaces `deleted` tokens of the original HTML, from the token at
+# `index`, with `inserted`
+PatchOperation = Tuple[int, int, str]
+
+
+def make_html_patch(original: str, processed: str) -> Optional[List[PatchOperation]]:
+    """
+    Make a patch turning the original HTML of a contract into its processed
+    HTML, to store instead of the processed HTML.
+
+    Marking clauses only rewrites the start tags of list items (adding
+    `data-*` attributes) and keeps everything else, so the HTMLs are compared
+    tag by tag in one pass, rather than with a general diff, and the patch
+    holds little more than the rewritten tags.
+
+    Args:
+        original (str): The original HTML.
+        processed (str): The processed HTML.
+
+    Returns:
+        Optional[List[PatchOperation]]: The patch, or None if the HTMLs differ
+            too much for a patch to be smaller than the processed HTML.
+    """
+    original_tokens = TOKEN_PATTERN.split(original)
+    processed_tokens = TOKEN_PATTERN.split(processed)
+    patch, patch_size = [], 0
+    i = j = 0
+    while i < len(original_tokens) or j < len(processed_tokens):
+        if (
+            i < len(original_tokens)
+            and j < len(processed_tokens)
+            and original_tokens[i] == processed_tokens[j]
+        ):
+            i += 1
+            j += 1
+            continue
+
+        deleted, inserted = _resync(original_tokens, processed_tokens, i, j)
+        patch.append((i, deleted, "".join(processed_tokens[j : j + inserted])))
+        patch_size += len(patch[-1][2])
+        if patch_size > len(processed) * MAX_PATCH_RATIO:
+            return None
+        i += deleted
+        j += inserted
+    return patch
+
+
+def apply_html_patch(original: str, patch: List[PatchOperation]) -> str:
+    """
+    Apply a patch from `make_html_patch` to the original HTML.
+    """
+    original_tokens = TOKEN_PATTERN.split(original)
+    parts, i = [], 0
+    for index, deleted, inserted in patch:
+        parts += original_tokens[i:index]
+        parts.append(inserted)
+        i = index + deleted
+    parts += original_tokens[i:]
+    return "".join(parts)
+
+
+def _resync(
+    original_tokens: List[str], processed_tokens: List[str], i: int, j: int
+) -> Tuple[int, int]:
+    """
+    The numbers of differing original and processed tokens from `i` and `j`
+    before the next token they have in common (the fewest tokens first),
+    or the rest of both if there is none within `RESYNC_WINDOW`.
+    """
+    for distance in range(1, 2 * RESYNC_WINDOW + 1):
+        for deleted in range(
+            max(0, distance - RESYNC_WINDOW), min(distance, RESYNC_WINDOW) + 1
+        ):
+            inserted = distance - deleted
+            if (
+                i + deleted < len(original_tokens)
+                and j + inserted < len(processed_tokens)
+                and original_tokens[i + deleted] == processed_tokens[j + inserted]
+            ):
+                return deleted, inserted
+    return len(original_tokens) - i, len(processed_tokens) - j
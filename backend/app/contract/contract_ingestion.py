@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from typing import BinaryIO, List, Optional, Tuple
+
+from app.contract.contract_clause_diff import diff_clauses
+from app.contract.contract_clause_index import build_clause_index
+from app.contract.contract_conversion import (
+    BasePdfToHtmlEngine,
+    SplittablePdfToHtmlEngine,
+)
+from app.contract.contract_models import (
+    Clause,
+    ClauseDiff,
+    ClauseIndex,
+    ContractIngestionTimings,
+)
+from app.contract.contract_processor import ContractProcessor, PdfContent
+from core.config import config
+from core.executors import IngestionExecutor, get_ingestion_executor
+
+logger = logging.getLogger(__name__)
+
+
+class ContractIngestor:
+    """
+    Converts uploaded PDFs to HTML and marks their clauses, off the event loop.
+
+    Local (CPU-bound) conversion and clause marking run in the ingestion
+    executor's process pool, and conversion by a web service in its thread
+    pool, so that large uploads do not stall other requests. With several
+    process workers, large PDFs are split into page ranges extracted in
+    parallel, and merged in page order.
+    """
+
+    def __init__(
+        self,
+        pdf_to_html_engine: BasePdfToHtmlEngine,
+        executor: Optional[IngestionExecutor] = None,
+    ):
+        self.pdf_to_html_engine = pdf_to_html_engine
+        self.executor = executor or get_ingestion_executor()
+
+    async def ingest(
+        self,
+        pdf_content: PdfContent,
+        timings: Optional[ContractIngestionTimings] = None,
+    ) -> Tuple[str, str, List[Clause], ClauseIndex, int]:
+        """
+        Convert a PDF to HTML, mark its clauses and index them.
+
+        Args:
+            pdf_content (PdfContent): The content of the PDF file, or the
+                file (e.g. a spooled upload).
+            timings (Optional[ContractIngestionTimings]): Filled in with the
+                time spent in each stage.
+
+        Returns:
+            Tuple[str, str, List[Clause], ClauseIndex, int]: The original
+                HTML, the HTML with marked clauses, the clauses, the clause
+                index and the number of pages.
+
+        Raises:
+            IngestionExecutorBusy: If the executor is saturated.
+        """
+        timings = timings if timings is not None else ContractIngestionTimings()
+        start = time.perf_counter()
+
+        async with self.executor.admit() as queue_time:
+            timings.queue_time = queue_time
+
+            stage_start = time.perf_counter()
+            if self.pdf_to_html_engine.cpu_bound:
+                if self.executor.process_workers and hasattr(pdf_content, "read"):
+                    # Files cannot be sent to worker processes
+                    pdf_content = await self.executor.run_io(_read_file, pdf_content)
+                original_html, pages = await self._convert_locally(pdf_content)
+            else:
+                original_html, pages = await self.executor.run_io(
+                    self.pdf_to_html_engine.convert, pdf_content
+                )
+            timings.conversion_time = time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            processed_html, clauses, clause_index = await self.executor.run_cpu(
+                _mark_and_index_clauses, original_html
+            )
+            timings.marking_time = time.perf_counter() - stage_start
+
+        timings.total_time = time.perf_counter() - start
+        logger.info(
+            f"Ingested a {pages} page contract with {len(clauses)} clauses in "
+            f"{timings.total_time:.2f}s (queue {timings.queue_time:.2f}s, "
+            f"conversion {timings.conversion_time:.2f}s, "
+            f"marking {timings.marking_time:.2f}s)"
+        )
+        return original_html, processed_html, clauses, clause_index, pages
+
+    async def diff_versions(
+        self, previous_clauses: List[Clause], clauses: List[Clause]
+    ) -> ClauseDiff:
+        """
+        Compute the clause-level diff of a new contract version against the
+        previous version, in the process pool. The diff takes an ingestion
+        slot, like ingestions, so that version uploads are held back too when
+        the executor is saturated.
+
+        Args:
+            previous_clauses (List[Clause]): The clauses of the previous version.
+            clauses (List[Clause]): The clauses of the new version.
+
+        Returns:
+            ClauseDiff: The unchanged, modified, added and removed clauses.
+
+        Raises:
+            IngestionExecutorBusy: If the executor is saturated.
+        """
+        start = time.perf_counter()
+        async with self.executor.admit():
+            clause_diff = await self.executor.run_cpu(
+                diff_clauses, previous_clauses, clauses
+            )
+        logger.info(
+            f"Diffed {len(clauses)} clauses against {len(previous_clauses)} in "
+            f"{time.perf_counter() - start:.2f}s: "
+            f"{len(clause_diff.unchanged)} unchanged, "
+            f"{len(clause_diff.modified)} modified, {len(clause_diff.added)} added, "
+            f"{len(clause_diff.removed)} removed"
+        )
+        return clause_diff
+
+    async def _convert_locally(self, pdf_content: PdfContent) -> Tuple[str, int]:
+        """
+        Convert a PDF in the process pool, splitting large PDFs into page
+        ranges that the workers extract in parallel when the engine allows it.
+        """
+        engine = self.pdf_to_html_engine
+        if (
+            not isinstance(engine, SplittablePdfToHtmlEngine)
+            or self.executor.process_workers < 2
+        ):
+            return await self.executor.run_cpu(engine.convert, pdf_content)
+
+        pages = await self.executor.run_io(
+            ContractProcessor.get_number_of_pages, pdf_content
+        )
+        page_ranges = split_page_ranges(
+            pages, self.executor.process_workers, config.INGESTION_MIN_PAGES_PER_RANGE
+        )
+        if len(page_ranges) < 2:
+            return await self.executor.run_cpu(engine.convert, pdf_content)
+
+        extracted = await asyncio.gather(
+            *(
+                self.executor.run_cpu(
+                    engine.extract_pages, pdf_content, first_page, last_page
+                )
+                for first_page, last_page in page_ranges
+            )
+        )
+        original_html = await self.executor.run_cpu(
+            engine.merge_pages, [content for content, _ in extracted], pages
+        )
+        logger.info(f"Extracted {pages} pages in {len(page_ranges)} ranges in parallel")
+        return original_html, pages
+
+
+def split_page_ranges(
+    pages: int, workers: int, min_pages_per_range: int
+) -> List[Tuple[int, int]]:
+    """
+    Split the pages of a PDF into consecutive ranges (first and last page,
+    inclusive) of about the same size, one per worker, or fewer so that
+    ranges have at least `min_pages_per_range` pages.
+    """
+    ranges = max(1, min(workers, pages // max(1, min_pages_per_range)))
+    bounds = [round(pages * index / ranges) for index in range(ranges + 1)]
+    return [(bounds[index] + 1, bounds[index + 1]) for index in range(ranges)]
+
+
+def _mark_and_index_clauses(html: str) -> Tuple[str, List[Clause], ClauseIndex]:
+    processed_html, clauses = ContractProcessor.mark_clauses(html)
+    return processed_html, clauses, build_clause_index(processed_html)
+
+
+def _read_file(file: BinaryIO) -> bytes:
+    file.seek(0)
+    return file.read()
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -28,6 +28,13 @@ class ContractJurisdiction(str, Enum):
     OTHER = "other"
 
 
+class ContractReviewJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 #####################################################################
 ######## DATABASE MODEL #############################################
 #####################################################################
@@ -38,6 +45,66 @@ class Clause(BaseModel):
     content: str
 
 
+class ClauseIndexEntry(BaseModel):
+    """
+    Where a clause sits in the contract: its section, the clauses it is nested
+    in and contains, and its page and character ranges.
+    """
+
+    key: str
+    number: Optional[str] = None  # Its number in the text, e.g. "1.1" or "2.3.4"
+    # The top-level section it belongs to: its top-level number (e.g. "2"), or
+    # the heading it follows in contracts without numbered clauses
+    section: Optional[str] = None
+    parent: Optional[str] = None  # Key of the clause it is nested in
+    children: List[str] = Field(default_factory=list)
+    depth: int = 0  # Number of clauses it is nested in
+    page_start: Optional[int] = None  # None when the HTML has no page information
+    page_end: Optional[int] = None
+    # Character range of its list item in the processed HTML
+    offset_start: int
+    offset_end: int
+
+
+class ClauseIndex(BaseModel):
+    """
+    Hierarchical index of a contract's clauses, built at ingestion.
+    """
+
+    # By clause key, in contract order
+    entries: Dict[str, ClauseIndexEntry] = Field(default_factory=dict)
+
+    def get(self, key: str) -> Optional[ClauseIndexEntry]:
+        return self.entries.get(key)
+
+    def roots(self) -> List[ClauseIndexEntry]:
+        """The clauses not nested in other clauses, in contract order."""
+        return [entry for entry in self.entries.values() if entry.parent is None]
+
+    def sections_by_key(self) -> Dict[str, str]:
+        """The section of each clause that has one, by clause key."""
+        return {
+            key: entry.section
+            for key, entry in self.entries.items()
+            if entry.section is not None
+        }
+
+
+class ClauseDiff(BaseModel):
+    """
+    Clause-level diff of a contract version against the previous version, by
+    clause key of the new version.
+    """
+
+    # The key of the same clause in the previous version, for clauses whose
+    # text did not change (apart from formatting and numbering)
+    unchanged: Dict[str, str] = Field(default_factory=dict)
+    # The key of the clause it replaces, for modified clauses
+    modified: Dict[str, str] = Field(default_factory=dict)
+    added: List[str] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)  # Keys in the previous version
+
+
 class RiskyClause(BaseModel):
     key: str
     content: str
@@ -47,6 +114,41 @@ class RiskyClause(BaseModel):
     recommendations: str
 
 
+class TokenUsage(BaseModel):
+    """
+    Tokens billed for one or more OpenAI requests, from their `usage` blocks.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, usage: Optional[dict]) -> None:
+        """Add the `usage` block of an OpenAI response, if it has one."""
+        if not usage:
+            return
+        self.prompt_tokens += usage.get("prompt_tokens") or 0
+        self.completion_tokens += usage.get("completion_tokens") or 0
+
+
+class ReviewBatch(BaseModel):
+    """
+    Accounting for one clause batch request, including its retries.
+    """
+
+    batch_number: int
+    clauses: int
+    usage: TokenUsage = Field(default_factory=TokenUsage)
+    latency: float = 0.0  # Seconds from the first attempt until the batch finished
+    attempts: int = 0  # Requests sent to the API
+    rate_limit_hits: int = 0  # 429 responses
+    parse_failures: int = 0  # Responses whose analyzed clauses could not be parsed
+    succeeded: bool = False
+
+
 class ReviewAnalytics(BaseModel):
     tokens_used: int
     total_time_taken: float
@@ -56,17 +158,89 @@ class ReviewAnalytics(BaseModel):
     rate_limit_hits: int
     average_time_per_batch: float
     success_rate: float  # Percentage of clauses successfully parsed
+    cache_hits: int = 0  # Clauses served from the clause review cache
+    cache_hit_ratio: float = 0.0  # Fraction of clauses served from the cache
+    # Wall times (seconds) of the clause batches and of the summary checklist,
+    # and how long they ran concurrently
+    batches_time: float = 0.0
+    summary_time: float = 0.0
+    summary_overlap_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    p50_batch_latency: float = 0.0
+    p95_batch_latency: float = 0.0
+    tokens_per_clause: float = 0.0  # Batch tokens per clause sent to the LLM
+    # Unchanged clauses of a new contract version whose results were carried
+    # over from the previous version's review, and the tokens and time that
+    # re-reviewing them would have taken (estimated from that review)
+    carried_over_clauses: int = 0
+    saved_tokens: int = 0
+    saved_time: float = 0.0
+
+
+class ReviewCoverage(BaseModel):
+    """
+    Which clauses a review covers, by clause key in contract order. A review is
+    partial when clauses failed or were not reached before the timeout.
+    """
+
+    analyzed: List[str] = Field(default_factory=list)
+    failed: List[str] = Field(default_factory=list)  # Batch errored after retries
+    missing: List[str] = Field(default_factory=list)  # Not processed in time
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.failed and not self.missing
+
+
+class ContractIngestionTimings(BaseModel):
+    """
+    Seconds spent in each stage of ingesting an uploaded contract.
+    """
+
+    queue_time: float = 0.0  # Waiting for an ingestion slot
+    conversion_time: float = 0.0  # PDF to HTML
+    marking_time: float = 0.0  # Clause marking
+    total_time: float = 0.0
+
+
+class ContractBody(CoreBaseModel):
+    """
+    The HTML of a contract, stored apart from the contract document so that
+    listing and reviewing contracts do not load it.
+    """
+
+    id: PyObjectId = Field(alias="_id")  # The contract's
+    processed_html: str
+    original_html: str
+    created_at: datetime = Field(default_factory=utcnow)
 
 
 class Contract(CoreBaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     title: str
-    processed_html: str
-    original_html: str
+    # Stored in the contract's ContractBody (inline for contracts saved before
+    # it), and None when the contract is fetched without its body
+    processed_html: Optional[str] = None
+    original_html: Optional[str] = None
     uploaded_by: PyObjectId
     clauses: Optional[List[Clause]] = Field(default_factory=list)
     pages: Optional[int]
+    clause_index: Optional[ClauseIndex] = None  # None for contracts saved before it
+    content_sha256: Optional[str] = None  # Of the uploaded PDF
+    file_size: Optional[int] = None  # Of the uploaded PDF, in bytes
+    ingestion_engine: Optional[str] = None  # PDF to HTML engine that converted it
+    ingestion_timings: Optional[ContractIngestionTimings] = None  # None if reused
+    # The user's earlier upload of the same PDF whose HTML and clauses were
+    # reused (None when another user's shared upload was)
+    deduplicated_from: Optional[PyObjectId] = None
+    # Contracts uploaded as a new version (e.g. a redline) of an earlier one
+    version: int = 1
+    previous_version_id: Optional[PyObjectId] = None
+    clause_diff: Optional[ClauseDiff] = None  # Against the previous version
     has_review: bool = False
+    # Whether the review can be linked to other users' uploads of the same PDF
+    review_shared: bool = False
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow)
 
@@ -80,6 +254,31 @@ class ContractReview(CoreBaseModel):
     contract_jurisdiction: ContractJurisdiction = ContractJurisdiction.OTHER
     summary_checklist: Optional[str] = None
     analytics: ReviewAnalytics
+    coverage: Optional[ReviewCoverage] = None  # None for reviews saved before coverage
+    batches: List[ReviewBatch] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+
+class ContractReviewJob(CoreBaseModel):
+    """
+    Background contract review, checkpointed after every processed batch.
+    """
+
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    contract_id: PyObjectId
+    user_id: PyObjectId
+    contract_type: ContractType = ContractType.OTHER
+    contract_industry: ContractIndustry = ContractIndustry.OTHER
+    contract_jurisdiction: ContractJurisdiction = ContractJurisdiction.OTHER
+    status: ContractReviewJobStatus = ContractReviewJobStatus.QUEUED
+    batches_done: int = 0
+    total_batches: Optional[int] = None
+    risky_clauses: List[RiskyClause] = Field(default_factory=list)
+    review_id: Optional[PyObjectId] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    locked_until: Optional[datetime] = None
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow)
 
@@ -99,6 +298,10 @@ class ContractExplainClauseRequest(BaseModel):
     clause: str
 
 
+class ContractReviewSharingRequest(BaseModel):
+    shared: bool
+
+
 #####################################################################
 ######## RESPONSE MODELS ############################################
 #####################################################################
@@ -108,5 +311,62 @@ class ContractResponse(Contract):
     pass
 
 
+class ContractSummary(CoreBaseModel):
+    """
+    A contract without its HTML, clauses and ingestion details, for listing
+    contracts. Fetched with `projection()`.
+    """
+
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    uploaded_by: PyObjectId
+    pages: Optional[int] = None
+    file_size: Optional[int] = None
+    version: int = 1
+    previous_version_id: Optional[PyObjectId] = None
+    has_review: bool = False
+    review_shared: bool = False
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def projection(cls) -> Dict[str, int]:
+        """The MongoDB projection of the contract fields it is made of."""
+        return {field.alias or name: 1 for name, field in cls.model_fields.items()}
+
+
+class ContractSummaryPage(BaseModel):
+    items: List[ContractSummary]
+    next_cursor: Optional[str] = None  # None for the last page
+
+
 class ContractResponseWithReview(ContractResponse):
     review: Optional[ContractReview] = None
+
+
+class ContractReviewJobResponse(ContractReviewJob):
+    pass
+
+
+class ContractReviewEventType(str, Enum):
+    RISKY_CLAUSES = "risky_clauses"
+    PROGRESS = "progress"
+    COMPLETE = "complete"
+    ERROR = "error"
+
+
+class ContractReviewEvent(BaseModel):
+    """
+    Event emitted by the streaming contract review, one per NDJSON line.
+    """
+
+    event: ContractReviewEventType
+    batches_done: Optional[int] = None
+    total_batches: Optional[int] = None
+    risky_clauses: Optional[List[RiskyClause]] = None
+    summary_checklist: Optional[str] = None
+    analytics: Optional[ReviewAnalytics] = None
+    coverage: Optional[ReviewCoverage] = None
+    batches: Optional[List[ReviewBatch]] = None
+    review: Optional[ContractReview] = None
+    message: Optional[str] = None
@@ -1,12 +1,18 @@
-import os
-import tempfile
+from io import BytesIO
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
 
 import convertapi
-from bs4 import BeautifulSoup
+import pdfplumber
+from pdfplumber.page import Page
 from PyPDF2 import PdfReader
 
+from app.contract.contract_clause_marker import get_clause_marker
 from app.contract.contract_models import Clause
 
+# PDF content in memory (e.g. a slice of a larger buffer), or a binary file
+# such as a spooled upload
+PdfContent = Union[bytes, bytearray, memoryview, BinaryIO]
+
 
 class ContractProcessor:
     """
@@ -16,53 +22,69 @@ class ContractProcessor:
     - convert_pdf_to_html: Convert a PDF file to HTML and return the number of pages.
     - mark_clauses: Mark clauses in the HTML content.
     - get_number_of_pages: Get the number of pages in a PDF file.
+    - iter_pdf_pages: Parse a PDF once, yielding its pages (or a range of
+      them) as they are decoded.
     """
 
     @staticmethod
-    def parse_pdf_to_html(file_path: str) -> str:
+    def parse_pdf_to_html(file: Union[str, BinaryIO]) -> str:
+        if not isinstance(file, str):
+            # Uploaded from memory, without writing a temporary file
+            file = convertapi.UploadIO(file, "contract.pdf")
         result = convertapi.convert(
-            "html", {"File": file_path, "Wysiwyg": "false"}, from_format="pdf"
+            "html", {"File": file, "Wysiwyg": "false"}, from_format="pdf"
         )
         return result.file.io.getvalue().decode("utf-8")
 
     @staticmethod
-    def convert_pdf_to_html(file: bytes) -> tuple[str, int]:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-            temp_pdf.write(file)
-            temp_pdf_path = temp_pdf.name
-
-        try:
-            html = ContractProcessor.parse_pdf_to_html(temp_pdf_path)
-            pages = ContractProcessor.get_number_of_pages(temp_pdf_path)
-        finally:
-            os.unlink(temp_pdf_path)
-
+    def convert_pdf_to_html(file: PdfContent) -> tuple[str, int]:
+        # One stream serves both the upload and the page count
+        stream = ContractProcessor._as_stream(file)
+        html = ContractProcessor.parse_pdf_to_html(stream)
+        pages = ContractProcessor.get_number_of_pages(stream)
         return html, pages
 
     @staticmethod
     def mark_clauses(html: str) -> tuple[str, list[Clause]]:
-        soup = BeautifulSoup(html, "html.parser")
-        clauses = []
+        return get_clause_marker().mark(html)
 
-        for clause_counter, li in enumerate(
-            soup.find_all("li", recursive=True), start=1
-        ):
-            if li.get_text(strip=True):
-                li["data-is-clause"] = "true"
-                li["data-location"] = "section"
-                li["data-clause-id"] = f"clause-{clause_counter}"
-                clauses.append(
-                    Clause(
-                        key=f"clause-{clause_counter}",
-                        content=li.get_text(strip=True),
-                        location=li["data-location"],
-                    )
-                )
+    @staticmethod
+    def get_number_of_pages(file: Union[str, PdfContent]) -> int:
+        if not isinstance(file, str):
+            file = ContractProcessor._as_stream(file)
+        # Only the page tree is read, not the page contents
+        return len(PdfReader(file).pages)
+
+    @staticmethod
+    def iter_pdf_pages(
+        file: PdfContent, first_page: int = 1, last_page: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, Page]]:
+        """
+        Parse a PDF once, yielding (page number, number of pages,
+        page) for each page, or for the pages from `first_page` to
+        `last_page` (inclusive, numbered from 1).
 
-        return str(soup), clauses
+        Page contents are decoded lazily, when the page's text or layout is
+        extracted, so later stages can start on the first pages before the
+        rest of the document is decoded, and the pages outside the range are
+        never decoded. Each page's cached layout is released once the consumer
+        moves on to the next page.
+        """
+        with pdfplumber.open(ContractProcessor._as_stream(file)) as pdf:
+            pages = len(pdf.pages)
+            for page_number, page in enumerate(
+                pdf.pages[first_page - 1 : last_page], start=first_page
+            ):
+                try:
+                    yield page_number, pages, page
+                finally:
+                    page.close()
 
     @staticmethod
-    def get_number_of_pages(file_path: str) -> int:
-        with open(file_path, "rb") as file:
-            reader = PdfReader(file)
-            return len(reader.pages)
+    def _as_stream(file: PdfContent) -> BinaryIO:
+        if hasattr(file, "read"):
+            # Read from its start, in place (e.g. from a spooled upload)
+            file.seek(0)
+            return file
+        # BytesIO shares the buffer of a bytes object rather than copying it
+        return BytesIO(file if isinstance(file, bytes) else bytes(file))
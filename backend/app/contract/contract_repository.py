@@ -1,55 +1,253 @@
-from typing import List, Optional
+import asyncio
+import json
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional, Tuple
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
-from pymongo import ReturnDocument
+from pymongo import IndexModel, ReturnDocument
 
-from app.contract.contract_models import Contract, ContractReview
+from app.contract.contract_html_patch import apply_html_patch, make_html_patch
+from app.contract.contract_models import (
+    Contract,
+    ContractBody,
+    ContractReview,
+    ContractReviewJob,
+    ContractReviewJobStatus,
+    ContractSummary,
+    RiskyClause,
+)
 from app.shared.models.mongodb_models import PyObjectId
+from core.config import config
+from core.database.codecs import (
+    BaseTextCodec,
+    decode_text,
+    encode_text,
+    get_text_codec,
+)
+from core.database.indexes import IndexedRepository, RepositoryQuery
+from core.database.pagination import after_cursor, encode_cursor
 from core.utils.datetime import utcnow
 
+# Fields of contract documents stored in the contract's body instead
+BODY_FIELDS = ("original_html", "processed_html")
+# Order of contract listings, newest first
+LISTING_SORT = [("created_at", -1), ("_id", -1)]
+
+
+class ReviewJobLeaseLost(Exception):
+    """
+    Raised when a worker writes to a review job that another worker has
+    reclaimed since its lease expired.
+    """
+
+
+class ContractRepository(IndexedRepository):
+    INDEXES = {
+        "contracts_collection": [
+            IndexModel(
+                [("uploaded_by", 1), ("created_at", -1), ("_id", -1)],
+                name="uploaded_by_created_at_id",
+            ),
+            IndexModel(
+                [("content_sha256", 1), ("ingestion_engine", 1), ("created_at", -1)],
+                name="content_sha256_ingestion_engine_created_at",
+            ),
+        ],
+        "contract_reviews_collection": [
+            IndexModel([("contract_id", 1)], name="contract_id", unique=True),
+        ],
+        "contract_review_jobs_collection": [
+            IndexModel(
+                [("status", 1), ("locked_until", 1), ("created_at", 1)],
+                name="status_locked_until_created_at",
+            ),
+        ],
+    }
+    QUERIES = [
+        RepositoryQuery(
+            name="list contracts",
+            collection="contracts_collection",
+            filter={"uploaded_by": ObjectId()},
+            sort=LISTING_SORT,
+        ),
+        RepositoryQuery(
+            name="list contracts after a cursor",
+            collection="contracts_collection",
+            filter={
+                "$and": [
+                    {"uploaded_by": ObjectId()},
+                    after_cursor(encode_cursor(utcnow(), ObjectId())),
+                ]
+            },
+            sort=LISTING_SORT,
+        ),
+        RepositoryQuery(
+            name="find an upload of the same PDF",
+            collection="contracts_collection",
+            filter={
+                "content_sha256": "0" * 64,
+                "ingestion_engine": "pdfplumber",
+                "$or": [{"uploaded_by": ObjectId()}, {"review_shared": True}],
+            },
+            sort=[("created_at", -1)],
+        ),
+        RepositoryQuery(
+            name="find a reviewed upload of the same PDF",
+            collection="contracts_collection",
+            filter={
+                "content_sha256": "0" * 64,
+                "ingestion_engine": "pdfplumber",
+                "has_review": True,
+                "$or": [{"uploaded_by": ObjectId()}, {"review_shared": True}],
+            },
+            sort=[("created_at", -1)],
+        ),
+        RepositoryQuery(
+            name="get a contract review",
+            collection="contract_reviews_collection",
+            filter={"contract_id": ObjectId()},
+        ),
+        RepositoryQuery(
+            name="claim a review job",
+            collection="contract_review_jobs_collection",
+            filter={
+                "$or": [
+                    {"status": ContractReviewJobStatus.QUEUED.value},
+                    {
+                        "status": ContractReviewJobStatus.RUNNING.value,
+                        "locked_until": {"$lt": utcnow()},
+                    },
+                ],
+                "attempts": {"$lt": config.REVIEW_JOB_MAX_ATTEMPTS},
+            },
+            sort=[("created_at", 1)],
+        ),
+        RepositoryQuery(
+            name="fail review jobs out of attempts",
+            collection="contract_review_jobs_collection",
+            filter={
+                "status": ContractReviewJobStatus.RUNNING.value,
+                "locked_until": {"$lt": utcnow()},
+                "attempts": {"$gte": config.REVIEW_JOB_MAX_ATTEMPTS},
+            },
+        ),
+    ]
 
-class ContractRepository:
     def __init__(
         self,
         contracts_collection: AsyncIOMotorCollection,
         contract_reviews_collection: AsyncIOMotorCollection,
+        contract_review_jobs_collection: AsyncIOMotorCollection,
+        contract_bodies_collection: AsyncIOMotorCollection,
+        body_codec: Optional[BaseTextCodec] = None,
+        body_min_bytes: int = 0,
+        html_patch: bool = True,
     ):
         self.contracts_collection = contracts_collection
         self.contract_reviews_collection = contract_reviews_collection
+        self.contract_review_jobs_collection = contract_review_jobs_collection
+        self.contract_bodies_collection = contract_bodies_collection
+        # HTML of at least `body_min_bytes` is compressed with `body_codec`,
+        # and processed HTML stored as a patch over the original HTML
+        self.body_codec = body_codec or get_text_codec()
+        self.body_min_bytes = body_min_bytes
+        self.html_patch = html_patch
 
     async def create_contract(self, contract: Contract) -> Contract | None:
+        """
+        Save a contract, with its HTML in a separate (compressed) contract
+        body.
+        """
+        # Compressing large HTML takes a while, but zlib releases the GIL
+        body_data = await asyncio.to_thread(
+            self._encode_body,
+            ContractBody(
+                _id=contract.id,
+                original_html=contract.original_html or "",
+                processed_html=contract.processed_html or "",
+            ),
+        )
+        await self.contract_bodies_collection.insert_one(body_data)
         result = await self.contracts_collection.insert_one(
-            contract.model_dump(by_alias=True)
+            contract.model_dump(by_alias=True, exclude=set(BODY_FIELDS))
         )
         contract.id = result.inserted_id
         return contract
 
-    async def get_contract_by_id(self, contract_id: str) -> Optional[Contract]:
+    async def get_contract_by_id(
+        self, contract_id: str, include_body: bool = True
+    ) -> Optional[Contract]:
+        """
+        Fetch a contract, with its HTML unless `include_body` is False.
+        """
         contract_data = await self.contracts_collection.find_one(
+            {"_id": ObjectId(contract_id)}, self._projection(include_body)
+        )
+        if contract_data:
+            return await self._to_contract(contract_data, include_body)
+        return None
+
+    async def get_contract_body(self, contract_id: str) -> Optional[ContractBody]:
+        """
+        Fetch the HTML of a contract, decompressing it.
+        """
+        body_data = await self.contract_bodies_collection.find_one(
             {"_id": ObjectId(contract_id)}
         )
+        if body_data:
+            return self._decode_body(body_data)
+        return None
+
+    async def get_contract_by_content_sha256(
+        self,
+        content_sha256: str,
+        ingestion_engine: str,
+        available_to: PyObjectId,
+        reviewed: bool = False,
+    ) -> Optional[Contract]:
+        """
+        Fetch the latest contract ingested from the same PDF by the same
+        engine that a user may reuse: their own, or one whose owner shared its
+        review. With `reviewed`, only contracts with a review are considered.
+        """
+        filter_criteria = {
+            "content_sha256": content_sha256,
+            "ingestion_engine": ingestion_engine,
+            "$or": [
+                {"uploaded_by": ObjectId(available_to)},
+                {"review_shared": True},
+            ],
+        }
+        if reviewed:
+            filter_criteria["has_review"] = True
+
+        contract_data = await self.contracts_collection.find_one(
+            filter_criteria, sort=[("created_at", -1)]
+        )
         if contract_data:
-            return Contract(**contract_data)
+            return await self._to_contract(contract_data)
         return None
 
     async def update_contract(
-        self, contract_id: PyObjectId, update_data: dict
+        self, contract_id: PyObjectId, update_data: dict, include_body: bool = True
     ) -> Optional[Contract]:
         update_data["updated_at"] = utcnow()
         contract_data = await self.contracts_collection.find_one_and_update(
             {"_id": ObjectId(contract_id)},
             {"$set": update_data},
+            projection=self._projection(include_body),
             return_document=ReturnDocument.AFTER,
         )
         if contract_data:
-            return Contract(**contract_data)
+            return await self._to_contract(contract_data, include_body)
         return None
 
     async def delete_contract(self, contract_id: str) -> bool:
         result = await self.contracts_collection.delete_one(
             {"_id": ObjectId(contract_id)}
         )
+        await self.contract_bodies_collection.delete_one({"_id": ObjectId(contract_id)})
         return result.deleted_count > 0
 
     async def get_contracts(
@@ -61,9 +259,12 @@ class ContractRepository:
         sort: Optional[List[tuple]] = [("created_at", -1)],
     ) -> List[Contract]:
         """
-        Fetch contracts with optional projection, pagination, and sorting.
+        Fetch contracts with optional projection, pagination, and sorting,
+        without their HTML.
         """
-        query = self.contracts_collection.find(filter, projection)
+        query = self.contracts_collection.find(
+            filter, projection or self._projection(include_body=False)
+        )
 
         if sort:
             query = query.sort(sort)
@@ -80,21 +281,148 @@ class ContractRepository:
         contract_list = await query.to_list(length=limit if limit else None)
         return [Contract(**contract) for contract in contract_list]
 
+    async def get_contract_summaries(
+        self,
+        filter: dict,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+    ) -> Tuple[List[ContractSummary], Optional[str]]:
+        """
+        Fetch a page of contract summaries, newest first, projecting out
+        everything else (HTML, clauses, indexes) in the database.
+
+        Pages continue from a `cursor` returned with the previous page (keyset
+        pagination on `created_at` and `_id`), rather than skipping the
+        previous pages. `skip` is only kept for page-numbered requests.
+
+        Returns:
+            Tuple[List[ContractSummary], Optional[str]]: The page, and the
+            cursor of the next page (None for the last page).
+
+        Raises:
+            InvalidCursor: If the cursor is malformed.
+        """
+        if cursor is not None:
+            filter = {"$and": [filter, after_cursor(cursor)]}
+
+        query = self.contracts_collection.find(
+            filter, ContractSummary.projection()
+        ).sort(LISTING_SORT)
+        if skip:
+            query = query.skip(skip)
+        # One more than the page to know whether there is a next page
+        contract_list = await query.limit(limit + 1).to_list(length=limit + 1)
+
+        summaries = [ContractSummary(**contract) for contract in contract_list[:limit]]
+        next_cursor = None
+        if len(contract_list) > limit:
+            next_cursor = encode_cursor(summaries[-1].created_at, summaries[-1].id)
+        return summaries, next_cursor
+
+    async def iter_contracts(
+        self, filter: dict, include_body: bool = False, page_size: int = 100
+    ) -> AsyncIterator[Contract]:
+        """
+        Iterate over all matching contracts, newest first, for bulk jobs.
+
+        Contracts are fetched a page at a time with keyset pagination, so no
+        server-side cursor is held open for the whole iteration (and times
+        out) however long each contract takes to process.
+        """
+        cursor = None
+        while True:
+            page_filter = (
+                filter if cursor is None else {"$and": [filter, after_cursor(cursor)]}
+            )
+            contract_list = (
+                await self.contracts_collection.find(
+                    page_filter, self._projection(include_body)
+                )
+                .sort(LISTING_SORT)
+                .limit(page_size)
+                .to_list(length=page_size)
+            )
+            for contract_data in contract_list:
+                yield await self._to_contract(contract_data, include_body)
+            if len(contract_list) < page_size:
+                return
+            last = contract_list[-1]
+            cursor = encode_cursor(last["created_at"], last["_id"])
+
+    def _encode_body(self, body: ContractBody) -> dict:
+        """
+        The document of a contract body: its HTML compressed, and the
+        processed HTML as a patch over the original HTML when it is smaller.
+        """
+        body_data = body.model_dump(by_alias=True)
+        patch = (
+            make_html_patch(body.original_html, body.processed_html)
+            if self.html_patch
+            else None
+        )
+        if patch is not None:
+            del body_data["processed_html"]
+            body_data["processed_html_patch"] = json.dumps(patch, separators=(",", ":"))
+        for field in ("original_html", "processed_html", "processed_html_patch"):
+            if field in body_data:
+                body_data[field] = encode_text(
+                    body_data[field], self.body_codec, self.body_min_bytes
+                )
+        return body_data
+
+    @staticmethod
+    def _decode_body(body_data: dict) -> ContractBody:
+        # Bodies saved before compression hold plain strings, which decode
+        # to themselves
+        body_data["original_html"] = decode_text(body_data["original_html"])
+        if "processed_html_patch" in body_data:
+            patch = json.loads(decode_text(body_data.pop("processed_html_patch")))
+            body_data["processed_html"] = apply_html_patch(
+                body_data["original_html"], patch
+            )
+        else:
+            body_data["processed_html"] = decode_text(body_data["processed_html"])
+        return ContractBody(**body_data)
+
+    @staticmethod
+    def _projection(include_body: bool) -> Optional[dict]:
+        # Excludes the HTML of contracts saved before contract bodies
+        return None if include_body else {field: 0 for field in BODY_FIELDS}
+
+    async def _to_contract(
+        self, contract_data: dict, include_body: bool = True
+    ) -> Contract:
+        """
+        Build a contract from its document, loading its HTML from its body
+        when asked to (unless it is inline, in contracts saved before bodies).
+        """
+        if include_body and not all(field in contract_data for field in BODY_FIELDS):
+            body = await self.get_contract_body(contract_data["_id"])
+            if body is not None:
+                contract_data.update(body.model_dump(include=set(BODY_FIELDS)))
+        return Contract(**contract_data)
+
     async def create_contract_review(
         self, contract_review: ContractReview
     ) -> ContractReview | None:
-        existing_review = await self.get_contract_review_by_contract_id(
-            contract_review.contract_id
-        )
-        if existing_review:
-            contract_review.id = existing_review.id
-            return await self.update_contract_review(contract_review)
-
-        result = await self.contract_reviews_collection.insert_one(
-            contract_review.model_dump(by_alias=True)
+        """
+        Save the review of a contract, replacing its previous review (whose id
+        and creation time are kept), in one upsert on the unique `contract_id`.
+        """
+        contract_review_data = contract_review.model_dump(by_alias=True)
+        created = {
+            field: contract_review_data.pop(field) for field in ("_id", "created_at")
+        }
+        saved_review_data = await self.contract_reviews_collection.find_one_and_update(
+            {"contract_id": ObjectId(contract_review.contract_id)},
+            {"$set": contract_review_data, "$setOnInsert": created},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
         )
-        contract_review.id = result.inserted_id
-        return contract_review
+        if saved_review_data:
+            return ContractReview(**saved_review_data)
+        return None
 
     async def update_contract_review(
         self, contract_review: ContractReview
@@ -117,3 +445,183 @@ class ContractRepository:
         if contract_review_data:
             return ContractReview(**contract_review_data)
         return None
+
+    async def create_review_job(self, job: ContractReviewJob) -> ContractReviewJob:
+        result = await self.contract_review_jobs_collection.insert_one(
+            job.model_dump(by_alias=True)
+        )
+        job.id = result.inserted_id
+        return job
+
+    async def get_review_job_by_id(self, job_id: str) -> Optional[ContractReviewJob]:
+        job_data = await self.contract_review_jobs_collection.find_one(
+            {"_id": ObjectId(job_id)}
+        )
+        if job_data:
+            return ContractReviewJob(**job_data)
+        return None
+
+    async def claim_review_job(
+        self,
+        lease_seconds: int,
+        max_attempts: int,
+        job_id: Optional[str] = None,
+    ) -> Optional[ContractReviewJob]:
+        """
+        Atomically claim a queued job (or a running job whose worker's lease
+        expired) and mark it as running. Claims the oldest job unless `job_id`
+        is given.
+
+        The review of a reclaimed job starts over, so the progress and partial
+        results of the previous attempt are cleared.
+        """
+        now = utcnow()
+        filter_criteria = {
+            "$or": [
+                {"status": ContractReviewJobStatus.QUEUED.value},
+                {
+                    "status": ContractReviewJobStatus.RUNNING.value,
+                    "locked_until": {"$lt": now},
+                },
+            ],
+            "attempts": {"$lt": max_attempts},
+        }
+        if job_id is not None:
+            filter_criteria["_id"] = ObjectId(job_id)
+
+        job_data = await self.contract_review_jobs_collection.find_one_and_update(
+            filter_criteria,
+            {
+                "$set": {
+                    "status": ContractReviewJobStatus.RUNNING.value,
+                    "batches_done": 0,
+                    "risky_clauses": [],
+                    "locked_until": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job_data:
+            return ContractReviewJob(**job_data)
+        return None
+
+    async def fail_expired_review_jobs(self, max_attempts: int) -> int:
+        """
+        Mark as failed the running jobs whose worker's lease expired after
+        their last attempt, which would otherwise stay running forever.
+
+        Returns:
+            int: The number of jobs marked as failed.
+        """
+        now = utcnow()
+        result = await self.contract_review_jobs_collection.update_many(
+            {
+                "status": ContractReviewJobStatus.RUNNING.value,
+                "locked_until": {"$lt": now},
+                "attempts": {"$gte": max_attempts},
+            },
+            {
+                "$set": {
+                    "status": ContractReviewJobStatus.FAILED.value,
+                    "error": f"The review did not finish in {max_attempts} attempts.",
+                    "locked_until": None,
+                    "updated_at": now,
+                }
+            },
+        )
+        return result.modified_count
+
+    async def checkpoint_review_job(
+        self,
+        job_id: PyObjectId,
+        attempt: int,
+        batches_done: int,
+        total_batches: Optional[int],
+        risky_clauses: List[RiskyClause],
+        lease_seconds: int,
+    ) -> None:
+        """
+        Record the progress and newly found risky clauses of a running job in
+        one write, extending the worker's lease.
+
+        Raises:
+            ReviewJobLeaseLost: If the job is no longer held by this attempt.
+        """
+        now = utcnow()
+        update = {
+            "$set": {
+                "batches_done": batches_done,
+                "total_batches": total_batches,
+                "locked_until": now + timedelta(seconds=lease_seconds),
+                "updated_at": now,
+            }
+        }
+        if risky_clauses:
+            update["$push"] = {
+                "risky_clauses": {
+                    "$each": [
+                        risky_clause.model_dump() for risky_clause in risky_clauses
+                    ]
+                }
+            }
+        result = await self.contract_review_jobs_collection.update_one(
+            self._claimed_job_filter(job_id, attempt), update
+        )
+        if result.matched_count == 0:
+            raise ReviewJobLeaseLost(f"Review job {job_id} was reclaimed.")
+
+    async def extend_review_job_lease(
+        self, job_id: PyObjectId, attempt: int, lease_seconds: int
+    ) -> None:
+        """
+        Extend the worker's lease on a running job, e.g. before saving its
+        review.
+
+        Raises:
+            ReviewJobLeaseLost: If the job is no longer held by this attempt.
+        """
+        now = utcnow()
+        result = await self.contract_review_jobs_collection.update_one(
+            self._claimed_job_filter(job_id, attempt),
+            {
+                "$set": {
+                    "locked_until": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                }
+            },
+        )
+        if result.matched_count == 0:
+            raise ReviewJobLeaseLost(f"Review job {job_id} was reclaimed.")
+
+    async def update_review_job(
+        self, job_id: PyObjectId, update_data: dict, attempt: Optional[int] = None
+    ) -> Optional[ContractReviewJob]:
+        """
+        Update a job, only while it is held by the given attempt if any (so
+        that a worker whose lease expired cannot finish a reclaimed job).
+        """
+        update_data["updated_at"] = utcnow()
+        filter_criteria = (
+            {"_id": ObjectId(job_id)}
+            if attempt is None
+            else self._claimed_job_filter(job_id, attempt)
+        )
+        job_data = await self.contract_review_jobs_collection.find_one_and_update(
+            filter_criteria,
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job_data:
+            return ContractReviewJob(**job_data)
+        return None
+
+    def _claimed_job_filter(self, job_id: PyObjectId, attempt: int) -> dict:
+        # Every claim increments `attempts`, so it identifies the claim
+        return {
+            "_id": ObjectId(job_id),
+            "status": ContractReviewJobStatus.RUNNING.value,
+            "attempts": attempt,
+        }
@@ -3,32 +3,68 @@ import json
 import logging
 import re
 import time
-from typing import AsyncGenerator, Dict, List, Tuple
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
 
 import aiohttp
 import backoff
 
+from app.contract.contract_batch_planner import ClauseBatchPlanner
 from app.contract.contract_models import (
     Clause,
     Contract,
+    ContractReview,
+    ContractReviewEvent,
+    ContractReviewEventType,
     ContractType,
     ReviewAnalytics,
+    ReviewBatch,
+    ReviewCoverage,
     RiskyClause,
+    TokenUsage,
 )
+from app.contract.contract_review_cache import ClauseReviewCache
 from core.config import config
+from core.http_client.session import get_http_session
+from core.rate_limiter import BaseRateLimiter, get_openai_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
 class ContractReviewer:
-    def __init__(self):
+    # Bump whenever the clause analysis prompts change, so that cached clause
+    # results produced by older prompts are no longer reused.
+    PROMPT_VERSION = "clause-review-v1"
+    # Completion tokens reserved with the rate limiter for non-batch requests
+    SUMMARY_COMPLETION_TOKENS = 500
+    EXPLANATION_COMPLETION_TOKENS = 500
+
+    def __init__(
+        self,
+        review_cache: Optional[ClauseReviewCache] = None,
+        rate_limiter: Optional[BaseRateLimiter] = None,
+        timeout: Optional[int] = None,
+    ):
         self.openai_api_key = config.OPENAI_API_KEY
+        self.chat_completions_url = f"{config.OPENAI_API_BASE_URL}/chat/completions"
         self.model = "gpt-3.5-turbo"
         self.temperature = 0.3
+        self.review_cache = review_cache
+        self.rate_limiter = rate_limiter or get_openai_rate_limiter()
         self.rate_limit_hits = 0
         self.max_concurrent_requests = 5
-        self.timeout = 60  # Total timeout for the entire processing (same as lambda timeout for now)
+        # Attempts per batch when the response fails or cannot be parsed
+        self.max_batch_attempts = 3
+        self.batch_retry_delay = 2  # seconds, multiplied by the attempt number
+        # Total timeout for the entire processing (the lambda timeout unless
+        # the review runs as a background job)
+        self.timeout = timeout or config.REVIEW_TIMEOUT
         self.risk_level_threshold = 1
+        self.batch_planner = ClauseBatchPlanner(
+            model=self.model,
+            prompt_token_budget=config.REVIEW_BATCH_PROMPT_TOKEN_BUDGET,
+            completion_token_budget=config.REVIEW_BATCH_COMPLETION_TOKEN_BUDGET,
+            completion_tokens_per_clause=config.REVIEW_COMPLETION_TOKENS_PER_CLAUSE,
+        )
 
         # Mapping of ContractType to their respective system prompts
         self.contract_type_prompts = {
@@ -56,8 +92,13 @@ class ContractReviewer:
         }
 
     async def create_high_risk_clauses(
-        self, contract: Contract, contract_type: ContractType, batch_size: int = 25
-    ) -> Tuple[List[RiskyClause], str, ReviewAnalytics]:
+        self,
+        contract: Contract,
+        contract_type: ContractType,
+        batch_size: Optional[int] = None,
+        resume_from: Optional[ContractReview] = None,
+        previous_version_review: Optional[ContractReview] = None,
+    ) -> ContractReviewEvent:
         """
         Analyze contract clauses to identify high-risk clauses based on the contract type
         and generate a summary checklist.
@@ -65,74 +106,278 @@ class ContractReviewer:
         Args:
             contract (Contract): The contract containing clauses to be analyzed.
             contract_type (ContractType): The type of the contract (e.g., MSA, NDA).
-            batch_size (int, optional): Number of clauses to process in each batch. Defaults to 25.
+            batch_size (int, optional): Maximum number of clauses per batch. Batches are
+                otherwise sized by the planner's token budgets.
+            resume_from (ContractReview, optional): A partial review of the contract.
+                Clauses it already analyzed are reused, and only the failed or
+                missing ones are analyzed again.
+            previous_version_review (ContractReview, optional): The review of the
+                previous version of the contract. Its results are carried over for
+                the clauses the contract's clause diff reports as unchanged, and
+                only added and modified clauses are analyzed.
 
         Returns:
-            Tuple[List[RiskyClause], str, ReviewAnalytics]: A tuple containing the list of identified risky clauses,
-            the summary checklist, and analytics data.
+            ContractReviewEvent: The `complete` event, with the identified risky clauses,
+            the summary checklist, analytics data, the clause coverage and the
+            per-batch accounting records.
+        """
+        result = None
+        async for event in self.stream_high_risk_clauses(
+            contract,
+            contract_type,
+            batch_size=batch_size,
+            resume_from=resume_from,
+            previous_version_review=previous_version_review,
+        ):
+            if event.event == ContractReviewEventType.COMPLETE:
+                result = event
+        if result is None:
+            raise RuntimeError("Contract review finished without a result.")
+        return result
+
+    async def stream_high_risk_clauses(
+        self,
+        contract: Contract,
+        contract_type: ContractType,
+        batch_size: Optional[int] = None,
+        resume_from: Optional[ContractReview] = None,
+        previous_version_review: Optional[ContractReview] = None,
+    ) -> AsyncGenerator[ContractReviewEvent, None]:
+        """
+        Analyze contract clauses like `create_high_risk_clauses`, emitting results
+        as each batch completes (in completion order, not submission order).
+
+        Args:
+            contract (Contract): The contract containing clauses to be analyzed.
+            contract_type (ContractType): The type of the contract (e.g., MSA, NDA).
+            batch_size (int, optional): Maximum number of clauses per batch.
+            resume_from (ContractReview, optional): A partial review of the contract
+                whose analyzed clauses are reused.
+            previous_version_review (ContractReview, optional): The review of the
+                previous version, whose results are reused for unchanged clauses.
+
+        Yields:
+            ContractReviewEvent: A `risky_clauses` event with the results of each
+            batch (and of reused clauses), a `progress` event after each batch, and
+            a final `complete` event with all risky clauses in clause order, the
+            summary checklist, the analytics and the clause coverage. Batches that
+            completed before a timeout are kept; the rest are reported as missing.
         """
         system_prompt = self._build_system_prompt(contract_type)
         clauses = contract.clauses
-        analyzed_clauses = []
-        tokens_used = 0
+        risky_clauses_by_key: Dict[str, List[RiskyClause]] = {}
         total_time_start = time.time()
         total_clauses = len(clauses)
         total_batches = 0
         successful_clauses = 0
 
-        # Break clauses into batches
-        batches = [
-            clauses[i : i + batch_size] for i in range(0, len(clauses), batch_size)
-        ]
+        # Reuse the results of a partial review, of the previous version of the
+        # contract and of the cache, and only send the remaining clauses to the LLM
+        reused_results = self._get_previously_analyzed_clauses(clauses, resume_from)
+        carried_over_results = {
+            key: results
+            for key, results in self._get_unchanged_clause_results(
+                contract, previous_version_review
+            ).items()
+            if key not in reused_results
+        }
+        reused_results.update(carried_over_results)
+        cache_keys, cached_results = await self._lookup_cached_clauses(
+            [clause for clause in clauses if clause.key not in reused_results],
+            contract_type,
+        )
+        reused_results.update(cached_results)
+        pending_clauses = []
+        for clause in clauses:
+            reused = reused_results.get(clause.key)
+            if reused is None:
+                pending_clauses.append(clause)
+            else:
+                risky_clauses_by_key[clause.key] = reused
+                successful_clauses += len(reused)
+        cache_hits = len(cached_results)
+
+        # Pack clauses into batches that fit the per-request token budgets,
+        # keeping the clauses of a section together when they are indexed
+        sections = None
+        if config.REVIEW_BATCH_BY_SECTION and contract.clause_index is not None:
+            sections = contract.clause_index.sections_by_key()
+        batches = self.batch_planner.plan(
+            pending_clauses,
+            fixed_prompt=system_prompt + self._build_user_batch_prompt([]),
+            max_clauses_per_batch=batch_size,
+            sections=sections,
+        )
         total_batches = len(batches)
+        previous_batch_records = resume_from.batches if resume_from is not None else []
+        batch_records = [
+            ReviewBatch(
+                batch_number=len(previous_batch_records) + batch_number,
+                clauses=len(batch),
+            )
+            for batch_number, batch in enumerate(batches, start=1)
+        ]
+        # Oversized clauses are split, so track every part planned for a clause
+        planned_part_keys: Dict[str, Set[str]] = {}
+        for batch in batches:
+            for part in batch:
+                planned_part_keys.setdefault(
+                    ClauseBatchPlanner.source_key(part.key), set()
+                ).add(part.key)
+
+        reused_risky_clauses = [
+            risky_clause
+            for clause in clauses
+            for risky_clause in reused_results.get(clause.key, [])
+        ]
+        if reused_risky_clauses:
+            yield ContractReviewEvent(
+                event=ContractReviewEventType.RISKY_CLAUSES,
+                risky_clauses=reused_risky_clauses,
+            )
 
-        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
-
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers={"Authorization": f"Bearer {self.openai_api_key}"},
-        ) as session:
-            tasks = []
-            for batch_number, batch in enumerate(batches, start=1):
-                task = asyncio.create_task(
-                    self.process_batch_with_semaphore(
-                        semaphore,
-                        session,
-                        system_prompt,
-                        batch,
-                        contract_type,
-                        batch_number,
-                    )
-                )
-                tasks.append(task)
+        # The checklist does not depend on the clause results, so generate it
+        # concurrently with the batches rather than after them
+        summary_task = asyncio.create_task(
+            self._generate_summary_checklist_timed(contract)
+        )
 
-            # Wait for all tasks to complete within the total timeout
-            try:
-                results = await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=True), timeout=self.timeout
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        session = await get_http_session()
+
+        batches_started_at = time.time()
+        tasks = []
+        for batch, batch_record in zip(batches, batch_records):
+            task = asyncio.create_task(
+                self._process_batch_capturing_errors(
+                    semaphore,
+                    session,
+                    system_prompt,
+                    batch,
+                    contract_type,
+                    batch_record.batch_number,
+                    batch_record,
                 )
-            except asyncio.TimeoutError:
-                logger.error(f"Processing timed out after {self.timeout} seconds.")
-                results = []
+            )
+            tasks.append(task)
 
-            # Collect results
-            for result in results:
+        # Collect results as batches complete, within the total timeout
+        clause_content_by_key = {clause.key: clause.content for clause in clauses}
+        analyzed_part_keys, failed_keys = set(), set()
+        batches_done = 0
+        try:
+            for next_completed in asyncio.as_completed(tasks, timeout=self.timeout):
+                batch, result = await next_completed
+                batches_done += 1
+                batch_source_keys = {
+                    ClauseBatchPlanner.source_key(clause.key) for clause in batch
+                }
+                batch_analyzed_clauses = []
                 if isinstance(result, Exception):
                     logger.error(f"Batch processing resulted in exception: {result}")
-                    continue
-                if result:
+                    failed_keys.update(batch_source_keys)
+                elif result:
                     (
                         batch_analyzed_clauses,
-                        batch_tokens,
+                        _,
                         batch_successful_clauses,
                     ) = result
-                    analyzed_clauses.extend(batch_analyzed_clauses)
-                    tokens_used += batch_tokens
+                    for risky_clause in batch_analyzed_clauses:
+                        # Map results for parts of split clauses back to the clause
+                        source_key = ClauseBatchPlanner.source_key(risky_clause.key)
+                        if source_key != risky_clause.key:
+                            risky_clause.key = source_key
+                            risky_clause.content = clause_content_by_key.get(
+                                source_key, risky_clause.content
+                            )
+                        risky_clauses_by_key.setdefault(risky_clause.key, []).append(
+                            risky_clause
+                        )
                     successful_clauses += batch_successful_clauses
+                    analyzed_part_keys.update(clause.key for clause in batch)
+                else:
+                    failed_keys.update(batch_source_keys)
 
-        # Generate the summary checklist
-        summary_checklist = await self.generate_summary_checklist(
-            contract, analyzed_clauses
+                if batch_analyzed_clauses:
+                    yield ContractReviewEvent(
+                        event=ContractReviewEventType.RISKY_CLAUSES,
+                        risky_clauses=batch_analyzed_clauses,
+                    )
+                yield ContractReviewEvent(
+                    event=ContractReviewEventType.PROGRESS,
+                    batches_done=batches_done,
+                    total_batches=total_batches,
+                )
+        except asyncio.TimeoutError:
+            logger.error(f"Processing timed out after {self.timeout} seconds.")
+        except BaseException:
+            # E.g. the stream was closed by a disconnecting client
+            summary_task.cancel()
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+        batches_finished_at = time.time()
+
+        # A clause was analyzed once all of its parts were, including clauses
+        # the model reported no risk for
+        analyzed_keys = {
+            clause.key
+            for clause in pending_clauses
+            if clause.key not in failed_keys
+            and planned_part_keys.get(clause.key, set()) <= analyzed_part_keys
+        }
+        await self._store_cached_clauses(
+            {
+                cache_keys[clause.key]: risky_clauses_by_key.get(clause.key, [])
+                for clause in pending_clauses
+                if clause.key in analyzed_keys and clause.key in cache_keys
+            }
+        )
+        coverage = ReviewCoverage(
+            analyzed=[
+                clause.key
+                for clause in clauses
+                if clause.key in reused_results or clause.key in analyzed_keys
+            ],
+            failed=[
+                clause.key for clause in pending_clauses if clause.key in failed_keys
+            ],
+            missing=[
+                clause.key
+                for clause in pending_clauses
+                if clause.key not in analyzed_keys and clause.key not in failed_keys
+            ],
+        )
+        if not coverage.is_complete:
+            logger.warning(
+                f"Partial review: {len(coverage.failed)} failed and "
+                f"{len(coverage.missing)} missing of {total_clauses} clauses."
+            )
+
+        # Merge cached and freshly analyzed results back in clause order
+        analyzed_clauses = [
+            risky_clause
+            for clause in clauses
+            for risky_clause in risky_clauses_by_key.pop(clause.key, [])
+        ]
+        # Keep results for keys the model returned that are not part of the contract
+        for unmatched in risky_clauses_by_key.values():
+            analyzed_clauses.extend(unmatched)
+
+        summary_checklist, summary_usage, summary_started_at, summary_finished_at = (
+            await summary_task
+        )
+        batches_time = batches_finished_at - batches_started_at
+        summary_time = summary_finished_at - summary_started_at
+        summary_overlap_time = max(
+            0.0,
+            min(batches_finished_at, summary_finished_at)
+            - max(batches_started_at, summary_started_at),
+        )
+        logger.debug(
+            f"Review timings: batches {batches_time:.2f}s, summary {summary_time:.2f}s, "
+            f"overlapping for {summary_overlap_time:.2f}s"
         )
 
         total_time_end = time.time()
@@ -144,9 +389,40 @@ class ContractReviewer:
         success_rate = (
             (successful_clauses / total_clauses) * 100 if total_clauses else 0
         )
+        cache_hit_ratio = cache_hits / total_clauses if total_clauses else 0
+
+        # Billed tokens of every batch attempt (failed ones included) and the summary
+        batch_usage = TokenUsage()
+        for batch_record in batch_records:
+            batch_usage.add(batch_record.usage.model_dump())
+        tokens_per_clause = (
+            batch_usage.total_tokens / len(pending_clauses) if pending_clauses else 0
+        )
+        saved_tokens, saved_time = self._estimate_carry_over_savings(
+            len(carried_over_results), previous_version_review
+        )
+        usage = TokenUsage()
+        usage.add(batch_usage.model_dump())
+        usage.add(summary_usage.model_dump())
+
+        # A resumed review accounts for the work of the partial review too
+        if resume_from is not None:
+            usage.add(
+                {
+                    "prompt_tokens": resume_from.analytics.prompt_tokens,
+                    "completion_tokens": resume_from.analytics.completion_tokens,
+                }
+            )
+            total_time_taken += resume_from.analytics.total_time_taken
+        batch_records = previous_batch_records + batch_records
+        batch_latencies = [
+            batch_record.latency
+            for batch_record in batch_records
+            if batch_record.succeeded
+        ]
 
         analytics = ReviewAnalytics(
-            tokens_used=tokens_used,
+            tokens_used=usage.total_tokens,
             total_time_taken=total_time_taken,
             total_clauses=total_clauses,
             risky_clauses=risky_clauses,
@@ -154,24 +430,96 @@ class ContractReviewer:
             rate_limit_hits=self.rate_limit_hits,
             average_time_per_batch=average_time_per_batch,
             success_rate=success_rate,
+            cache_hits=cache_hits,
+            cache_hit_ratio=cache_hit_ratio,
+            batches_time=batches_time,
+            summary_time=summary_time,
+            summary_overlap_time=summary_overlap_time,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            p50_batch_latency=self._percentile(batch_latencies, 50),
+            p95_batch_latency=self._percentile(batch_latencies, 95),
+            tokens_per_clause=tokens_per_clause,
+            carried_over_clauses=len(carried_over_results),
+            saved_tokens=saved_tokens,
+            saved_time=saved_time,
         )
 
-        return analyzed_clauses, summary_checklist, analytics
+        yield ContractReviewEvent(
+            event=ContractReviewEventType.COMPLETE,
+            risky_clauses=analyzed_clauses,
+            summary_checklist=summary_checklist,
+            analytics=analytics,
+            coverage=coverage,
+            batches=batch_records,
+        )
+
+    async def _process_batch_capturing_errors(
+        self,
+        semaphore,
+        session,
+        system_prompt,
+        batch,
+        contract_type,
+        batch_number,
+        batch_record=None,
+    ):
+        """
+        Process a batch, returning the batch alongside its result (or the raised
+        exception) so that results can be consumed in completion order.
+        """
+        try:
+            return batch, await self.process_batch_with_semaphore(
+                semaphore,
+                session,
+                system_prompt,
+                batch,
+                contract_type,
+                batch_number,
+                batch_record,
+            )
+        except Exception as e:
+            return batch, e
 
     async def process_batch_with_semaphore(
-        self, semaphore, session, system_prompt, batch, contract_type, batch_number
+        self,
+        semaphore,
+        session,
+        system_prompt,
+        batch,
+        contract_type,
+        batch_number,
+        batch_record=None,
     ):
         async with semaphore:
-            return await self.process_batch(
-                session, system_prompt, batch, contract_type, batch_number
-            )
+            started_at = time.time()
+            try:
+                return await self.process_batch(
+                    session,
+                    system_prompt,
+                    batch,
+                    contract_type,
+                    batch_number,
+                    batch_record=batch_record,
+                )
+            finally:
+                if batch_record is not None:
+                    batch_record.latency = time.time() - started_at
 
     async def process_batch(
-        self, session, system_prompt, batch, contract_type, batch_number
+        self,
+        session,
+        system_prompt,
+        batch,
+        contract_type,
+        batch_number,
+        batch_record: Optional[ReviewBatch] = None,
     ):
+        if batch_record is None:
+            batch_record = ReviewBatch(batch_number=batch_number, clauses=len(batch))
         user_prompt = self._build_user_batch_prompt(batch)
-        max_retries = 3
-        retry_delay = 2  # seconds
+        max_retries = self.max_batch_attempts
+        retry_delay = self.batch_retry_delay
 
         # Create a mapping from clause keys to clause contents
         clause_key_to_content = {clause.key: clause.content for clause in batch}
@@ -180,12 +528,20 @@ class ContractReviewer:
             try:
                 start_time = time.time()
                 response = await self._call_openai_api_with_backoff(
-                    session, system_prompt, user_prompt
+                    session,
+                    system_prompt,
+                    user_prompt,
+                    expected_completion_tokens=len(batch)
+                    * config.REVIEW_COMPLETION_TOKENS_PER_CLAUSE,
+                    batch_record=batch_record,
                 )
                 end_time = time.time()
 
                 # Extract content based on response type
                 if isinstance(response, dict):
+                    # Failed attempts are billed too
+                    batch_record.usage.add(response.get("usage"))
+
                     # Extract 'content' from the response
                     choices = response.get("choices", [])
                     if not choices:
@@ -215,6 +571,7 @@ class ContractReviewer:
                     logger.error(
                         f"Content does not appear to be JSON in batch {batch_number}: {content}"
                     )
+                    batch_record.parse_failures += 1
                     continue  # Proceed to the next attempt
 
                 # Extract JSON content
@@ -223,13 +580,21 @@ class ContractReviewer:
                     logger.error(
                         f"Extracted content does not appear to be JSON in batch {batch_number}: {cleaned_content}"
                     )
+                    batch_record.parse_failures += 1
                     continue  # Proceed to the next attempt
 
                 # Attempt to parse the JSON
                 batch_analyzed_clauses = self._parse_batch_analyzed_clauses(
                     cleaned_content, clause_key_to_content
                 )
-                batch_tokens = 0  # Update if tokens are tracked
+                if batch_analyzed_clauses is None:
+                    logger.error(
+                        f"Failed to parse the analyzed clauses in batch {batch_number}"
+                    )
+                    batch_record.parse_failures += 1
+                    continue  # Proceed to the next attempt
+                batch_record.succeeded = True
+                batch_tokens = batch_record.usage.total_tokens
                 batch_successful_clauses = len(batch_analyzed_clauses)
 
                 logger.debug(
@@ -265,10 +630,22 @@ class ContractReviewer:
         jitter=backoff.full_jitter,
     )
     async def _call_openai_api_with_backoff(
-        self, session, system_prompt: str, user_prompt: str
+        self,
+        session,
+        system_prompt: str,
+        user_prompt: str,
+        expected_completion_tokens: int = 0,
+        batch_record: Optional[ReviewBatch] = None,
     ):
+        # Wait for rate-limit budget before sending rather than after a 429
+        await self.rate_limiter.acquire(
+            self.batch_planner.count_tokens(system_prompt + user_prompt)
+            + expected_completion_tokens
+        )
+        if batch_record is not None:
+            batch_record.attempts += 1
         async with session.post(
-            "https://api.openai.com/v1/chat/completions",
+            self.chat_completions_url,
             json={
                 "model": self.model,
                 "messages": [
@@ -277,7 +654,10 @@ class ContractReviewer:
                 ],
                 "temperature": self.temperature,
             },
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
         ) as response:
+            await self.rate_limiter.update_from_headers(response.headers)
+
             try:
                 response_data = await response.json()
             except aiohttp.ContentTypeError:
@@ -288,12 +668,15 @@ class ContractReviewer:
 
             if response.status == 429:
                 self.rate_limit_hits += 1
+                if batch_record is not None:
+                    batch_record.rate_limit_hits += 1
                 retry_after = response.headers.get("Retry-After")
                 if retry_after:
                     logger.warning(
                         f"Rate limit hit. Retrying after {retry_after} seconds."
                     )
-                    await asyncio.sleep(float(retry_after))
+                    # Holds back every caller sharing the limiter, including this retry
+                    await self.rate_limiter.penalize(float(retry_after))
                 else:
                     logger.warning("Rate limit hit. Retrying with exponential backoff.")
                 raise aiohttp.ClientResponseError(
@@ -319,15 +702,33 @@ class ContractReviewer:
 
             return response_data
 
+    async def _generate_summary_checklist_timed(
+        self, contract: Contract
+    ) -> Tuple[str, TokenUsage, float, float]:
+        """
+        Generate the summary checklist, recording its token usage and when
+        generation started and ended.
+
+        Returns:
+            Tuple[str, TokenUsage, float, float]: The checklist, its token usage and
+            its start and end timestamps.
+        """
+        usage = TokenUsage()
+        started_at = time.time()
+        summary_checklist = await self.generate_summary_checklist(contract, usage=usage)
+        return summary_checklist, usage, started_at, time.time()
+
     async def generate_summary_checklist(
-        self, contract: Contract, analyzed_clauses: List[RiskyClause]
+        self, contract: Contract, usage: Optional[TokenUsage] = None
     ) -> str:
         """
-        Generate a summary checklist based on the reviewed contract.
+        Generate a summary checklist of the reviewed contract from a digest of
+        its clauses, by section (see `ClauseBatchPlanner.digest`). It does not
+        depend on the clause analysis, so it can run concurrently with it.
 
         Args:
             contract (Contract): The contract being reviewed.
-            analyzed_clauses (List[RiskyClause]): The list of identified risky clauses.
+            usage (TokenUsage, optional): Accumulates the tokens billed for the request.
 
         Returns:
             str: The generated summary checklist.
@@ -337,9 +738,18 @@ class ContractReviewer:
             " The checklist should capture all core aspects of a typical contract review, ensuring that the summary is clear, concise, and comprehensive."
         )
 
+        sections = None
+        if contract.clause_index is not None:
+            sections = contract.clause_index.sections_by_key()
+        contract_digest = self.batch_planner.digest(
+            contract.clauses or [],
+            token_budget=config.REVIEW_SUMMARY_DIGEST_TOKEN_BUDGET,
+            sections=sections,
+        )
+
         # Construct the user prompt based on provided instructions
         user_prompt = (
-            "Create a brief checklist to summarize the contracts you have reviewed. "
+            "Create a brief checklist to summarize the contract below. "
             "Make sure the checklist captures all core aspects of a typical contract review, ensuring that the summary is clear, concise, and comprehensive.\n\n"
             "# Checklist Items\n"
             "- **Parties Involved**: Identify all parties to the contract, including any third parties.\n"
@@ -359,60 +769,69 @@ class ContractReviewer:
             "The output should be a brief checklist that is no more than 250 words. Each item should be clear and allow the reviewer to quickly note significant clauses, obligations, or potential concerns. Use bullet points and categorise them logically. Avoid excessive details—focus instead on summarising key aspects.\n\n"
             "# Notes\n"
             "Ensure the checklist covers both general and specific concerns that are commonly present in contracts. This checklist is intended to guide reviewers to ensure they don't overlook any significant aspect of a contract.\n\n"
-            "Based on the contract details and the identified risky clauses, generate the checklist as specified."
+            "# Contract Clauses\n"
+            "The beginning of each of the contract's clauses, by section:\n\n"
+            f"{contract_digest}\n\n"
+            "Based on these clauses, generate the checklist as specified. Note the items the clauses do not cover."
         )
 
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-                headers={"Authorization": f"Bearer {self.openai_api_key}"},
-            ) as session:
-                response = await self._call_openai_api_with_backoff(
-                    session, system_prompt, user_prompt
-                )
+            session = await get_http_session()
+            response = await self._call_openai_api_with_backoff(
+                session,
+                system_prompt,
+                user_prompt,
+                expected_completion_tokens=self.SUMMARY_COMPLETION_TOKENS,
+            )
 
-                # Extract content based on response type
-                if isinstance(response, dict):
-                    choices = response.get("choices", [])
-                    if not choices:
-                        logger.error(
-                            "No 'choices' found in the response for summary checklist."
-                        )
-                        return "Checklist generation failed."
+            # Extract content based on response type
+            if isinstance(response, dict):
+                if usage is not None:
+                    usage.add(response.get("usage"))
 
-                    message = choices[0].get("message", {})
-                    content = message.get("content", "")
-                    if not content:
-                        logger.error(
-                            "No 'content' found in the response for summary checklist."
-                        )
-                        return "Checklist generation failed."
+                choices = response.get("choices", [])
+                if not choices:
+                    logger.error(
+                        "No 'choices' found in the response for summary checklist."
+                    )
+                    return "Checklist generation failed."
 
-                elif isinstance(response, str):
-                    content = response
-                else:
+                message = choices[0].get("message", {})
+                content = message.get("content", "")
+                if not content:
                     logger.error(
-                        f"Unexpected response type for summary checklist: {type(response)}"
+                        "No 'content' found in the response for summary checklist."
                     )
                     return "Checklist generation failed."
 
-                # Check if content is JSON or plain text
-                # Since the checklist is expected to be bullet points, handle as plain text
-                if not self._is_potential_json(content):
-                    # Assuming the checklist is in bullet points
-                    cleaned_content = self._clean_checklist_content(content)
-                else:
-                    # If the AI returns JSON, extract the relevant part
-                    cleaned_content = self._extract_json_content(content)
+            elif isinstance(response, str):
+                content = response
+            else:
+                logger.error(
+                    f"Unexpected response type for summary checklist: {type(response)}"
+                )
+                return "Checklist generation failed."
+
+            # Check if content is JSON or plain text
+            # Since the checklist is expected to be bullet points, handle as plain text
+            if not self._is_potential_json(content):
+                # Assuming the checklist is in bullet points
+                cleaned_content = self._clean_checklist_content(content)
+            else:
+                # If the AI returns JSON, extract the relevant part
+                cleaned_content = self._extract_json_content(content)
 
-                return cleaned_content.strip()
+            return cleaned_content.strip()
 
         except Exception as e:
             logger.error(f"Error generating summary checklist: {e}")
             return "Checklist generation failed."
 
     async def explain_clause_stream(
-        self, clause: str, contract_type: ContractType
+        self,
+        clause: str,
+        contract_type: ContractType,
+        usage: Optional[TokenUsage] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Stream the explanation for a single clause by sending it to the OpenAI API,
@@ -421,6 +840,8 @@ class ContractReviewer:
         Args:
             clause (str): The text of the clause to be explained.
             contract_type (ContractType): The type of the contract (e.g., MSA, NDA).
+            usage (TokenUsage, optional): Accumulates the tokens billed for the
+                request, reported in the final chunk of the stream.
 
         Yields:
             str: Properly spaced chunks of the explanation as received from the API.
@@ -436,74 +857,254 @@ class ContractReviewer:
 
         buffer = ""  # To store partial words across chunks
 
-        async with aiohttp.ClientSession(
-            headers={"Authorization": f"Bearer {self.openai_api_key}"}
-        ) as session:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                json={
-                    "model": self.model,
-                    "messages": [system_message, user_message],
-                    "stream": True,
-                    "temperature": self.temperature,
-                },
-            ) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to connect to OpenAI API: {response.status}")
-                    raise Exception(f"OpenAI API error: {response.status}")
-
-                async for line in response.content:
-                    line = line.decode("utf-8").strip()
-
-                    if line.startswith("data: "):
-                        line_content = line[len("data: ") :]
-                        if line_content == "[DONE]":
-                            break
-
-                        try:
-                            chunk = json.loads(line_content)
-                            content = (
-                                chunk.get("choices", [{}])[0]
-                                .get("delta", {})
-                                .get("content")
-                            )
-                            if content:
-                                # If the buffer has content, append a space if necessary
-                                if buffer and not buffer.endswith(" "):
-                                    buffer += " "
-                                buffer += content  # Add the chunk to the buffer
-
-                                # Yield complete words, leaving any partial word in the buffer
-                                words = buffer.split()
-                                for word in words[:-1]:
-                                    yield word + " "
-                                buffer = words[-1]  # Keep the last word in the buffer
-                        except json.JSONDecodeError:
-                            continue  # Skip invalid JSON chunks
-
-                # Yield any remaining content in the buffer after streaming completes
-                if buffer:
-                    yield buffer
+        session = await get_http_session()
+        await self.rate_limiter.acquire(
+            self.batch_planner.count_tokens(
+                system_message["content"] + user_message["content"]
+            )
+            + self.EXPLANATION_COMPLETION_TOKENS
+        )
+        async with session.post(
+            self.chat_completions_url,
+            json={
+                "model": self.model,
+                "messages": [system_message, user_message],
+                "stream": True,
+                "stream_options": {"include_usage": True},
+                "temperature": self.temperature,
+            },
+        ) as response:
+            await self.rate_limiter.update_from_headers(response.headers)
+            if response.status == 429:
+                self.rate_limit_hits += 1
+                retry_after = response.headers.get("Retry-After")
+                if retry_after:
+                    await self.rate_limiter.penalize(float(retry_after))
+
+            if response.status != 200:
+                logger.error(f"Failed to connect to OpenAI API: {response.status}")
+                raise Exception(f"OpenAI API error: {response.status}")
+
+            async for line in response.content:
+                line = line.decode("utf-8").strip()
+
+                if line.startswith("data: "):
+                    line_content = line[len("data: ") :]
+                    if line_content == "[DONE]":
+                        break
+
+                    try:
+                        chunk = json.loads(line_content)
+                        # The usage chunk comes last, with no choices
+                        if usage is not None:
+                            usage.add(chunk.get("usage"))
+                        content = (
+                            (chunk.get("choices") or [{}])[0]
+                            .get("delta", {})
+                            .get("content")
+                        )
+                        if content:
+                            # If the buffer has content, append a space if necessary
+                            if buffer and not buffer.endswith(" "):
+                                buffer += " "
+                            buffer += content  # Add the chunk to the buffer
+
+                            # Yield complete words, leaving any partial word in the buffer
+                            words = buffer.split()
+                            for word in words[:-1]:
+                                yield word + " "
+                            buffer = words[-1]  # Keep the last word in the buffer
+                    except json.JSONDecodeError:
+                        continue  # Skip invalid JSON chunks
+
+            # Yield any remaining content in the buffer after streaming completes
+            if buffer:
+                yield buffer
 
     ########################################################################
     ############################# HELPER METHODS ###########################
     ########################################################################
 
-    def _get_clause_from_key(self, clauses: List[Clause], key: str) -> str:
+    def _get_previously_analyzed_clauses(
+        self, clauses: List[Clause], review: Optional[ContractReview]
+    ) -> Dict[str, List[RiskyClause]]:
         """
-        Retrieve the clause content based on the key.
+        Collect the results of the clauses a previous partial review analyzed.
 
         Args:
-            clauses (List[Clause]): A list of clauses to search.
-            key (str): The key of the clause to retrieve.
+            clauses (List[Clause]): The clauses of the contract.
+            review (ContractReview, optional): The review being resumed.
 
         Returns:
-            str: The content of the clause.
+            Dict[str, List[RiskyClause]]: The previous results (possibly empty) for
+            each clause key the review analyzed.
         """
-        for clause in clauses:
-            if clause.key == key:
-                return clause.content
-        return ""
+        if review is None:
+            return {}
+
+        clause_keys = {clause.key for clause in clauses}
+        if review.coverage is None:
+            # Reviews saved before coverage was tracked are treated as complete
+            analyzed_keys = clause_keys
+        else:
+            analyzed_keys = set(review.coverage.analyzed) & clause_keys
+
+        previous_results = {key: [] for key in analyzed_keys}
+        for risky_clause in review.risky_clauses:
+            if risky_clause.key in previous_results:
+                previous_results[risky_clause.key].append(risky_clause)
+        return previous_results
+
+    def _get_unchanged_clause_results(
+        self, contract: Contract, review: Optional[ContractReview]
+    ) -> Dict[str, List[RiskyClause]]:
+        """
+        Carry over the results of the previous version's review for the clauses
+        of a new contract version that did not change.
+
+        Args:
+            contract (Contract): The new version, with its clause diff.
+            review (ContractReview, optional): The review of the previous version.
+
+        Returns:
+            Dict[str, List[RiskyClause]]: The previous results (possibly empty),
+            rebound to the new version's clauses, for each unchanged clause key
+            the previous review analyzed.
+        """
+        if review is None or contract.clause_diff is None:
+            return {}
+
+        previous_results = self._get_previously_analyzed_clauses(
+            [
+                Clause(key=previous_key, content="")
+                for previous_key in contract.clause_diff.unchanged.values()
+            ],
+            review,
+        )
+        clauses_by_key = {clause.key: clause for clause in contract.clauses}
+        carried_over_results = {}
+        for key, previous_key in contract.clause_diff.unchanged.items():
+            clause = clauses_by_key.get(key)
+            if clause is None or previous_key not in previous_results:
+                continue
+            carried_over_results[key] = [
+                risky_clause.model_copy(
+                    update={"key": clause.key, "content": clause.content}
+                )
+                for risky_clause in previous_results[previous_key]
+            ]
+        return carried_over_results
+
+    def _estimate_carry_over_savings(
+        self, carried_over_clauses: int, review: Optional[ContractReview]
+    ) -> Tuple[int, float]:
+        """
+        Estimate the tokens and batch time that analyzing the carried over
+        clauses again would have taken, from the previous version's review.
+
+        Args:
+            carried_over_clauses (int): The number of clauses carried over.
+            review (ContractReview, optional): The review of the previous version.
+
+        Returns:
+            Tuple[int, float]: The saved tokens and seconds.
+        """
+        if review is None or not carried_over_clauses:
+            return 0, 0.0
+
+        analytics = review.analytics
+        sent_clauses = (
+            analytics.total_clauses
+            - analytics.cache_hits
+            - analytics.carried_over_clauses
+        )
+        saved_tokens = round(analytics.tokens_per_clause * carried_over_clauses)
+        saved_time = (
+            analytics.batches_time * carried_over_clauses / sent_clauses
+            if sent_clauses > 0
+            else 0.0
+        )
+        return saved_tokens, saved_time
+
+    async def _lookup_cached_clauses(
+        self, clauses: List[Clause], contract_type: ContractType
+    ) -> Tuple[Dict[str, str], Dict[str, List[RiskyClause]]]:
+        """
+        Look up previously reviewed clauses in the clause review cache.
+
+        Args:
+            clauses (List[Clause]): The clauses of the contract.
+            contract_type (ContractType): The type of the contract.
+
+        Returns:
+            Tuple[Dict[str, str], Dict[str, List[RiskyClause]]]: The cache key for each
+            clause key, and the cached results (rebound to this contract's clauses) for
+            each clause key that was a cache hit.
+        """
+        if self.review_cache is None or not clauses:
+            return {}, {}
+
+        contract_type_value = getattr(contract_type, "value", contract_type)
+        cache_keys = {
+            clause.key: self.review_cache.make_key(
+                clause,
+                contract_type=contract_type_value,
+                model=self.model,
+                temperature=self.temperature,
+                prompt_version=self.PROMPT_VERSION,
+            )
+            for clause in clauses
+        }
+        entries = await self.review_cache.get_many(
+            [cache_keys[clause.key] for clause in clauses]
+        )
+
+        cached_results = {}
+        for clause, entry in zip(clauses, entries):
+            if entry is None:
+                continue
+            try:
+                cached_results[clause.key] = [
+                    RiskyClause(key=clause.key, content=clause.content, **risk)
+                    for risk in entry
+                ]
+            except Exception as e:
+                logger.warning(f"Ignoring invalid cache entry for {clause.key}: {e}")
+
+        logger.debug(f"Clause review cache: {len(cached_results)}/{len(clauses)} hits")
+        return cache_keys, cached_results
+
+    async def _store_cached_clauses(
+        self, cache_entries: Dict[str, List[RiskyClause]]
+    ) -> None:
+        """
+        Store freshly analyzed clause results in the clause review cache.
+
+        Args:
+            cache_entries (Dict[str, List[RiskyClause]]): Results keyed by cache key.
+        """
+        if self.review_cache is None or not cache_entries:
+            return
+        await self.review_cache.set_many(cache_entries)
+
+    def _percentile(self, values: List[float], percentile: float) -> float:
+        """
+        Compute a percentile of a list of values by linear interpolation.
+
+        Args:
+            values (List[float]): The values.
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The percentile, or 0 if there are no values.
+        """
+        if not values:
+            return 0.0
+        values = sorted(values)
+        rank = (len(values) - 1) * percentile / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (rank - lower)
 
     def _clean_checklist_content(self, content: str) -> str:
         """
@@ -593,7 +1194,7 @@ class ContractReviewer:
 
     def _parse_batch_analyzed_clauses(
         self, content: str, clause_key_to_content: Dict[str, str]
-    ) -> List[RiskyClause]:
+    ) -> Optional[List[RiskyClause]]:
         """
         Parse the JSON content returned by the OpenAI API into a list of RiskyClause instances.
 
@@ -602,7 +1203,8 @@ class ContractReviewer:
             clause_key_to_content (Dict[str, str]): Mapping from clause keys to clause contents.
 
         Returns:
-            List[RiskyClause]: A list of identified risky clauses.
+            Optional[List[RiskyClause]]: A list of identified risky clauses, or None if the
+            content could not be parsed as a JSON array.
         """
         try:
             content = content.strip()
@@ -616,7 +1218,7 @@ class ContractReviewer:
             # Ensure the data is a list
             if not isinstance(data, list):
                 logger.error(f"Expected a list of clauses, but got: {type(data)}")
-                return []
+                return None
 
             analyzed_clauses = []
             for clause_data in data:
@@ -673,12 +1275,12 @@ class ContractReviewer:
             return analyzed_clauses
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {e} | Content: {content}")
-            return []
+            return None
         except Exception as e:
             logger.error(
                 f"Unexpected error during JSON parsing: {e} | Content: {content}"
             )
-            return []
+            return None
 
     def _extract_json_content(self, content: str) -> str:
         """
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+from app.contract.contract_models import Clause, RiskyClause
+from core.cache import CacheTag
+from core.cache.base import BaseBackend
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ClauseReviewCache:
+    """
+    Content-addressed cache of per-clause review results.
+
+    Entries are keyed by a hash of the normalized clause text together with
+    everything that influences the LLM output (contract type, model,
+    temperature and prompt version), so identical boilerplate clauses are
+    only ever sent to the LLM once. Clauses that were analyzed but found to
+    carry no risk are cached as well, with an empty list of risks.
+    """
+
+    def __init__(self, backend: BaseBackend, ttl: int = None):
+        self.backend = backend
+        self.ttl = ttl or config.CLAUSE_REVIEW_CACHE_TTL
+
+    @staticmethod
+    def normalize_clause_text(text: str) -> str:
+        """
+        Normalize clause text so that formatting-only differences (unicode
+        compatibility forms, whitespace) map to the same cache entry.
+        """
+        text = unicodedata.normalize("NFKC", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def make_key(
+        self,
+        clause: Clause,
+        contract_type: str,
+        model: str,
+        temperature: float,
+        prompt_version: str,
+    ) -> str:
+        """
+        Build the cache key for a clause.
+
+        Args:
+            clause (Clause): The clause to build the key for.
+            contract_type (str): The contract type the clause is reviewed as.
+            model (str): The LLM model used for the review.
+            temperature (float): The sampling temperature used for the review.
+            prompt_version (str): Identifier of the prompt templates in use.
+
+        Returns:
+            str: The cache key.
+        """
+        digest = hashlib.sha256(
+            "\x1f".join(
+                [
+                    self.normalize_clause_text(clause.content),
+                    str(contract_type),
+                    model,
+                    repr(float(temperature)),
+                    prompt_version,
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+        return f"{CacheTag.CLAUSE_REVIEW.value}::{digest}"
+
+    async def get_many(self, keys: List[str]) -> List[Optional[List[dict]]]:
+        """
+        Look up cached review results.
+
+        Args:
+            keys (List[str]): Cache keys as built by `make_key`.
+
+        Returns:
+            List[Optional[List[dict]]]: For each key, the cached risk payloads
+            (possibly empty) or None on a cache miss.
+        """
+        results = await asyncio.gather(
+            *(self.backend.get(key=key) for key in keys), return_exceptions=True
+        )
+
+        entries = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Clause review cache lookup failed: {result}")
+                entries.append(None)
+            elif isinstance(result, dict) and "risks" in result:
+                entries.append(result["risks"])
+            else:
+                entries.append(None)
+        return entries
+
+    async def set_many(self, entries: Dict[str, List[RiskyClause]]) -> None:
+        """
+        Store review results for analyzed clauses.
+
+        Args:
+            entries (Dict[str, List[RiskyClause]]): Mapping from cache key to the
+                risky clause results for that clause (empty if no risk was found).
+        """
+        results = await asyncio.gather(
+            *(
+                self.backend.set(
+                    response={
+                        "risks": [
+                            risky_clause.model_dump(exclude={"key", "content"})
+                            for risky_clause in risky_clauses
+                        ]
+                    },
+                    key=key,
+                    ttl=self.ttl,
+                )
+                for key, risky_clauses in entries.items()
+            ),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Clause review cache write failed: {result}")
+
+    async def clear(self) -> None:
+        """
+        Drop every cached clause review result.
+        """
+        await self.backend.delete_startswith(value=CacheTag.CLAUSE_REVIEW.value)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+
+from app.contract.contract_models import ContractReviewJob
+from app.contract.contract_repository import ContractRepository
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+ReviewJobHandler = Callable[[ContractReviewJob], Awaitable[None]]
+
+
+class BaseReviewJobQueue(ABC):
+    """
+    Queue of background contract review jobs.
+
+    Job records (state, progress and partial results) always live in MongoDB;
+    implementations only differ in how queued jobs are dispatched to workers.
+    """
+
+    def __init__(self, contract_repo: ContractRepository):
+        self.contract_repo = contract_repo
+
+    @abstractmethod
+    async def enqueue(self, job: ContractReviewJob) -> ContractReviewJob:
+        """Persist a new job and make it available to workers."""
+
+
+class MongoReviewJobQueue(BaseReviewJobQueue):
+    """
+    Queue where workers poll MongoDB for jobs, for production use.
+
+    Workers claim jobs with a lease that is extended at every checkpoint, so
+    jobs held by a worker that died (e.g. a Lambda that timed out) are picked
+    up again once the lease expires, up to `REVIEW_JOB_MAX_ATTEMPTS` times.
+    Jobs out of attempts are marked as failed whenever no job is left to claim.
+    """
+
+    async def enqueue(self, job: ContractReviewJob) -> ContractReviewJob:
+        return await self.contract_repo.create_review_job(job)
+
+    async def run_worker(
+        self,
+        handler: ReviewJobHandler,
+        poll_interval: float = None,
+        stop_when_empty: bool = False,
+        deadline: Optional[float] = None,
+    ) -> int:
+        """
+        Claim and process jobs until stopped.
+
+        Args:
+            handler (ReviewJobHandler): Processes a claimed job.
+            poll_interval (float, optional): Seconds to wait when no job is queued.
+            stop_when_empty (bool): Return once no job is left to claim, e.g. for
+                scheduled Lambda invocations.
+            deadline (float, optional): `time.monotonic()` after which the
+                worker must have returned; no job is claimed once less than
+                `REVIEW_JOB_TIMEOUT` is left before it.
+
+        Returns:
+            int: The number of jobs processed.
+        """
+        poll_interval = poll_interval or config.REVIEW_JOB_POLL_INTERVAL
+        processed = 0
+        while True:
+            if (
+                deadline is not None
+                and deadline - time.monotonic() < config.REVIEW_JOB_TIMEOUT
+            ):
+                return processed
+
+            job = await self.contract_repo.claim_review_job(
+                lease_seconds=config.REVIEW_JOB_LEASE_SECONDS,
+                max_attempts=config.REVIEW_JOB_MAX_ATTEMPTS,
+            )
+            if job is None:
+                failed = await self.contract_repo.fail_expired_review_jobs(
+                    max_attempts=config.REVIEW_JOB_MAX_ATTEMPTS
+                )
+                if failed:
+                    logger.error(f"{failed} review jobs ran out of attempts")
+                if stop_when_empty:
+                    return processed
+                await asyncio.sleep(poll_interval)
+                continue
+
+            try:
+                await handler(job)
+            except Exception as e:
+                logger.error(f"Review job {job.id} failed: {e}")
+            processed += 1
+
+
+class InProcessReviewJobQueue(BaseReviewJobQueue):
+    """
+    Queue processed by asyncio workers inside the API process, for local runs
+    and tests. Jobs that are queued when the process exits are not resumed.
+    """
+
+    def __init__(
+        self,
+        contract_repo: ContractRepository,
+        handler: ReviewJobHandler,
+        concurrency: Optional[int] = None,
+    ):
+        super().__init__(contract_repo)
+        self.handler = handler
+        self.concurrency = concurrency or config.REVIEW_JOB_WORKER_CONCURRENCY
+        self._queue: asyncio.Queue = None
+        self._loop: asyncio.AbstractEventLoop = None
+        self._workers: List[asyncio.Task] = []
+
+    async def enqueue(self, job: ContractReviewJob) -> ContractReviewJob:
+        job = await self.contract_repo.create_review_job(job)
+        self._ensure_workers()
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def join(self) -> None:
+        """Wait until every enqueued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def _ensure_workers(self) -> None:
+        # Queues and tasks are bound to an event loop; start over if it changed
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._workers = []
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self.contract_repo.claim_review_job(
+                    lease_seconds=config.REVIEW_JOB_LEASE_SECONDS,
+                    max_attempts=config.REVIEW_JOB_MAX_ATTEMPTS,
+                    job_id=job_id,
+                )
+                if job is not None:
+                    await self.handler(job)
+            except Exception as e:
+                logger.error(f"Review job {job_id} failed: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,81 @@
+import hashlib
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+
+from core.config import config
+
+
+class ContractUploadTooLarge(Exception):
+    """Raised when an upload is larger than the maximum size."""
+
+
+class ContractUpload:
+    """
+    An uploaded contract PDF, with its size and SHA-256 digest.
+
+    Starlette has already received the upload into a `SpooledTemporaryFile`
+    (in memory up to 1 MiB, on disk beyond) before the endpoint runs. That
+    file is hashed in place, in chunks, and used as is rather than copied, so
+    the upload is never held in memory as a whole nor stored twice:
+
+        upload = await ContractUpload.from_upload_file(file)
+        try:
+            ...
+        finally:
+            upload.close()
+    """
+
+    def __init__(self, file: BinaryIO, size: int, sha256: str):
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+
+    @classmethod
+    async def from_upload_file(
+        cls,
+        upload_file: UploadFile,
+        max_bytes: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> "ContractUpload":
+        """
+        Hash an upload in chunks, checking its size.
+
+        Args:
+            upload_file (UploadFile): The uploaded file.
+            max_bytes (Optional[int]): The maximum size of the upload
+                (`UPLOAD_MAX_BYTES` by default).
+            chunk_size (Optional[int]): The size of the chunks read
+                (`UPLOAD_CHUNK_BYTES` by default).
+
+        Returns:
+            ContractUpload: The upload, positioned at its start.
+
+        Raises:
+            ContractUploadTooLarge: As soon as more than `max_bytes` are read.
+        """
+        max_bytes = max_bytes or config.UPLOAD_MAX_BYTES
+        chunk_size = chunk_size or config.UPLOAD_CHUNK_BYTES
+
+        digest = hashlib.sha256()
+        size = 0
+        await upload_file.seek(0)
+        # Reads of a file spooled to disk run in a thread
+        while chunk := await upload_file.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ContractUploadTooLarge(
+                    f"The file is larger than {max_bytes} bytes."
+                )
+            digest.update(chunk)
+
+        await upload_file.seek(0)
+        return cls(upload_file.file, size, digest.hexdigest())
+
+    def read(self) -> bytes:
+        """Read the whole upload into memory."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self) -> None:
+        self.file.close()
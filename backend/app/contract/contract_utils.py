@@ -1,81 +1,173 @@
+import html
 import re
-from io import BytesIO
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Union
 
-import pdfplumber
 from bs4 import BeautifulSoup
 
 from app.contract.contract_models import Clause
+from app.contract.contract_processor import ContractProcessor, PdfContent
 
+# Matches 1.1, 1.2, 1.1.1 with optional space or dash
+CLAUSE_PATTERN = re.compile(r"^(\d+\.\d+(?:\.\d+)?)\s*-?\s*(.*)")
+# A clause as yielded by `iter_pdf_html`, one per fragment
+CLAUSE_FRAGMENT_PATTERN = re.compile(
+    r'^<li data-clause-id="([^"]*)">(.*)</li>$', re.DOTALL
+)
 
-def convert_pdf_to_html(pdf_content: bytes) -> str:
+
+def iter_pdf_html(pdf_content: PdfContent) -> Iterator[str]:
+    """
+    Convert a PDF file's content to HTML with clause identification in <li> tags,
+    excluding the clause identifier from the content, yielding the HTML in
+    fragments as the pages are decoded.
+
+    A clause continues until the next clause starts, across page breaks, and
+    is yielded as a single fragment once it ends (under the heading of the
+    page it started on). A page without text ends the open clause.
+
+    Args:
+        pdf_content (PdfContent): The content of the PDF file, or the file.
+
+    Yields:
+        str: Fragments of the HTML, to be streamed or joined once.
+    """
+    yield from iter_page_texts_html(
+        page.extract_text()
+        for _, _, page in ContractProcessor.iter_pdf_pages(pdf_content)
+    )
+
+
+def iter_page_texts_html(page_texts: Iterable[str]) -> Iterator[str]:
+    """
+    Convert the text of each page of a PDF, in page order, to HTML as
+    `iter_pdf_html` does.
+
+    The texts of page ranges extracted separately (e.g. in parallel, with
+    `extract_page_texts`) can be chained, as clauses continuing across the
+    ranges are resolved here:
+
+        page_texts = itertools.chain.from_iterable(
+            extract_page_texts(pdf_content, first_page, last_page)
+            for first_page, last_page in page_ranges
+        )
+        html_content = "".join(iter_page_texts_html(page_texts))
+
+    Args:
+        page_texts (Iterable[str]): The text of each page, empty for pages
+            without text.
+
+    Yields:
+        str: Fragments of the HTML, to be streamed or joined once.
+    """
+    yield "<html><body>"
+
+    clause_id: Optional[str] = None
+    clause_lines: List[str] = []
+    # Pages reached while a clause from an earlier page was open, whose
+    # headings follow that clause
+    deferred_pages: List[int] = []
+    list_open = False
+
+    def start_page(page_num: int) -> str:
+        nonlocal list_open
+        fragment = f"{'</ul>' if list_open else ''}<h3>Page {page_num}</h3><ul>"
+        list_open = True
+        return fragment
+
+    def end_clause() -> Iterator[str]:
+        nonlocal clause_id
+        if clause_id is not None:
+            content = " ".join(clause_lines)
+            if content:
+                yield (
+                    f'<li data-clause-id="{html.escape(clause_id)}">'
+                    f"{html.escape(content.strip(), quote=False)}</li>"
+                )
+            clause_id = None
+            clause_lines.clear()
+        for page_num in deferred_pages:
+            yield start_page(page_num)
+        deferred_pages.clear()
+
+    for page_num, text in enumerate(page_texts, start=1):
+        if not text:
+            yield from end_clause()
+            if list_open:
+                yield "</ul>"
+                list_open = False
+            yield f"<h3>Page {page_num}</h3><p>No text found on this page.</p>"
+            continue
+
+        if clause_id is not None:
+            deferred_pages.append(page_num)
+        else:
+            yield start_page(page_num)
+
+        for line in text.splitlines():
+            line = line.strip()
+            match = CLAUSE_PATTERN.match(line)
+
+            if match:
+                # End the open clause and start a new one
+                yield from end_clause()
+                clause_id = match.group(1)
+                clause_lines.append(match.group(2))
+            elif clause_id is not None:
+                # Accumulate lines within the same clause
+                clause_lines.append(line)
+            else:
+                # Add regular paragraph if not a clause
+                yield f"<p>{html.escape(line, quote=False)}</p>"
+
+    yield from end_clause()
+    if list_open:
+        yield "</ul>"
+    yield "</body></html>"
+
+
+def convert_pdf_to_html(pdf_content: PdfContent) -> str:
     """
     Convert a PDF file's content to an HTML string with clause identification in <li> tags,
     excluding the clause identifier from the content.
 
     Args:
-        pdf_content (bytes): The content of the PDF file as bytes.
+        pdf_content (PdfContent): The content of the PDF file, or the file.
 
     Returns:
         str: The HTML representation of the PDF content with clause identifiers.
     """
-    html_content = "<html><body>"
-    clause_pattern = re.compile(
-        r"^(\d+\.\d+(?:\.\d+)?)\s*-?\s*(.*)"
-    )  # Matches 1.1, 1.2, 1.1.1 with optional space or dash
-
-    with pdfplumber.open(BytesIO(pdf_content)) as pdf:
-        for page_num, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text()
-            if text:
-                html_content += f"<h3>Page {page_num}</h3><ul>"
-                lines = text.splitlines()
-                accumulating_content = None
-                current_clause_id = None
-
-                for line in lines:
-                    line = line.strip()
-                    match = clause_pattern.match(line)
-
-                    if match:
-                        # Append the accumulated clause content to HTML if present
-                        if current_clause_id and accumulating_content:
-                            html_content += f'<li data-clause-id="{current_clause_id}">{accumulating_content.strip()}</li>'
-
-                        # Start a new clause
-                        current_clause_id = match.group(1)
-                        accumulating_content = match.group(2)
-                    elif accumulating_content is not None:
-                        # Accumulate lines within the same clause
-                        accumulating_content += " " + line
-                    else:
-                        # Add regular paragraph if not a clause
-                        html_content += f"<p>{line}</p>"
-
-                # Append the last accumulated clause content
-                if current_clause_id and accumulating_content:
-                    html_content += f'<li data-clause-id="{current_clause_id}">{accumulating_content.strip()}</li>'
-
-                html_content += "</ul>"
-            else:
-                html_content += (
-                    f"<h3>Page {page_num}</h3><p>No text found on this page.</p>"
-                )
+    return "".join(iter_pdf_html(pdf_content))
 
-    html_content += "</body></html>"
-    return html_content
 
-
-def identify_clauses_in_html(html_content: str) -> List[Clause]:
+def identify_clauses_in_html(html_content: Union[str, Iterable[str]]) -> List[Clause]:
     """
     Process HTML content to identify clauses in <li> elements with data-clause-id attributes.
 
+    The HTML can also be the fragments yielded by `iter_pdf_html`, in which
+    case the clauses are read from their fragments without parsing the HTML:
+
+        fragments = list(iter_pdf_html(pdf_content))
+        html_content = "".join(fragments)
+        clauses = identify_clauses_in_html(fragments)
+
     Args:
-        html_content (str): The HTML content of the contract.
+        html_content (Union[str, Iterable[str]]): The HTML content of the
+            contract, or the fragments of the HTML from `iter_pdf_html`.
 
     Returns:
         List[Clause]: A list of Clause objects with clause IDs and content.
     """
+    if not isinstance(html_content, str):
+        clauses = []
+        for fragment in html_content:
+            match = CLAUSE_FRAGMENT_PATTERN.match(fragment)
+            if match:
+                clause_id = html.unescape(match.group(1))
+                content = html.unescape(match.group(2)).strip()
+                if clause_id and content:
+                    clauses.append(Clause(key=clause_id, content=content))
+        return clauses
+
     soup = BeautifulSoup(html_content, "html.parser")
     clauses = []
 
@@ -88,19 +180,41 @@ def identify_clauses_in_html(html_content: str) -> List[Clause]:
     return clauses
 
 
-def extract_text_from_pdf(pdf_content: bytes) -> List[str]:
+def extract_text_from_pdf(pdf_content: PdfContent) -> List[str]:
     """
     Extracts text content from each page of a PDF.
 
     Args:
-        pdf_content (bytes): The content of the PDF file as bytes.
+        pdf_content (PdfContent): The content of the PDF file, or the file.
 
     Returns:
         List[str]: A list of strings where each string is the text of a page.
     """
-    text_pages = []
-    with pdfplumber.open(BytesIO(pdf_content)) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            text_pages.append(text if text else "No text found on this page.")
-    return text_pages
+    return [
+        text if text else "No text found on this page."
+        for text in extract_page_texts(pdf_content)
+    ]
+
+
+def extract_page_texts(
+    pdf_content: PdfContent, first_page: int = 1, last_page: Optional[int] = None
+) -> List[str]:
+    """
+    Extracts the text of each page in a range of pages of a PDF, parsing only
+    those pages, e.g. to extract page ranges in parallel worker processes.
+
+    Args:
+        pdf_content (PdfContent): The content of the PDF file, or the file.
+        first_page (int): The first page of the range, numbered from 1.
+        last_page (Optional[int]): The last page of the range (inclusive), or
+            None for the last page of the PDF.
+
+    Returns:
+        List[str]: The text of each page, empty for pages without text.
+    """
+    return [
+        page.extract_text() or ""
+        for _, _, page in ContractProcessor.iter_pdf_pages(
+            pdf_content, first_page, last_page
+        )
+    ]
@@ -2,14 +2,26 @@ from typing import Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
-from pymongo import ReturnDocument
+from pymongo import IndexModel, ReturnDocument
 
 from app.shared.models.mongodb_models import PyObjectId
 from app.user.user_models import User
+from core.database.indexes import IndexedRepository, RepositoryQuery
 from core.utils.datetime import utcnow
 
 
-class UserRepository:
+class UserRepository(IndexedRepository):
+    INDEXES = {
+        "collection": [IndexModel([("email", 1)], name="email", unique=True)],
+    }
+    QUERIES = [
+        RepositoryQuery(
+            name="get a user by email",
+            collection="collection",
+            filter={"email": "user@example.com"},
+        ),
+    ]
+
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
 
@@ -0,0 +1,193 @@
+"""
+Benchmark token-aware batch planning against fixed-size clause slicing.
+
+Drives both strategies over synthetic contracts against a simulated LLM whose
+latency grows with prompt and completion size, and which fails requests that
+exceed the model's context window or maximum completion length (as the real
+API does, truncating the JSON output).
+
+A contract with numbered sections of various sizes is also planned with its
+clause index, keeping the clauses of a section in the same request when they
+fit; `split` counts the sections whose clauses are spread across requests.
+
+Usage (from the backend directory):
+    python -m benchmarks.batch_planning [--time-scale 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.contract.contract_batch_planner import ClauseBatchPlanner
+from app.contract.contract_clause_index import build_clause_index
+from app.contract.contract_models import Clause
+from app.contract.contract_processor import ContractProcessor
+
+MODEL = "gpt-3.5-turbo"
+CONTEXT_WINDOW = 16385
+MAX_COMPLETION_TOKENS = 4096
+FIXED_PROMPT_TOKENS = 650
+COMPLETION_TOKENS_PER_RISKY_CLAUSE = 110
+RISKY_CLAUSE_RATIO = 0.4
+MAX_CONCURRENT_REQUESTS = 5
+
+# Simulated latency model (seconds)
+BASE_LATENCY = 0.5
+PROMPT_TOKEN_LATENCY = 0.00003
+COMPLETION_TOKEN_LATENCY = 0.012
+
+WORDS = (
+    "party agreement shall services obligations confidential information "
+    "liability indemnify terminate notice payment provider customer breach "
+    "warranty law jurisdiction consent written days reasonable damages"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _clause(rng: random.Random, key: int, sentences: int) -> Clause:
+    return Clause(
+        key=f"clause-{key}",
+        content=" ".join(_sentence(rng, rng.randint(12, 24)) for _ in range(sentences)),
+    )
+
+
+def make_sectioned_contract(
+    rng: random.Random, sections: int
+) -> Tuple[List[Clause], Dict[str, str]]:
+    """
+    A contract of numbered sections of 2 to 30 clauses, marked and indexed as
+    uploads are, and the section of each clause.
+    """
+    html = []
+    for section in range(1, sections + 1):
+        html.append(f"<h2>{section}. {_sentence(rng, 3)}</h2><ol>")
+        for clause in range(1, rng.choice([2, 4, 8, 12, 30]) + 1):
+            content = " ".join(
+                _sentence(rng, rng.randint(12, 24)) for _ in range(rng.randint(1, 6))
+            )
+            html.append(f"<li>{section}.{clause} {content}</li>")
+        html.append("</ol>")
+    processed_html, clauses = ContractProcessor.mark_clauses("".join(html))
+    return clauses, build_clause_index(processed_html).sections_by_key()
+
+
+def split_sections(batches: List[List[Clause]], sections: Dict[str, str]) -> int:
+    """The number of sections whose clauses are in more than one batch."""
+    batches_by_section: Dict[str, set] = {}
+    for batch_number, batch in enumerate(batches):
+        for clause in batch:
+            section = sections.get(ClauseBatchPlanner.source_key(clause.key))
+            if section is not None:
+                batches_by_section.setdefault(section, set()).add(batch_number)
+    return sum(len(numbers) > 1 for numbers in batches_by_section.values())
+
+
+def make_contracts(
+    seed: int = 7,
+) -> Dict[str, Tuple[List[Clause], Optional[Dict[str, str]]]]:
+    rng = random.Random(seed)
+    short = [_clause(rng, i, 1) for i in range(1, 401)]
+    mixed = [_clause(rng, i, rng.randint(1, 6)) for i in range(1, 201)]
+    long_indemnity = [
+        _clause(rng, i, 150 if i % 10 == 0 else rng.randint(2, 5))
+        for i in range(1, 101)
+    ]
+    return {
+        "short_clauses_400": (short, None),
+        "mixed_clauses_200": (mixed, None),
+        "long_indemnity_100": (long_indemnity, None),
+        "sectioned_40": make_sectioned_contract(rng, 40),
+    }
+
+
+async def simulate(
+    batches: List[List[Clause]],
+    count_tokens: Callable[[str], int],
+    time_scale: float,
+) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    failures = 0
+
+    async def request(batch: List[Clause]) -> None:
+        nonlocal failures
+        prompt_tokens = FIXED_PROMPT_TOKENS + sum(
+            count_tokens(clause.content) + ClauseBatchPlanner.CLAUSE_FRAMING_TOKENS
+            for clause in batch
+        )
+        completion_tokens = int(
+            len(batch) * RISKY_CLAUSE_RATIO * COMPLETION_TOKENS_PER_RISKY_CLAUSE
+        )
+        failed = (
+            prompt_tokens + completion_tokens > CONTEXT_WINDOW
+            or completion_tokens > MAX_COMPLETION_TOKENS
+        )
+        latency = (
+            BASE_LATENCY
+            + prompt_tokens * PROMPT_TOKEN_LATENCY
+            + min(completion_tokens, MAX_COMPLETION_TOKENS) * COMPLETION_TOKEN_LATENCY
+        )
+        async with semaphore:
+            await asyncio.sleep(latency * time_scale)
+        if failed:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(batch) for batch in batches))
+    wall_time = (time.perf_counter() - start) / time_scale
+
+    return {
+        "requests": len(batches),
+        "failed": failures,
+        "wall_time": wall_time,
+    }
+
+
+async def main(time_scale: float) -> None:
+    planner = ClauseBatchPlanner(
+        model=MODEL,
+        prompt_token_budget=6000,
+        completion_token_budget=3000,
+        completion_tokens_per_clause=60,
+    )
+    fixed_prompt = "x" * (FIXED_PROMPT_TOKENS * ClauseBatchPlanner.CHARS_PER_TOKEN)
+
+    print(
+        f"{'contract':<22}{'strategy':<10}{'requests':>10}{'failed':>8}"
+        f"{'wall (s)':>11}{'plan (ms)':>11}{'split':>7}"
+    )
+    for name, (clauses, sections) in make_contracts().items():
+        strategies = {
+            "fixed-25": lambda c=clauses: [c[i : i + 25] for i in range(0, len(c), 25)],
+            "planner": lambda c=clauses: planner.plan(c, fixed_prompt),
+        }
+        if sections is not None:
+            strategies["sections"] = lambda c=clauses, s=sections: planner.plan(
+                c, fixed_prompt, sections=s
+            )
+        for strategy, build in strategies.items():
+            plan_start = time.perf_counter()
+            batches = build()
+            plan_time = (time.perf_counter() - plan_start) * 1000
+            result = await simulate(batches, planner.count_tokens, time_scale)
+            print(
+                f"{name:<22}{strategy:<10}{result['requests']:>10}"
+                f"{result['failed']:>8}{result['wall_time']:>11.2f}{plan_time:>11.1f}"
+                f"{split_sections(batches, sections) if sections else '-':>7}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.01,
+        help="Factor applied to simulated latencies (reported times are unscaled).",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.time_scale))
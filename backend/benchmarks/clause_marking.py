@@ -0,0 +1,141 @@
+"""
+Benchmark the clause markers on synthetic contract HTML.
+
+Generates ConvertAPI-like HTML (styled divs and spans, entities, line breaks,
+nested lists, empty list items) with 1k to 50k list items, and reports the
+time and peak memory (tracemalloc) of each clause marker. Also checks that
+every marker returns the same clauses as the BeautifulSoup marker, and HTML
+that parses to the same document.
+
+Usage (from the backend directory):
+    python -m benchmarks.clause_marking [--items 1000 5000 10000 50000]
+        [--marker soup streaming] [--repeat 3]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.contract.contract_clause_marker import CLAUSE_MARKERS, get_clause_marker
+
+WORDS = (
+    "party agreement shall services obligations confidential information "
+    "liability indemnify terminate notice payment provider customer breach "
+    "warranty law jurisdiction consent written days reasonable damages"
+).split()
+
+
+def make_html(items: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+
+    def words(count: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(count))
+
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        "<style>.s1{font-weight:bold}.c{margin-left:18pt}</style></head><body>"
+    ]
+    item, section = 0, 0
+    while item < items:
+        section += 1
+        parts.append(
+            f'<div class="page"><p class="s1">{section}.&nbsp;{words(3).upper()}'
+            f"</p><ul>"
+        )
+        for clause in range(1, rng.randint(4, 12)):
+            item += 1
+            parts.append(
+                f'<li class="c"><span class="s1">{section}.{clause}&nbsp;</span>'
+                f"{words(rng.randint(10, 40))} &amp; {words(5)}<br>"
+                f"{words(rng.randint(5, 20))}&#8217;s {words(3)}."
+            )
+            if rng.random() < 0.2:
+                parts.append("<ul>")
+                for _ in range(rng.randint(1, 3)):
+                    item += 1
+                    parts.append(f"<li><span>&bull;</span> {words(12)}</li>")
+                parts.append("</ul>")
+            parts.append("</li>")
+            if rng.random() < 0.05:
+                item += 1
+                parts.append("<li>&nbsp;</li>")
+        parts.append("</ul><!-- page break --></div>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def canonical(html: str) -> str:
+    # Serializing a soup adds a newline after the doctype each time, so the
+    # HTML is parsed twice for it to settle
+    once = str(BeautifulSoup(html, "html.parser"))
+    return str(BeautifulSoup(once, "html.parser"))
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(items_list: List[int], markers: List[str], repeat: int) -> None:
+    print(
+        f"{'items':>7}{'HTML (KiB)':>12}{'marker':>11}{'clauses':>9}{'time (s)':>10}"
+        f"{'speedup':>9}{'peak (MiB)':>12}{'same':>6}"
+    )
+    reference = get_clause_marker("soup")
+    for items in items_list:
+        html = make_html(items)
+        reference_html, reference_clauses = reference.mark(html)
+        reference_canonical = canonical(reference_html)
+        baseline: Dict[str, float] = {}
+
+        for name in markers:
+            marker = get_clause_marker(name)
+            elapsed = best_time(lambda: marker.mark(html), repeat)
+            peak = peak_memory(lambda: marker.mark(html))
+            marked_html, clauses = marker.mark(html)
+            same = clauses == reference_clauses and (
+                marked_html == reference_html
+                or canonical(marked_html) == reference_canonical
+            )
+            baseline.setdefault("time", elapsed)
+            print(
+                f"{items:>7}{len(html) // 1024:>12}{name:>11}{len(clauses):>9}"
+                f"{elapsed:>10.3f}{baseline['time'] / elapsed:>8.1f}x"
+                f"{peak / 2**20:>12.1f}{'yes' if same else 'NO':>6}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--items", type=int, nargs="+", default=[1000, 5000, 10000, 50000]
+    )
+    parser.add_argument(
+        "--marker",
+        nargs="+",
+        choices=list(CLAUSE_MARKERS),
+        default=["soup", "streaming"],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.items, args.marker, args.repeat)
@@ -0,0 +1,205 @@
+"""
+Benchmark listing a user's contracts with inline HTML against contract bodies.
+
+Stores the same synthetic contracts (HTML of about `--html-kib` KiB each, and
+their clauses) for one user in a throwaway database, in two layouts, and
+times listing them as `GET /contract/all` does, serialization included:
+
+- inline: the HTML is part of the contract documents, which are fetched in
+  full and returned as `ContractResponse`s, as before contract bodies.
+- summary: the HTML is in `contract_bodies` (saved by `ContractRepository`),
+  and `ContractSummary`s are fetched with a projection.
+
+Then times fetching pages of `--page-size` summaries at increasing depths,
+with page numbers (skipping the previous pages) and with cursors (keyset
+pagination, seeking straight to the page).
+
+Needs a MongoDB server (the configured `MONGODB_URL` unless `--mongodb-url`
+is given). The benchmark database is dropped afterwards.
+
+Usage (from the backend directory):
+    python -m benchmarks.contract_list [--contracts 500] [--html-kib 100]
+        [--page-size 20] [--repeat 5] [--mongodb-url mongodb://localhost:27017]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import TypeAdapter
+
+from app.contract.contract_models import (
+    Clause,
+    Contract,
+    ContractResponse,
+    ContractSummary,
+)
+from app.contract.contract_repository import ContractRepository
+from core.config import config
+
+DATABASE = "benchmark_contract_list"
+CLAUSES_PER_CONTRACT = 60
+
+
+def make_contract(rng: random.Random, user_id: ObjectId, html_kib: int) -> Contract:
+    paragraph = "<p>" + "lorem ipsum dolor sit amet " * 20 + "</p>"
+    paragraphs = max(1, html_kib * 1024 // len(paragraph) // 2)
+    html = "<html><body>" + paragraph * paragraphs + "</body></html>"
+    return Contract(
+        title=f"Contract {rng.randrange(10**6)}",
+        original_html=html,
+        processed_html=html,
+        uploaded_by=user_id,
+        clauses=[
+            Clause(key=f"clause-{number}", content="lorem ipsum dolor sit amet " * 8)
+            for number in range(1, CLAUSES_PER_CONTRACT + 1)
+        ],
+        pages=rng.randint(5, 60),
+    )
+
+
+async def time_listing(list_contracts: Callable, repeat: int) -> Dict[str, float]:
+    times, payload = [], b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = await list_contracts()
+        times.append(time.perf_counter() - start)
+    return {"time": statistics.median(times), "bytes": len(payload)}
+
+
+async def time_pages(
+    repo: ContractRepository, filter: dict, page_size: int, repeat: int
+) -> List[Dict[str, float]]:
+    # Walk the pages once to get the cursor of each
+    cursors, cursor = [None], None
+    while True:
+        _, cursor = await repo.get_contract_summaries(filter, page_size, cursor)
+        if cursor is None:
+            break
+        cursors.append(cursor)
+
+    pages = sorted({1, len(cursors) // 4 or 1, len(cursors) // 2 or 1, len(cursors)})
+    results = []
+    for page in pages:
+        skipped = await time_listing(
+            lambda: _page(repo, filter, page_size, skip=(page - 1) * page_size),
+            repeat,
+        )
+        keyset = await time_listing(
+            lambda: _page(repo, filter, page_size, cursor=cursors[page - 1]), repeat
+        )
+        results.append(
+            {"page": page, "skip": skipped["time"], "cursor": keyset["time"]}
+        )
+    return results
+
+
+async def _page(repo: ContractRepository, filter: dict, page_size: int, **kwargs):
+    summaries, _ = await repo.get_contract_summaries(filter, page_size, **kwargs)
+    return TypeAdapter(List[ContractSummary]).dump_json(summaries, by_alias=True)
+
+
+async def main(
+    mongodb_url: str, contracts: int, html_kib: int, page_size: int, repeat: int
+) -> Tuple[List[Dict[str, float]], List[Dict[str, float]]]:
+    client = AsyncIOMotorClient(mongodb_url)
+    database = client[DATABASE]
+    inline = database["contracts_inline"]
+    repo = ContractRepository(
+        database["contracts"],
+        database["contract_reviews"],
+        database["contract_review_jobs"],
+        database["contract_bodies"],
+    )
+    user_id = ObjectId()
+    rng = random.Random(contracts)
+
+    try:
+        for _ in range(contracts):
+            contract = make_contract(rng, user_id, html_kib)
+            await inline.insert_one(contract.model_dump(by_alias=True))
+            await repo.create_contract(contract)
+
+        inline_adapter = TypeAdapter(List[ContractResponse])
+        summary_adapter = TypeAdapter(List[ContractSummary])
+
+        async def list_inline() -> bytes:
+            documents = (
+                await inline.find({"uploaded_by": user_id})
+                .sort([("created_at", -1)])
+                .to_list(None)
+            )
+            return inline_adapter.dump_json(
+                [ContractResponse(**document) for document in documents],
+                by_alias=True,
+            )
+
+        async def list_summaries() -> bytes:
+            summaries, _ = await repo.get_contract_summaries(
+                {"uploaded_by": user_id}, limit=contracts
+            )
+            return summary_adapter.dump_json(summaries, by_alias=True)
+
+        layouts = [
+            {"layout": "inline", **await time_listing(list_inline, repeat)},
+            {"layout": "summary", **await time_listing(list_summaries, repeat)},
+        ]
+        pages = await time_pages(repo, {"uploaded_by": user_id}, page_size, repeat)
+        return layouts, pages
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+def report(
+    results: List[Dict[str, float]],
+    pages: List[Dict[str, float]],
+    contracts: int,
+    html_kib: int,
+    page_size: int,
+) -> None:
+    print(f"{contracts} contracts of one user, {html_kib} KiB of HTML each")
+    print(f"{'layout':<9}{'time (ms)':>11}{'payload (KiB)':>15}{'per row (B)':>13}")
+    baseline = results[0]
+    for result in results:
+        print(
+            f"{result['layout']:<9}{result['time'] * 1000:>11.1f}"
+            f"{result['bytes'] / 1024:>15.1f}{result['bytes'] // contracts:>13}"
+        )
+    print(
+        f"summary vs inline: {baseline['time'] / results[1]['time']:.1f}x faster, "
+        f"{baseline['bytes'] / results[1]['bytes']:.0f}x smaller"
+    )
+
+    print(f"Pages of {page_size} summaries")
+    print(f"{'page':>6}{'skip (ms)':>11}{'cursor (ms)':>13}")
+    for page in pages:
+        print(
+            f"{page['page']:>6}{page['skip'] * 1000:>11.1f}"
+            f"{page['cursor'] * 1000:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=500)
+    parser.add_argument("--html-kib", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mongodb-url", default=str(config.MONGODB_URL))
+    args = parser.parse_args()
+    results, pages = asyncio.run(
+        main(
+            args.mongodb_url,
+            args.contracts,
+            args.html_kib,
+            args.page_size,
+            args.repeat,
+        )
+    )
+    report(results, pages, args.contracts, args.html_kib, args.page_size)
@@ -0,0 +1,171 @@
+"""
+Benchmark storing contract bodies compressed and as HTML patches.
+
+Converts a synthetic contract PDF of `--sections` sections (see
+`benchmarks.pdf_conversion`) to HTML with pdfplumber, marks its clauses, and
+saves it `--contracts` times through `ContractRepository` in a throwaway
+database, with each body layout:
+
+- plain: the original and processed HTML as they are (as before).
+- gzip: both HTMLs compressed with gzip.
+- gzip+patch: the original HTML compressed, and the processed HTML stored as
+  a (compressed) patch over it.
+- zstd and zstd+patch: the same with zstd, if `zstandard` is installed.
+
+Reports the stored size of a body and the compression ratio, the time to
+encode and decode a body, and the latency of saving a contract and of
+fetching its body from MongoDB.
+
+Needs a MongoDB server (the configured `MONGODB_URL` unless `--mongodb-url`
+is given). The benchmark database is dropped afterwards.
+
+Usage (from the backend directory):
+    python -m benchmarks.contract_storage [--sections 100] [--contracts 50]
+        [--mongodb-url mongodb://localhost:27017]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict
+
+import bson
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.contract.contract_clause_marker import get_clause_marker
+from app.contract.contract_conversion import PdfPlumberEngine
+from app.contract.contract_models import Contract, ContractBody
+from app.contract.contract_repository import ContractRepository
+from benchmarks.pdf_conversion import make_contract
+from core.config import config
+from core.database.codecs import TEXT_CODECS, get_text_codec
+
+DATABASE = "benchmark_contract_storage"
+
+
+def layouts() -> Dict[str, dict]:
+    codecs = ["gzip"]
+    try:
+        get_text_codec("zstd")
+        codecs.append("zstd")
+    except ImportError:
+        pass
+    result = {"plain": {"codec": "none", "html_patch": False}}
+    for codec in codecs:
+        result[codec] = {"codec": codec, "html_patch": False}
+        result[f"{codec}+patch"] = {"codec": codec, "html_patch": True}
+    return result
+
+
+async def run_layout(
+    database, layout: dict, body: ContractBody, clauses: list, contracts: int
+) -> Dict[str, float]:
+    repo = ContractRepository(
+        database["contracts"],
+        database["contract_reviews"],
+        database["contract_review_jobs"],
+        database["contract_bodies"],
+        body_codec=TEXT_CODECS[layout["codec"]](),
+        body_min_bytes=config.CONTRACT_BODY_MIN_COMPRESS_BYTES,
+        html_patch=layout["html_patch"],
+    )
+
+    encode_times, decode_times = [], []
+    for _ in range(5):
+        start = time.perf_counter()
+        body_data = repo._encode_body(body)
+        encode_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        decoded = repo._decode_body(dict(body_data))
+        decode_times.append(time.perf_counter() - start)
+    assert decoded.processed_html == body.processed_html
+
+    write_times, read_times, contract_ids = [], [], []
+    for _ in range(contracts):
+        contract = Contract(
+            title="Storage benchmark",
+            original_html=body.original_html,
+            processed_html=body.processed_html,
+            uploaded_by=ObjectId(),
+            clauses=clauses,
+            pages=1,
+        )
+        start = time.perf_counter()
+        await repo.create_contract(contract)
+        write_times.append(time.perf_counter() - start)
+        contract_ids.append(str(contract.id))
+    for contract_id in contract_ids:
+        start = time.perf_counter()
+        await repo.get_contract_body(contract_id)
+        read_times.append(time.perf_counter() - start)
+
+    stored = await database["contract_bodies"].find_one(
+        {"_id": ObjectId(contract_ids[0])}
+    )
+    await database["contracts"].drop()
+    await database["contract_bodies"].drop()
+    return {
+        "bytes": len(bson.encode(stored)),
+        "encode": statistics.median(encode_times),
+        "decode": statistics.median(decode_times),
+        "write": statistics.median(write_times),
+        "read": statistics.median(read_times),
+    }
+
+
+async def main(mongodb_url: str, sections: int, contracts: int) -> None:
+    pdf_content, _ = make_contract(sections, seed=sections)
+    original_html, _ = PdfPlumberEngine().convert(pdf_content)
+    processed_html, clauses = get_clause_marker().mark(original_html)
+    body = ContractBody(
+        _id=ObjectId(), original_html=original_html, processed_html=processed_html
+    )
+
+    client = AsyncIOMotorClient(mongodb_url)
+    database = client[DATABASE]
+    try:
+        results = {
+            name: await run_layout(database, layout, body, clauses, contracts)
+            for name, layout in layouts().items()
+        }
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+    report(results, len(original_html), len(processed_html), len(clauses), contracts)
+
+
+def report(
+    results: Dict[str, Dict[str, float]],
+    original_size: int,
+    processed_size: int,
+    clauses: int,
+    contracts: int,
+) -> None:
+    print(
+        f"Original HTML {original_size / 1024:.0f} KiB, processed HTML "
+        f"{processed_size / 1024:.0f} KiB, {clauses} clauses, {contracts} contracts"
+    )
+    print(
+        f"{'layout':<12}{'body (KiB)':>12}{'ratio':>8}{'encode (ms)':>13}"
+        f"{'decode (ms)':>13}{'write (ms)':>12}{'read (ms)':>11}"
+    )
+    plain = results["plain"]["bytes"]
+    for name, result in results.items():
+        print(
+            f"{name:<12}{result['bytes'] / 1024:>12.1f}"
+            f"{plain / result['bytes']:>8.1f}{result['encode'] * 1000:>13.2f}"
+            f"{result['decode'] * 1000:>13.2f}{result['write'] * 1000:>12.2f}"
+            f"{result['read'] * 1000:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--contracts", type=int, default=50)
+    parser.add_argument("--mongodb-url", default=str(config.MONGODB_URL))
+    args = parser.parse_args()
+    asyncio.run(main(args.mongodb_url, args.sections, args.contracts))
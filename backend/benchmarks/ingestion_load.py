@@ -0,0 +1,174 @@
+"""
+Load test: latency of light requests while large contracts are being ingested.
+
+Serves a minimal FastAPI app with uvicorn, with an upload endpoint that runs
+contract ingestion (local PDF conversion and clause marking) and a GET
+endpoint that does no work. Several large synthetic PDFs are uploaded at once
+while GETs are polled, and the GET latency is reported for each mode:
+
+- inline: ingestion runs on the event loop (as uploads did before the
+  ingestion executor), blocking every other request.
+- threads: ingestion runs in the executor's thread pool (no process workers).
+- processes: CPU-bound stages run in the executor's process pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.ingestion_load [--uploads 4] [--sections 150]
+        [--process-workers 2] [--max-pending 8]
+"""
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from typing import Dict, List
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI, Request
+
+from app.contract.contract_conversion import PdfPlumberEngine
+from app.contract.contract_ingestion import ContractIngestor
+from app.contract.contract_models import ContractIngestionTimings
+from app.contract.contract_processor import ContractProcessor
+from benchmarks.pdf_conversion import make_contract
+from benchmarks.review_pipeline import percentile
+from core.executors import IngestionExecutor
+
+MODES = ["inline", "threads", "processes"]
+
+
+def make_app(mode: str, args: argparse.Namespace) -> FastAPI:
+    app = FastAPI()
+    engine = PdfPlumberEngine()
+    executor = IngestionExecutor(
+        process_workers=args.process_workers if mode == "processes" else 0,
+        thread_workers=args.thread_workers,
+        max_pending=args.max_pending,
+        admission_timeout=600,
+    )
+    ingestor = ContractIngestor(engine, executor)
+    app.state.executor = executor
+
+    @app.post("/upload")
+    async def upload(request: Request) -> dict:
+        pdf_content = await request.body()
+        timings = ContractIngestionTimings()
+        if mode == "inline":
+            start = time.perf_counter()
+            original_html, _ = engine.convert(pdf_content)
+            timings.conversion_time = time.perf_counter() - start
+            ContractProcessor.mark_clauses(original_html)
+            timings.total_time = time.perf_counter() - start
+            timings.marking_time = timings.total_time - timings.conversion_time
+        else:
+            await ingestor.ingest(pdf_content, timings)
+        return timings.model_dump()
+
+    @app.get("/contracts/{contract_id}")
+    async def get_contract(contract_id: str) -> dict:
+        return {"id": contract_id}
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def load(base_url: str, pdf_content: bytes, args) -> Dict[str, float]:
+    get_latencies: List[float] = []
+    upload_results: List[dict] = []
+    uploads_done = asyncio.Event()
+
+    async with aiohttp.ClientSession() as session:
+
+        async def upload() -> None:
+            async with session.post(f"{base_url}/upload", data=pdf_content) as resp:
+                upload_results.append(await resp.json())
+
+        async def poll() -> None:
+            while not uploads_done.is_set():
+                start = time.perf_counter()
+                async with session.get(f"{base_url}/contracts/1") as resp:
+                    await resp.read()
+                get_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(args.poll_interval)
+
+        pollers = [asyncio.create_task(poll()) for _ in range(args.pollers)]
+        start = time.perf_counter()
+        await asyncio.gather(*(upload() for _ in range(args.uploads)))
+        wall_time = time.perf_counter() - start
+        uploads_done.set()
+        await asyncio.gather(*pollers)
+
+    def mean(field: str) -> float:
+        return sum(r.get(field, 0.0) for r in upload_results) / len(upload_results)
+
+    return {
+        "wall_time": wall_time,
+        "gets": len(get_latencies),
+        "get_p50": percentile(get_latencies, 0.50),
+        "get_p95": percentile(get_latencies, 0.95),
+        "get_max": max(get_latencies, default=0.0),
+        "queue": mean("queue_time"),
+        "conversion": mean("conversion_time"),
+        "marking": mean("marking_time"),
+        "total": mean("total_time"),
+    }
+
+
+def run_mode(mode: str, pdf_content: bytes, args) -> Dict[str, float]:
+    port = free_port()
+    app = make_app(mode, args)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        return asyncio.run(load(f"http://127.0.0.1:{port}", pdf_content, args))
+    finally:
+        server.should_exit = True
+        thread.join()
+        app.state.executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--uploads", type=int, default=4)
+    parser.add_argument(
+        "--sections", type=int, default=150, help="Size of each synthetic contract."
+    )
+    parser.add_argument("--process-workers", type=int, default=2)
+    parser.add_argument("--thread-workers", type=int, default=8)
+    parser.add_argument("--max-pending", type=int, default=8)
+    parser.add_argument("--pollers", type=int, default=4)
+    parser.add_argument("--poll-interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    pdf_content, _ = make_contract(args.sections, seed=args.sections)
+    print(
+        f"{args.uploads} concurrent uploads of a {len(pdf_content) // 1024} KiB PDF, "
+        f"{args.pollers} GET pollers"
+    )
+    print(
+        f"{'mode':<11}{'wall (s)':>10}{'GETs':>7}{'GET p50 (ms)':>14}"
+        f"{'GET p95 (ms)':>14}{'GET max (ms)':>14}{'queue (s)':>11}"
+        f"{'convert (s)':>13}{'mark (s)':>10}{'upload (s)':>12}"
+    )
+    for mode in args.mode:
+        result = run_mode(mode, pdf_content, args)
+        print(
+            f"{mode:<11}{result['wall_time']:>10.2f}{result['gets']:>7}"
+            f"{result['get_p50'] * 1000:>14.1f}{result['get_p95'] * 1000:>14.1f}"
+            f"{result['get_max'] * 1000:>14.1f}{result['queue']:>11.2f}"
+            f"{result['conversion']:>13.2f}{result['marking']:>10.2f}"
+            f"{result['total']:>12.2f}"
+        )
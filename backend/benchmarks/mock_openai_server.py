@@ -0,0 +1,279 @@
+"""
+Local stand-in for the OpenAI chat completions API, for benchmarks and offline runs.
+
+Implements `POST /v1/chat/completions`, both non-streaming and streaming (SSE),
+answering clause batch prompts with a JSON array of risky clauses for the
+clause keys found in the prompt, and any other prompt with plain text. Latency,
+429 responses (with `Retry-After`) and malformed JSON are injected according to
+`MockOpenAISettings`, and every response reports token `usage`.
+
+Point the backend at it with `OPENAI_API_BASE_URL=http://localhost:8089/v1`.
+
+Usage (from the backend directory):
+    python -m benchmarks.mock_openai_server [--port 8089] [--rate-limit-ratio 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from pydantic import BaseModel
+
+CHARS_PER_TOKEN = 4
+CLAUSE_KEY_PATTERN = re.compile(r"\(Key: ([^)]+)\):")
+RISK_TYPES = ["Compliance", "Financial", "Operational", "Strategic", "Legal"]
+
+
+class MockOpenAISettings(BaseModel):
+    # Latency of each response: a base latency drawn from the distribution,
+    # plus a per-completion-token generation time
+    latency_distribution: str = "lognormal"  # "constant", "uniform" or "lognormal"
+    latency_mean: float = 0.5  # seconds
+    latency_spread: float = 0.5  # uniform: +/- seconds; lognormal: sigma
+    completion_token_latency: float = 0.002  # seconds per completion token
+    # Fault injection
+    rate_limit_ratio: float = 0.0  # Fraction of requests answered with a 429
+    retry_after: float = 1.0  # seconds, sent in the Retry-After header
+    malformed_ratio: float = 0.0  # Fraction of clause batches with truncated JSON
+    # Generated answers
+    risky_clause_ratio: float = 0.3
+    stream_chunk_words: int = 3
+    seed: Optional[int] = None
+
+
+class MockOpenAIServer:
+    """
+    In-process mock of the chat completions API.
+
+    Example:
+        server = MockOpenAIServer(MockOpenAISettings(rate_limit_ratio=0.05))
+        base_url = await server.start()  # e.g. http://127.0.0.1:53211/v1
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, settings: Optional[MockOpenAISettings] = None):
+        self.settings = settings or MockOpenAISettings()
+        self.rng = random.Random(self.settings.seed)
+        self.stats: Dict[str, int] = {}
+        self.app = web.Application()
+        self.app.router.add_post("/v1/chat/completions", self.chat_completions)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the API base URL (port 0 picks a free port)."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}/v1"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_stats(self) -> None:
+        self.stats = {}
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        messages = body.get("messages", [])
+        self._count("requests")
+
+        if self.rng.random() < self.settings.rate_limit_ratio:
+            self._count("rate_limited")
+            return web.json_response(
+                {
+                    "error": {
+                        "message": "Rate limit reached for requests",
+                        "type": "requests",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+                status=429,
+                headers={"Retry-After": f"{self.settings.retry_after:g}"},
+            )
+
+        user_prompt = next(
+            (m["content"] for m in messages if m.get("role") == "user"), ""
+        )
+        content = self._answer(user_prompt)
+        usage = {
+            "prompt_tokens": self._count_tokens(
+                "".join(m.get("content", "") for m in messages)
+            ),
+            "completion_tokens": self._count_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            self._count("streamed")
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            return await self._stream(
+                request, body, content, usage if include_usage else None
+            )
+
+        await asyncio.sleep(self._latency(usage["completion_tokens"]))
+        return web.json_response(
+            {
+                "id": f"chatcmpl-mock-{self.stats['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        )
+
+    async def _stream(
+        self,
+        request: web.Request,
+        body: dict,
+        content: str,
+        usage: Optional[dict],
+    ) -> web.StreamResponse:
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+
+        words = content.split()
+        chunks = [
+            " ".join(words[i : i + self.settings.stream_chunk_words])
+            for i in range(0, len(words), self.settings.stream_chunk_words)
+        ]
+        # Time to first token is the base latency, then tokens are generated
+        await asyncio.sleep(self._latency(0))
+        for chunk in chunks:
+            await asyncio.sleep(
+                self._count_tokens(chunk) * self.settings.completion_token_latency
+            )
+            await self._send_event(
+                response,
+                {
+                    "object": "chat.completion.chunk",
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "delta": {"content": chunk}}],
+                },
+            )
+        if usage is not None:
+            await self._send_event(
+                response,
+                {
+                    "object": "chat.completion.chunk",
+                    "model": body.get("model"),
+                    "choices": [],
+                    "usage": usage,
+                },
+            )
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def _send_event(self, response: web.StreamResponse, data: dict) -> None:
+        await response.write(f"data: {json.dumps(data)}\n\n".encode("utf-8"))
+
+    def _answer(self, user_prompt: str) -> str:
+        clause_keys = CLAUSE_KEY_PATTERN.findall(user_prompt)
+        if not clause_keys:
+            return (
+                "- **Parties Involved**: Provider and Customer.\n"
+                "- **Payment Terms**: Invoices are payable within 30 days.\n"
+                "- **Termination Clause**: Either party may terminate on notice.\n"
+                "- **Liability and Indemnity**: Liability is capped at the fees paid."
+            )
+
+        content = json.dumps(
+            [
+                {
+                    "clause_key": key,
+                    "risk_level": self.rng.randint(1, 3),
+                    "risk_type": self.rng.choice(RISK_TYPES),
+                    "risk_factor": "Legal",
+                    "title": f"Risk in {key}",
+                    "concerns": "The clause allocates liability unevenly between the parties.",
+                    "recommendations": "Add a mutual cap on liability and clarify remedies.",
+                }
+                for key in clause_keys
+                if self.rng.random() < self.settings.risky_clause_ratio
+            ],
+            indent=2,
+        )
+        if self.rng.random() < self.settings.malformed_ratio:
+            # Like a completion cut off at the maximum length
+            self._count("malformed")
+            content = content[: max(1, len(content) // 2)]
+        return content
+
+    def _latency(self, completion_tokens: int) -> float:
+        settings = self.settings
+        if settings.latency_distribution == "constant":
+            base = settings.latency_mean
+        elif settings.latency_distribution == "uniform":
+            base = self.rng.uniform(
+                settings.latency_mean - settings.latency_spread,
+                settings.latency_mean + settings.latency_spread,
+            )
+        elif settings.latency_distribution == "lognormal":
+            # Parameterized so that the distribution's mean is latency_mean
+            sigma = settings.latency_spread
+            mu = math.log(max(settings.latency_mean, 1e-9)) - sigma**2 / 2
+            base = self.rng.lognormvariate(mu, sigma)
+        else:
+            raise ValueError(
+                f"Unknown latency distribution: {settings.latency_distribution}"
+            )
+        return max(0.0, base) + completion_tokens * settings.completion_token_latency
+
+    def _count_tokens(self, text: str) -> int:
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def _count(self, stat: str) -> None:
+        self.stats[stat] = self.stats.get(stat, 0) + 1
+
+
+def parse_settings(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    for name, field in MockOpenAISettings.model_fields.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            # Optional fields (the seed) are integers
+            type=field.annotation if field.annotation in (int, float, str) else int,
+            default=field.default,
+        )
+    return parser.parse_args(args)
+
+
+async def serve(host: str, port: int, settings: MockOpenAISettings) -> None:
+    server = MockOpenAIServer(settings)
+    base_url = await server.start(host, port)
+    print(f"Mock OpenAI API listening on {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    args = vars(parse_settings())
+    host, port = args.pop("host"), args.pop("port")
+    try:
+        asyncio.run(serve(host, port, MockOpenAISettings(**args)))
+    except KeyboardInterrupt:
+        pass
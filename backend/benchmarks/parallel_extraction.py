@@ -0,0 +1,116 @@
+"""
+Benchmark parallel page-range extraction of large PDFs.
+
+Converts synthetic contracts of about 50, 200 and 500 pages with the local
+pdfplumber engine through `ContractIngestor`, with 1 process worker
+(sequential conversion) and with more workers (page ranges extracted in
+parallel, then merged), and reports the conversion time (clause marking
+excluded), the speedup and whether the HTML is the same as the sequential
+conversion's.
+
+The speedup is bounded by the CPUs available, which are printed first.
+
+Usage (from the backend directory):
+    python -m benchmarks.parallel_extraction [--pages 50 200 500]
+        [--workers 1 2 4] [--min-pages-per-range 25] [--repeat 1]
+"""
+
+import argparse
+import asyncio
+import gc
+from typing import List, Tuple
+
+from app.contract.contract_conversion import PdfPlumberEngine
+from app.contract.contract_ingestion import ContractIngestor, split_page_ranges
+from app.contract.contract_models import ContractIngestionTimings
+from app.contract.contract_processor import ContractProcessor
+from benchmarks.pdf_conversion import make_contract
+from core.config import config
+from core.executors import IngestionExecutor, available_cpus
+
+
+def make_pdf(pages: int) -> Tuple[bytes, int]:
+    """A synthetic contract of about `pages` pages, and its page count."""
+    sample, _ = make_contract(40, seed=40)
+    sections_per_page = 40 / ContractProcessor.get_number_of_pages(sample)
+    pdf_content, _ = make_contract(round(pages * sections_per_page), seed=pages)
+    return pdf_content, ContractProcessor.get_number_of_pages(pdf_content)
+
+
+async def convert(
+    ingestor: ContractIngestor, pdf_content: bytes, repeat: int
+) -> Tuple[float, str]:
+    # Start the worker processes before timing
+    await ingestor.executor.run_cpu(abs, 0)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        timings = ContractIngestionTimings()
+        original_html, _, _, _, _ = await ingestor.ingest(pdf_content, timings)
+        times.append(timings.conversion_time)
+    return min(times), original_html
+
+
+def main(page_counts: List[int], workers_list: List[int], repeat: int) -> None:
+    print(f"{available_cpus()} CPUs available")
+    print(
+        f"{'pages':>6}{'KiB':>7}{'workers':>9}{'ranges':>8}{'time (s)':>10}"
+        f"{'pages/s':>9}{'speedup':>9}{'same':>6}"
+    )
+    engine = PdfPlumberEngine()
+    for target_pages in page_counts:
+        pdf_content, pages = make_pdf(target_pages)
+        baseline_time, baseline_html = None, None
+
+        for workers in workers_list:
+            executor = IngestionExecutor(
+                process_workers=workers,
+                thread_workers=4,
+                max_pending=1,
+                admission_timeout=600,
+            )
+            try:
+                elapsed, original_html = asyncio.run(
+                    convert(ContractIngestor(engine, executor), pdf_content, repeat)
+                )
+            finally:
+                executor.shutdown()
+
+            ranges = (
+                len(
+                    split_page_ranges(
+                        pages, workers, config.INGESTION_MIN_PAGES_PER_RANGE
+                    )
+                )
+                if workers > 1
+                else 1
+            )
+            if baseline_time is None:
+                baseline_time, baseline_html = elapsed, original_html
+            print(
+                f"{pages:>6}{len(pdf_content) // 1024:>7}{workers:>9}{ranges:>8}"
+                f"{elapsed:>10.2f}{pages / elapsed:>9.1f}"
+                f"{baseline_time / elapsed:>8.2f}x"
+                f"{'yes' if original_html == baseline_html else 'NO':>6}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, available_cpus()}),
+        help="Process workers; the first is the baseline.",
+    )
+    parser.add_argument(
+        "--min-pages-per-range",
+        type=int,
+        default=config.INGESTION_MIN_PAGES_PER_RANGE,
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    config.INGESTION_MIN_PAGES_PER_RANGE = args.min_pages_per_range
+    main(args.pages, args.workers, args.repeat)
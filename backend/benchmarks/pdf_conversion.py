@@ -0,0 +1,331 @@
+"""
+Benchmark PDF to HTML conversion engines for speed and structural fidelity.
+
+By default, runs over a synthetic corpus of contracts laid out as PDFs (title,
+section headings, numbered clauses with hanging indents, nested bullets,
+recitals, running headers, page numbers, and clauses broken across pages), for
+which the expected headings, paragraphs and list items are known. Each engine
+is scored on how many of the expected blocks and clauses it reproduces.
+
+With `--corpus DIR`, converts the PDFs in DIR instead. Real documents have no
+ground truth, so the engines are compared with the ConvertAPI output, which is
+cached next to each PDF as `<name>.convertapi.html` (converting requires
+`CONVERT_API_SECRET` the first time).
+
+Usage (from the backend directory):
+    python -m benchmarks.pdf_conversion [--engine pdfplumber convertapi]
+        [--corpus DIR] [--repeat 3]
+"""
+
+import argparse
+import difflib
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.contract.contract_conversion import get_pdf_to_html_engine
+from app.contract.contract_processor import ContractProcessor
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN_X, MARGIN_TOP, MARGIN_BOTTOM = 72, 72, 72
+BODY_SIZE, TITLE_SIZE = 10, 18
+
+WORDS = (
+    "party agreement shall services obligations confidential information "
+    "liability indemnify terminate notice payment provider customer breach "
+    "warranty law jurisdiction consent written days reasonable damages"
+).split()
+
+# (block tag, text, label) of the expected document structure
+ExpectedBlock = Tuple[str, str, Optional[str]]
+
+
+class SyntheticPdf:
+    """
+    Minimal PDF writer laying out text with the standard Helvetica fonts.
+    """
+
+    def __init__(self, header: str):
+        self.header = header
+        self.pages: List[List[Tuple[str, float, float, float, str]]] = [[]]
+        self.y = PAGE_HEIGHT - MARGIN_TOP
+
+    def line(self, text: str, size: float, x: float, bold: bool = False) -> None:
+        if self.y - size < MARGIN_BOTTOM:
+            self.pages.append([])
+            self.y = PAGE_HEIGHT - MARGIN_TOP
+        self.pages[-1].append(("F2" if bold else "F1", size, x, self.y - size, text))
+        self.y -= size * 1.3
+
+    def gap(self, size: float = BODY_SIZE) -> None:
+        self.y -= size * 0.9
+
+    def wrap(
+        self,
+        text: str,
+        size: float,
+        x: float,
+        first_x: Optional[float] = None,
+        bold: bool = False,
+    ) -> None:
+        max_chars = int((PAGE_WIDTH - MARGIN_X - x) / (0.55 * size))
+        lines, current = [], ""
+        for word in text.split():
+            if current and len(current) + 1 + len(word) > max_chars:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}".strip()
+        lines.append(current)
+        for index, line in enumerate(lines):
+            self.line(line, size, first_x if index == 0 and first_x else x, bold)
+
+    def to_bytes(self) -> bytes:
+        objects: List[bytes] = []
+        total_pages = len(self.pages)
+        page_ids = [5 + 2 * index for index in range(total_pages)]
+        objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+        objects.append(
+            f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] "
+            f"/Count {total_pages} >>".encode()
+        )
+        for font in ("Helvetica", "Helvetica-Bold"):
+            objects.append(
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} "
+                f"/Encoding /WinAnsiEncoding >>".encode()
+            )
+        for number, page in enumerate(self.pages, start=1):
+            running = [
+                ("F1", 8, MARGIN_X, PAGE_HEIGHT - 40, self.header),
+                ("F1", 8, PAGE_WIDTH / 2 - 20, 36, f"Page {number} of {total_pages}"),
+            ]
+            stream = b"".join(
+                f"BT /{font} {size} Tf {x:.2f} {y:.2f} Td (".encode()
+                + _escape(text)
+                + b") Tj ET\n"
+                for font, size, x, y, text in running + page
+            )
+            content_id = len(objects) + 2
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} "
+                f"{PAGE_HEIGHT}] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                f"/Contents {content_id} 0 R >>".encode()
+            )
+            objects.append(
+                f"<< /Length {len(stream)} >>\nstream\n".encode()
+                + stream
+                + b"endstream"
+            )
+
+        output = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        xref = len(output)
+        output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+        output += (
+            f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n".encode()
+        )
+        return bytes(output)
+
+
+def _escape(text: str) -> bytes:
+    encoded = text.encode("cp1252")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_contract(sections: int, seed: int) -> Tuple[bytes, List[ExpectedBlock]]:
+    rng = random.Random(seed)
+    title = "MASTER SERVICES AGREEMENT"
+    pdf = SyntheticPdf(header="Confidential - Master Services Agreement")
+    expected: List[ExpectedBlock] = [("h", title, None)]
+    pdf.line(title, TITLE_SIZE, MARGIN_X, bold=True)
+    pdf.gap()
+
+    for _ in range(2):
+        recital = " ".join(_sentence(rng, rng.randint(10, 20)) for _ in range(3))
+        pdf.wrap(recital, BODY_SIZE, MARGIN_X, first_x=MARGIN_X + 18)
+        pdf.gap()
+        expected.append(("p", recital, None))
+
+    for section in range(1, sections + 1):
+        heading = (
+            f"{section}. {rng.choice(WORDS).upper()} AND {rng.choice(WORDS).upper()}"
+        )
+        pdf.gap()
+        pdf.line(heading, BODY_SIZE + 1, MARGIN_X, bold=True)
+        pdf.gap(4)
+        expected.append(("h", heading, None))
+
+        for clause in range(1, rng.randint(3, 7)):
+            label = f"{section}.{clause}"
+            text = " ".join(
+                _sentence(rng, rng.randint(8, 22)) for _ in range(rng.randint(1, 4))
+            )
+            pdf.wrap(f"{label} {text}", BODY_SIZE, MARGIN_X + 24, first_x=MARGIN_X)
+            pdf.gap(4)
+            expected.append(("li", text, label))
+
+            if rng.random() < 0.25:
+                for _ in range(rng.randint(2, 3)):
+                    bullet = _sentence(rng, rng.randint(6, 14))
+                    pdf.wrap(
+                        f"• {bullet}",
+                        BODY_SIZE,
+                        MARGIN_X + 46,
+                        first_x=MARGIN_X + 36,
+                    )
+                    expected.append(("li", bullet, None))
+                pdf.gap(4)
+
+    return pdf.to_bytes(), expected
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", "", text).lower()
+
+
+def _text_similarity(expected: str, actual: str) -> float:
+    # Word-level, as character-level matching is quadratic on long documents
+    return difflib.SequenceMatcher(
+        None, expected.lower().split(), actual.lower().split(), autojunk=False
+    ).ratio()
+
+
+def _blocks(html: str) -> List[Tuple[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
+    blocks = []
+    for element in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6", "p", "li"]):
+        if element.name == "li":
+            # Own text only, without nested lists
+            text = " ".join(
+                child.get_text(" ", strip=True)
+                for child in element.children
+                if getattr(child, "name", None) not in ("ul", "ol")
+            )
+        else:
+            text = element.get_text(" ", strip=True)
+        tag = "h" if element.name.startswith("h") else element.name
+        blocks.append((tag, text))
+    return blocks
+
+
+def score_against_expected(
+    html: str, expected: List[ExpectedBlock]
+) -> Dict[str, float]:
+    blocks = {(tag, _normalize(text)) for tag, text in _blocks(html)}
+    found = [
+        (tag, _normalize(f"{label} {text}" if label else text)) in blocks
+        or (tag, _normalize(text)) in blocks
+        for tag, text, label in expected
+    ]
+    expected_clauses = [_normalize(text) for tag, text, _ in expected if tag == "li"]
+    _, clauses = ContractProcessor.mark_clauses(html)
+    clause_texts = [_normalize(clause.content) for clause in clauses]
+    clauses_found = sum(
+        any(expected_clause in clause for clause in clause_texts)
+        for expected_clause in expected_clauses
+    )
+    expected_text = " ".join(
+        f"{label} {text}" if label else text for _, text, label in expected
+    )
+    html_text = " ".join(text for _, text in _blocks(html))
+    return {
+        "blocks": sum(found) / len(expected),
+        "clauses": clauses_found / len(expected_clauses) if expected_clauses else 1,
+        "marked": len(clauses),
+        "expected_marked": len(expected_clauses),
+        "text": _text_similarity(expected_text, html_text),
+    }
+
+
+def score_against_reference(html: str, reference_html: str) -> Dict[str, float]:
+    reference = [text for _, text in _blocks(reference_html)]
+    candidate = [text for _, text in _blocks(html)]
+    _, reference_clauses = ContractProcessor.mark_clauses(reference_html)
+    _, clauses = ContractProcessor.mark_clauses(html)
+    return {
+        "text": _text_similarity(" ".join(reference), " ".join(candidate)),
+        "marked": len(clauses),
+        "expected_marked": len(reference_clauses),
+    }
+
+
+def convert_timed(engine, pdf_content: bytes, repeat: int) -> Tuple[str, int, float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html, pages = engine.convert(pdf_content)
+        times.append(time.perf_counter() - start)
+    return html, pages, min(times)
+
+
+def run_synthetic(engines: List[str], repeat: int) -> None:
+    print(
+        f"{'document':<14}{'engine':<12}{'pages':>6}{'time (s)':>10}{'pages/s':>9}"
+        f"{'blocks':>8}{'clauses':>9}{'marked':>12}{'text':>7}"
+    )
+    for name, sections in (("contract_s", 4), ("contract_m", 20), ("contract_l", 80)):
+        pdf_content, expected = make_contract(sections, seed=sections)
+        for engine_name in engines:
+            engine = get_pdf_to_html_engine(engine_name)
+            html, pages, elapsed = convert_timed(engine, pdf_content, repeat)
+            score = score_against_expected(html, expected)
+            print(
+                f"{name:<14}{engine_name:<12}{pages:>6}{elapsed:>10.3f}"
+                f"{pages / elapsed:>9.1f}{score['blocks']:>8.1%}{score['clauses']:>9.1%}"
+                f"{score['marked']:>6}/{score['expected_marked']:<5}{score['text']:>7.1%}"
+            )
+
+
+def run_corpus(corpus: Path, engines: List[str], repeat: int) -> None:
+    print(
+        f"{'document':<30}{'engine':<12}{'pages':>6}{'time (s)':>10}{'pages/s':>9}"
+        f"{'marked':>12}{'text vs convertapi':>20}"
+    )
+    for pdf_path in sorted(corpus.glob("*.pdf")):
+        pdf_content = pdf_path.read_bytes()
+        reference_path = pdf_path.with_suffix(".convertapi.html")
+        if not reference_path.exists():
+            html, _ = get_pdf_to_html_engine("convertapi").convert(pdf_content)
+            reference_path.write_text(html, encoding="utf-8")
+        reference_html = reference_path.read_text(encoding="utf-8")
+
+        for engine_name in engines:
+            engine = get_pdf_to_html_engine(engine_name)
+            html, pages, elapsed = convert_timed(engine, pdf_content, repeat)
+            score = score_against_reference(html, reference_html)
+            print(
+                f"{pdf_path.name[:29]:<30}{engine_name:<12}{pages:>6}{elapsed:>10.3f}"
+                f"{pages / elapsed:>9.1f}"
+                f"{score['marked']:>6}/{score['expected_marked']:<5}"
+                f"{score['text']:>20.1%}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--engine", nargs="+", default=["pdfplumber"])
+    parser.add_argument(
+        "--corpus", type=Path, help="Directory of PDFs to compare with ConvertAPI."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Conversions per document (best kept)."
+    )
+    args = parser.parse_args()
+
+    if args.corpus:
+        run_corpus(args.corpus, args.engine, args.repeat)
+    else:
+        run_synthetic(args.engine, args.repeat)
@@ -0,0 +1,262 @@
+"""
+Benchmark the MongoDB round trips of saving a contract review.
+
+Saves reviews of `--contracts` contracts (each reviewed, then re-reviewed)
+in a throwaway database in two ways:
+
+- sequential: as before, looking up an existing review, then inserting or
+  updating it, flagging the contract as reviewed, and incrementing the
+  user's analytics, one after the other.
+- upsert: as `ContractController` does now, upserting the review on its
+  unique `contract_id`, then flagging the contract and incrementing the
+  analytics concurrently, with the contract's HTML in the response (as the
+  synchronous review endpoints return it).
+- upsert-no-body: the same without loading the contract's HTML, as for
+  streamed reviews and background review jobs.
+
+Every collection operation is counted as a round trip and delayed by
+`--rtt-ms`, standing in for the network between the API and MongoDB (a local
+server answers too quickly for round trips to show). Reports the round trips
+and the median latency of saving a review.
+
+Needs a MongoDB server (the configured `MONGODB_URL` unless `--mongodb-url`
+is given). The benchmark database is dropped afterwards.
+
+Usage (from the backend directory):
+    python -m benchmarks.review_persistence [--contracts 50] [--rtt-ms 2]
+        [--mongodb-url mongodb://localhost:27017]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.analytics.analytics_controller import AnalyticsController
+from app.analytics.analytics_models import AnalyticsIncrementRequest
+from app.analytics.analytics_repository import AnalyticsRepository
+from app.contract.contract_controller import ContractController
+from app.contract.contract_conversion import PdfPlumberEngine
+from app.contract.contract_models import (
+    Clause,
+    Contract,
+    ContractReview,
+    ContractReviewCreateRequest,
+    ReviewAnalytics,
+    RiskyClause,
+)
+from app.contract.contract_repository import ContractRepository
+from core.config import config
+
+DATABASE = "benchmark_review_persistence"
+STRATEGIES = ["sequential", "upsert", "upsert-no-body"]
+CLAUSES_PER_CONTRACT = 60
+# Collection methods making one round trip to the server
+OPERATIONS = {
+    "find_one",
+    "insert_one",
+    "update_one",
+    "find_one_and_update",
+    "delete_one",
+}
+
+
+class RoundTripCollection:
+    """
+    Wraps a collection, counting the operations made through it and delaying
+    each by a simulated network round trip.
+    """
+
+    def __init__(self, collection, counter: Dict[str, int], rtt: float):
+        self.collection = collection
+        self.counter = counter
+        self.rtt = rtt
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.collection, name)
+        if name not in OPERATIONS:
+            return attribute
+
+        async def operation(*args, **kwargs):
+            self.counter["round_trips"] += 1
+            await asyncio.sleep(self.rtt)
+            return await attribute(*args, **kwargs)
+
+        return operation
+
+
+def make_review(contract: Contract) -> ContractReview:
+    risky_clauses = [
+        RiskyClause(
+            key=clause.key,
+            content=clause.content,
+            risk_type="liability",
+            risk_level=4,
+            concerns="lorem ipsum dolor sit amet " * 4,
+            recommendations="lorem ipsum dolor sit amet " * 4,
+        )
+        for clause in contract.clauses[:5]
+    ]
+    return ContractReview(
+        contract_id=contract.id,
+        risky_clauses=risky_clauses,
+        summary_checklist="lorem ipsum dolor sit amet " * 20,
+        analytics=ReviewAnalytics(
+            tokens_used=5000,
+            total_time_taken=10,
+            total_clauses=len(contract.clauses),
+            risky_clauses=len(risky_clauses),
+            total_batches=3,
+            rate_limit_hits=0,
+            average_time_per_batch=3,
+            success_rate=100,
+        ),
+    )
+
+
+async def save_sequentially(
+    repo: ContractRepository,
+    analytics_repo: AnalyticsRepository,
+    contract: Contract,
+    review: ContractReview,
+) -> None:
+    """Save a review as `ContractController` did before upserts."""
+    existing_review = await repo.get_contract_review_by_contract_id(contract.id)
+    if existing_review:
+        review.id = existing_review.id
+        await repo.update_contract_review(review)
+    else:
+        await repo.contract_reviews_collection.insert_one(
+            review.model_dump(by_alias=True)
+        )
+    contract = await repo.update_contract(contract.id, {"has_review": True})
+    await analytics_repo.increment_analytics(
+        contract.uploaded_by,
+        AnalyticsIncrementRequest(
+            contracts_reviewed={review.contract_type: 1},
+            total_clauses=len(contract.clauses),
+            total_risky_clauses=len(review.risky_clauses),
+            total_contracts=1,
+            total_pages=contract.pages,
+            total_tokens_used=review.analytics.tokens_used,
+        ),
+    )
+
+
+async def save_with_upsert(
+    controller: ContractController,
+    contract: Contract,
+    review: ContractReview,
+    include_body: bool,
+) -> None:
+    await controller._save_contract_review(
+        contract=contract,
+        user_id=contract.uploaded_by,
+        payload=ContractReviewCreateRequest(contract_type=review.contract_type),
+        high_risk_clauses=review.risky_clauses,
+        summary_checklist=review.summary_checklist,
+        analytics=review.analytics,
+        include_body=include_body,
+    )
+
+
+async def run_strategy(
+    database, strategy: str, contracts: int, rtt: float
+) -> Dict[str, float]:
+    counter = {"round_trips": 0}
+    collections = {
+        name: RoundTripCollection(database[f"{strategy}_{name}"], counter, rtt)
+        for name in ("contracts", "reviews", "jobs", "bodies", "analytics")
+    }
+    repo = ContractRepository(
+        collections["contracts"],
+        collections["reviews"],
+        collections["jobs"],
+        collections["bodies"],
+    )
+    analytics_repo = AnalyticsRepository(collections["analytics"])
+    await repo.ensure_indexes()
+    await analytics_repo.ensure_indexes()
+    controller = ContractController(
+        contract_repo=repo,
+        analytics_controller=AnalyticsController(analytics_repo),
+        pdf_to_html_engine=PdfPlumberEngine(),
+    )
+
+    user_id = ObjectId()
+    saved = []
+    for _ in range(contracts):
+        contract = Contract(
+            title="Review persistence benchmark",
+            original_html="<p>lorem ipsum</p>",
+            processed_html="<p>lorem ipsum</p>",
+            uploaded_by=user_id,
+            clauses=[
+                Clause(key=f"clause-{number}", content="lorem ipsum dolor sit amet")
+                for number in range(1, CLAUSES_PER_CONTRACT + 1)
+            ],
+            pages=10,
+        )
+        await repo.create_contract(contract)
+        saved.append(contract)
+
+    results = {}
+    # Reviewed first (inserting the review), then re-reviewed (replacing it)
+    for phase in ("review", "re-review"):
+        counter["round_trips"] = 0
+        times: List[float] = []
+        for contract in saved:
+            review = make_review(contract)
+            start = time.perf_counter()
+            if strategy == "sequential":
+                await save_sequentially(repo, analytics_repo, contract, review)
+            else:
+                await save_with_upsert(
+                    controller, contract, review, include_body=strategy == "upsert"
+                )
+            times.append(time.perf_counter() - start)
+        results[phase] = {
+            "round_trips": counter["round_trips"] / contracts,
+            "time": statistics.median(times),
+        }
+    return results
+
+
+async def main(mongodb_url: str, contracts: int, rtt: float) -> None:
+    client = AsyncIOMotorClient(mongodb_url)
+    database = client[DATABASE]
+    try:
+        results = {
+            strategy: await run_strategy(database, strategy, contracts, rtt)
+            for strategy in STRATEGIES
+        }
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+    print(f"{contracts} contracts, {rtt * 1000:.1f} ms per round trip")
+    print(f"{'strategy':<16}{'phase':<11}{'round trips':>13}{'time (ms)':>11}")
+    for strategy, phases in results.items():
+        for phase, result in phases.items():
+            print(
+                f"{strategy:<16}{phase:<11}{result['round_trips']:>13.1f}"
+                f"{result['time'] * 1000:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contracts", type=int, default=50)
+    parser.add_argument(
+        "--rtt-ms",
+        type=float,
+        default=2,
+        help="Simulated network round trip added to each operation.",
+    )
+    parser.add_argument("--mongodb-url", default=str(config.MONGODB_URL))
+    args = parser.parse_args()
+    asyncio.run(main(args.mongodb_url, args.contracts, args.rtt_ms / 1000))
@@ -0,0 +1,234 @@
+"""
+Benchmark the review pipeline end to end against the mock OpenAI server.
+
+Drives `ContractReviewer.create_high_risk_clauses` over synthetic contracts of
+10 to 2000 clauses, and concurrent `explain_clause_stream` calls, against
+`benchmarks.mock_openai_server` for each combination of fault scenario, batch
+size and request concurrency. Reports throughput, batch tail latency and retry
+counts, so that batching, concurrency and retry settings can be tuned without
+calling the live API.
+
+Usage (from the backend directory):
+    python -m benchmarks.review_pipeline [--clauses 10 100 500 2000]
+        [--concurrency 5 20] [--batch-size 0 25] [--scenario clean throttled]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+
+from app.contract.contract_models import Clause, Contract, ContractType, TokenUsage
+from app.contract.contract_review import ContractReviewer
+from app.shared.models.mongodb_models import PyObjectId
+from benchmarks.batch_planning import _clause
+from benchmarks.mock_openai_server import MockOpenAIServer, MockOpenAISettings
+from core.config import config
+from core.http_client.session import close_http_session
+from core.rate_limiter import InMemoryRateLimiter
+
+SCENARIOS: Dict[str, MockOpenAISettings] = {
+    "clean": MockOpenAISettings(seed=7),
+    "throttled": MockOpenAISettings(rate_limit_ratio=0.1, retry_after=0.5, seed=7),
+    "malformed": MockOpenAISettings(malformed_ratio=0.1, seed=7),
+    "slow_tail": MockOpenAISettings(latency_spread=1.2, seed=7),
+}
+
+
+def make_contract(clauses: int, seed: int = 7) -> Contract:
+    rng = random.Random(seed)
+    return Contract(
+        title=f"synthetic_{clauses}",
+        processed_html="",
+        original_html="",
+        uploaded_by=PyObjectId(),
+        clauses=[_clause(rng, i, rng.randint(1, 4)) for i in range(1, clauses + 1)],
+        pages=None,
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round((len(values) - 1) * fraction)))]
+
+
+def make_reviewer(concurrency: int, retry_delay: float) -> ContractReviewer:
+    reviewer = ContractReviewer(
+        # Only the mock server's 429s throttle the benchmark
+        rate_limiter=InMemoryRateLimiter(
+            requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000
+        ),
+        timeout=600,
+    )
+    reviewer.max_concurrent_requests = concurrency
+    reviewer.batch_retry_delay = retry_delay
+    return reviewer
+
+
+async def bench_review(
+    contract: Contract,
+    batch_size: Optional[int],
+    concurrency: int,
+    retry_delay: float,
+) -> Dict[str, float]:
+    reviewer = make_reviewer(concurrency, retry_delay)
+    start = time.perf_counter()
+    result = await reviewer.create_high_risk_clauses(
+        contract, ContractType.OTHER, batch_size=batch_size
+    )
+    wall_time = time.perf_counter() - start
+
+    batches = result.batches
+    latencies = [batch.latency for batch in batches if batch.succeeded]
+    attempts = sum(batch.attempts for batch in batches)
+    return {
+        "batches": len(batches),
+        "wall_time": wall_time,
+        "throughput": len(contract.clauses) / wall_time,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "retries": attempts - len(batches),
+        "rate_limited": sum(batch.rate_limit_hits for batch in batches),
+        "parse_failures": sum(batch.parse_failures for batch in batches),
+        "failed": sum(not batch.succeeded for batch in batches),
+        "tokens": result.analytics.tokens_used,
+    }
+
+
+async def bench_explanations(
+    contract: Contract, explanations: int, concurrency: int
+) -> Dict[str, float]:
+    reviewer = make_reviewer(concurrency, retry_delay=0)
+    semaphore = asyncio.Semaphore(concurrency)
+    first_chunk_times, total_times, usage = [], [], TokenUsage()
+    errors = 0
+
+    async def explain(clause: Clause) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            first_chunk_time = None
+            try:
+                async for _ in reviewer.explain_clause_stream(
+                    clause.content, ContractType.OTHER, usage=usage
+                ):
+                    if first_chunk_time is None:
+                        first_chunk_time = time.perf_counter() - start
+            except Exception:
+                errors += 1
+                return
+            first_chunk_times.append(first_chunk_time or 0.0)
+            total_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(explain(clause) for clause in contract.clauses[:explanations])
+    )
+    wall_time = time.perf_counter() - start
+
+    return {
+        "wall_time": wall_time,
+        "throughput": len(total_times) / wall_time,
+        "ttfc_p50": percentile(first_chunk_times, 0.50),
+        "ttfc_p95": percentile(first_chunk_times, 0.95),
+        "p50": percentile(total_times, 0.50),
+        "p95": percentile(total_times, 0.95),
+        "errors": errors,
+        "tokens": usage.total_tokens,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = MockOpenAIServer()
+    config.OPENAI_API_BASE_URL = await server.start()
+    contracts = {clauses: make_contract(clauses) for clauses in args.clauses}
+
+    try:
+        print("Clause review (create_high_risk_clauses)")
+        print(
+            f"{'scenario':<11}{'clauses':>8}{'batch':>7}{'conc':>6}{'batches':>9}"
+            f"{'wall (s)':>10}{'cl/s':>8}{'p50 (s)':>9}{'p95 (s)':>9}{'p99 (s)':>9}"
+            f"{'retries':>9}{'429s':>6}{'parse':>7}{'failed':>8}{'tokens':>9}"
+        )
+        for scenario in args.scenario:
+            server.settings = SCENARIOS[scenario]
+            server.rng = random.Random(server.settings.seed)
+            for clauses, contract in contracts.items():
+                for batch_size in args.batch_size:
+                    for concurrency in args.concurrency:
+                        result = await bench_review(
+                            contract, batch_size or None, concurrency, args.retry_delay
+                        )
+                        print(
+                            f"{scenario:<11}{clauses:>8}{batch_size or 'auto':>7}"
+                            f"{concurrency:>6}{result['batches']:>9}"
+                            f"{result['wall_time']:>10.2f}{result['throughput']:>8.1f}"
+                            f"{result['p50']:>9.2f}{result['p95']:>9.2f}"
+                            f"{result['p99']:>9.2f}{result['retries']:>9}"
+                            f"{result['rate_limited']:>6}{result['parse_failures']:>7}"
+                            f"{result['failed']:>8}{result['tokens']:>9}"
+                        )
+
+        print()
+        print(f"Clause explanations (explain_clause_stream, {args.explanations} calls)")
+        print(
+            f"{'scenario':<11}{'conc':>6}{'wall (s)':>10}{'req/s':>8}"
+            f"{'ttfc p50':>10}{'ttfc p95':>10}{'p50 (s)':>9}{'p95 (s)':>9}"
+            f"{'errors':>8}{'tokens':>9}"
+        )
+        contract = make_contract(args.explanations)
+        for scenario in args.scenario:
+            server.settings = SCENARIOS[scenario]
+            server.rng = random.Random(server.settings.seed)
+            for concurrency in args.concurrency:
+                result = await bench_explanations(
+                    contract, args.explanations, concurrency
+                )
+                print(
+                    f"{scenario:<11}{concurrency:>6}{result['wall_time']:>10.2f}"
+                    f"{result['throughput']:>8.1f}{result['ttfc_p50']:>10.2f}"
+                    f"{result['ttfc_p95']:>10.2f}{result['p50']:>9.2f}"
+                    f"{result['p95']:>9.2f}{result['errors']:>8}{result['tokens']:>9}"
+                )
+    finally:
+        await close_http_session()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clauses", type=int, nargs="+", default=[10, 100, 500, 2000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 20])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        nargs="+",
+        default=[0, 25],
+        help="Maximum clauses per batch; 0 sizes batches by token budget only.",
+    )
+    parser.add_argument(
+        "--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=2,
+        help="Seconds between batch attempts, multiplied by the attempt number.",
+    )
+    parser.add_argument("--explanations", type=int, default=50)
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show the reviewer's warnings and errors.",
+    )
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Injected faults are logged by the reviewer, with the full responses
+        logging.getLogger("app").setLevel(logging.CRITICAL)
+    asyncio.run(main(args))
@@ -0,0 +1,102 @@
+"""
+Benchmark how much of the summary checklist generation overlaps the clause batches.
+
+Runs the real review pipeline (`ContractReviewer.stream_high_risk_clauses`) with
+simulated LLM latencies for the batches and the summary, and reports the phase
+timings recorded in `ReviewAnalytics`. With the summary generated concurrently,
+the total review time approaches max(batches, summary) rather than their sum.
+
+Usage (from the backend directory):
+    python -m benchmarks.summary_overlap [--time-scale 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+
+from app.contract.contract_models import Clause, Contract, ContractType
+from app.contract.contract_review import ContractReviewer
+from app.shared.models.mongodb_models import PyObjectId
+from core.http_client.session import close_http_session
+from core.rate_limiter import InMemoryRateLimiter
+
+# Simulated latency model (seconds)
+BATCH_LATENCY = (4.0, 9.0)
+SUMMARY_LATENCY = 12.0
+
+
+class SimulatedContractReviewer(ContractReviewer):
+    def __init__(self, time_scale: float):
+        super().__init__(
+            rate_limiter=InMemoryRateLimiter(
+                requests_per_minute=10_000, tokens_per_minute=10_000_000
+            )
+        )
+        self.time_scale = time_scale
+        self.rng = random.Random(7)
+
+    async def process_batch(
+        self,
+        session,
+        system_prompt,
+        batch,
+        contract_type,
+        batch_number,
+        batch_record=None,
+    ):
+        await asyncio.sleep(self.rng.uniform(*BATCH_LATENCY) * self.time_scale)
+        return [], 0, len(batch)
+
+    async def generate_summary_checklist(self, contract: Contract, usage=None) -> str:
+        await asyncio.sleep(SUMMARY_LATENCY * self.time_scale)
+        return "summary"
+
+
+def make_contract(clauses: int) -> Contract:
+    return Contract(
+        title=f"contract_{clauses}",
+        processed_html="",
+        original_html="",
+        uploaded_by=PyObjectId(),
+        clauses=[
+            Clause(key=f"clause-{i}", content=f"The provider shall deliver item {i}.")
+            for i in range(1, clauses + 1)
+        ],
+        pages=None,
+    )
+
+
+async def main(time_scale: float) -> None:
+    print(
+        f"{'clauses':>8}{'batches':>9}{'batches (s)':>13}{'summary (s)':>13}"
+        f"{'overlap (s)':>13}{'sequential (s)':>16}{'total (s)':>11}"
+    )
+    try:
+        for clauses in (25, 100, 400, 1000):
+            reviewer = SimulatedContractReviewer(time_scale)
+            result = await reviewer.create_high_risk_clauses(
+                make_contract(clauses), ContractType.OTHER
+            )
+            analytics = result.analytics
+            print(
+                f"{clauses:>8}{analytics.total_batches:>9}"
+                f"{analytics.batches_time / time_scale:>13.2f}"
+                f"{analytics.summary_time / time_scale:>13.2f}"
+                f"{analytics.summary_overlap_time / time_scale:>13.2f}"
+                f"{(analytics.batches_time + analytics.summary_time) / time_scale:>16.2f}"
+                f"{analytics.total_time_taken / time_scale:>11.2f}"
+            )
+    finally:
+        await close_http_session()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.01,
+        help="Factor applied to simulated latencies (reported times are unscaled).",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.time_scale))
@@ -0,0 +1,187 @@
+"""
+Benchmark the peak memory of contract uploads, read at once or spooled.
+
+Sends multipart uploads of 1 to 45 MiB straight to a minimal FastAPI app (no
+sockets, with the body generated chunk by chunk so that the client holds no
+copy of it), and reports the peak memory (tracemalloc) of handling them:
+
+- read: the upload is read with `await file.read()` and hashed, as the
+  upload endpoint did before uploads were spooled.
+- spooled: the upload, spooled to disk by Starlette beyond 1 MiB, is hashed in
+  place in chunks by `ContractUpload`.
+
+Also checks that both return the same SHA-256 digest, and that an upload over
+the maximum size is rejected with a 413 before its body is read in full.
+
+Usage (from the backend directory):
+    python -m benchmarks.upload_memory [--sizes 1 5 20 45] [--concurrency 1 4]
+"""
+
+import argparse
+import asyncio
+import gc
+import hashlib
+import time
+import tracemalloc
+from typing import Dict, List
+
+from fastapi import FastAPI, File, UploadFile
+
+from app.contract.contract_upload import ContractUpload
+from core.config import config
+from core.middlewares import RequestSizeLimitMiddleware
+
+MODES = ["read", "spooled"]
+BOUNDARY = "benchmark-boundary"
+BLOCK = bytes(range(256)) * 256  # 64 KiB
+
+
+def make_app() -> RequestSizeLimitMiddleware:
+    app = FastAPI()
+
+    @app.post("/read")
+    async def read(file: UploadFile = File(...)) -> dict:
+        content = await file.read()
+        return {"sha256": hashlib.sha256(content).hexdigest(), "size": len(content)}
+
+    @app.post("/spooled")
+    async def spooled(file: UploadFile = File(...)) -> dict:
+        upload = await ContractUpload.from_upload_file(file)
+        try:
+            return {"sha256": upload.sha256, "size": upload.size}
+        finally:
+            upload.close()
+
+    return RequestSizeLimitMiddleware(
+        app, max_body_size=config.UPLOAD_MAX_BYTES + 1024 * 1024
+    )
+
+
+def expected_digest(size: int) -> str:
+    digest = hashlib.sha256()
+    for start in range(0, size, len(BLOCK)):
+        digest.update(BLOCK[: size - start])
+    return digest.hexdigest()
+
+
+async def post(app, path: str, size: int) -> dict:
+    """Send a multipart upload of `size` bytes, returning the response."""
+    head = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="contract.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    def chunks():
+        yield head
+        for start in range(0, size, len(BLOCK)):
+            yield BLOCK[: size - start]
+        yield tail
+
+    body = chunks()
+    body_bytes = len(head) + size + len(tail)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+            (b"content-length", str(body_bytes).encode()),
+        ],
+    }
+    pending = [next(body)]
+
+    async def receive() -> dict:
+        chunk = pending.pop() if pending else next(body, b"")
+        following = next(body, None)
+        if following is not None:
+            pending.append(following)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pending)}
+
+    response: Dict[str, object] = {"body": b"", "unread": 0}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    response["unread"] = sum(len(chunk) for chunk in pending) + sum(
+        len(chunk) for chunk in body
+    )
+    return response
+
+
+def measure(app, mode: str, size: int, concurrency: int) -> Dict[str, object]:
+    async def run() -> List[dict]:
+        return await asyncio.gather(
+            *(post(app, f"/{mode}", size) for _ in range(concurrency))
+        )
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        responses = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    digest = expected_digest(size)
+    return {
+        "time": elapsed,
+        "peak": peak,
+        "ok": all(
+            r["status"] == 200 and f'"sha256":"{digest}"'.encode() in r["body"]
+            for r in responses
+        ),
+    }
+
+
+def main(sizes: List[int], concurrency_levels: List[int], modes: List[str]) -> None:
+    app = make_app()
+    print(f"Hashed in {config.UPLOAD_CHUNK_BYTES / 2**20:.0f} MiB chunks")
+    print(
+        f"{'size (MiB)':>11}{'uploads':>9}{'mode':>9}{'time (s)':>10}"
+        f"{'peak (MiB)':>12}{'per upload':>12}{'digest':>8}"
+    )
+    for size_mib in sizes:
+        for concurrency in concurrency_levels:
+            for mode in modes:
+                result = measure(app, mode, size_mib * 2**20, concurrency)
+                print(
+                    f"{size_mib:>11}{concurrency:>9}{mode:>9}{result['time']:>10.2f}"
+                    f"{result['peak'] / 2**20:>12.1f}"
+                    f"{result['peak'] / concurrency / 2**20:>12.1f}"
+                    f"{'ok' if result['ok'] else 'WRONG':>8}"
+                )
+
+    oversized = config.UPLOAD_MAX_BYTES + 2 * 1024 * 1024
+    response = asyncio.run(post(app, "/spooled", oversized))
+    print(
+        f"Upload of {oversized / 2**20:.0f} MiB (maximum "
+        f"{config.UPLOAD_MAX_BYTES / 2**20:.0f} MiB): {response['status']}, "
+        f"{response['unread'] / 2**20:.0f} MiB of the body left unread"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 5, 20, 45], help="In MiB."
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--mode", nargs="+", choices=MODES, default=MODES)
+    args = parser.parse_args()
+    main(args.sizes, args.concurrency, args.mode)
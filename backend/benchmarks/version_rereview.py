@@ -0,0 +1,137 @@
+"""
+Benchmark incremental re-review of new contract versions against full re-review.
+
+Makes redlines of synthetic contracts (a share of clauses modified, some
+added and removed, and the following clauses renumbered), diffs each against
+its previous version and plans the review batches of the new version:
+
+- full: every clause is sent to the LLM again.
+- incremental: only added and modified clauses are sent, and the results
+  of unchanged clauses are carried over from the previous version's review.
+
+Reports the diff time, the clauses, requests and prompt tokens sent, and the
+wall time against the simulated LLM of `benchmarks.batch_planning`.
+
+Usage (from the backend directory):
+    python -m benchmarks.version_rereview [--clauses 200 1000]
+        [--changed 0.05 0.2] [--time-scale 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from app.contract.contract_batch_planner import ClauseBatchPlanner
+from app.contract.contract_clause_diff import diff_clauses
+from app.contract.contract_models import Clause
+from benchmarks.batch_planning import (
+    FIXED_PROMPT_TOKENS,
+    MODEL,
+    _sentence,
+    simulate,
+)
+
+
+def make_contract(rng: random.Random, clauses: int) -> List[Clause]:
+    return [
+        Clause(
+            key=f"clause-{number}",
+            content=f"{number}. "
+            + " ".join(
+                _sentence(rng, rng.randint(12, 24)) for _ in range(rng.randint(1, 6))
+            ),
+        )
+        for number in range(1, clauses + 1)
+    ]
+
+
+def make_redline(
+    rng: random.Random, clauses: List[Clause], changed: float
+) -> List[Clause]:
+    """
+    A new version with `changed` of the clauses edited, added or removed
+    (in equal parts), numbered again.
+    """
+    texts = [clause.content.split(" ", 1)[1] for clause in clauses]
+    changes = max(1, round(len(texts) * changed))
+    for _ in range(changes):
+        kind = rng.choice(["edit", "add", "remove"])
+        position = rng.randrange(len(texts))
+        if kind == "edit":
+            words = texts[position].split()
+            words[rng.randrange(len(words))] = "amended"
+            texts[position] = " ".join(words) + " " + _sentence(rng, 8)
+        elif kind == "add":
+            texts.insert(position, _sentence(rng, rng.randint(12, 24)))
+        elif len(texts) > 1:
+            del texts[position]
+    return [
+        Clause(key=f"clause-{number}", content=f"{number}. {text}")
+        for number, text in enumerate(texts, start=1)
+    ]
+
+
+async def main(clause_counts: List[int], changed_shares: List[float], scale: float):
+    planner = ClauseBatchPlanner(
+        model=MODEL,
+        prompt_token_budget=6000,
+        completion_token_budget=3000,
+        completion_tokens_per_clause=60,
+    )
+    fixed_prompt = "x" * (FIXED_PROMPT_TOKENS * ClauseBatchPlanner.CHARS_PER_TOKEN)
+
+    print(
+        f"{'clauses':>8}{'changed':>9}{'diff (ms)':>11}{'strategy':>13}"
+        f"{'sent':>6}{'requests':>10}{'tokens':>9}{'wall (s)':>10}"
+    )
+    for clause_count in clause_counts:
+        for changed in changed_shares:
+            rng = random.Random(clause_count)
+            previous = make_contract(rng, clause_count)
+            current = make_redline(rng, previous, changed)
+
+            diff_start = time.perf_counter()
+            clause_diff = diff_clauses(previous, current)
+            diff_time = (time.perf_counter() - diff_start) * 1000
+
+            strategies = {
+                "full": current,
+                "incremental": [
+                    clause
+                    for clause in current
+                    if clause.key not in clause_diff.unchanged
+                ],
+            }
+            for strategy, clauses in strategies.items():
+                batches = planner.plan(clauses, fixed_prompt)
+                result = await simulate(batches, planner.count_tokens, scale)
+                tokens = sum(
+                    FIXED_PROMPT_TOKENS
+                    + sum(
+                        planner.count_tokens(clause.content)
+                        + ClauseBatchPlanner.CLAUSE_FRAMING_TOKENS
+                        for clause in batch
+                    )
+                    for batch in batches
+                )
+                print(
+                    f"{clause_count:>8}{changed:>9.0%}{diff_time:>11.1f}"
+                    f"{strategy:>13}{len(clauses):>6}{result['requests']:>10}"
+                    f"{tokens:>9}{result['wall_time']:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clauses", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--changed", type=float, nargs="+", default=[0.05, 0.2])
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.01,
+        help="Factor applied to simulated latencies (reported times are unscaled).",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.clauses, args.changed, args.time_scale))
@@ -1,11 +1,13 @@
 from .cache_manager import Cache
 from .cache_tag import CacheTag
 from .custom_key_maker import CustomKeyMaker
+from .mongo_backend import MongoBackend
 from .redis_backend import RedisBackend
 
 __all__ = [
     "Cache",
     "RedisBackend",
+    "MongoBackend",
     "CustomKeyMaker",
     "CacheTag",
 ]
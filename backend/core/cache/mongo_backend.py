@@ -0,0 +1,62 @@
+import pickle
+import re
+from datetime import timedelta
+from typing import Any
+
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from core.cache.base import BaseBackend
+from core.utils.datetime import utcnow
+
+
+class MongoBackend(BaseBackend):
+    """
+    Cache backend storing entries in a MongoDB collection.
+
+    Expiry is handled by a TTL index on `expires_at`, so MongoDB evicts stale
+    entries in the background without any extra bookkeeping.
+    """
+
+    # Collections whose TTL index has already been ensured by this process
+    _indexed_collections: set = set()
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def _ensure_ttl_index(self) -> None:
+        if self.collection.full_name in self._indexed_collections:
+            return
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self._indexed_collections.add(self.collection.full_name)
+
+    async def get(self, key: str) -> Any:
+        result = await self.collection.find_one(
+            {"_id": key, "expires_at": {"$gt": utcnow()}}
+        )
+        if not result:
+            return
+
+        if result.get("pickled"):
+            return pickle.loads(result["value"])
+        return result["value"]
+
+    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
+        await self._ensure_ttl_index()
+
+        pickled = not isinstance(response, dict)
+        value = Binary(pickle.dumps(response)) if pickled else response
+
+        await self.collection.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "value": value,
+                "pickled": pickled,
+                "expires_at": utcnow() + timedelta(seconds=ttl),
+            },
+            upsert=True,
+        )
+
+    async def delete_startswith(self, value: str) -> None:
+        await self.collection.delete_many({"_id": {"$regex": f"^{re.escape(value)}::"}})
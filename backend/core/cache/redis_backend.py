@@ -2,7 +2,7 @@ import pickle
 from typing import Any
 
 import ujson
-from redis import from_url
+from redis.asyncio import from_url
 
 from core.cache.base import BaseBackend
 from core.config import config
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import ClassVar
+from typing import ClassVar, Optional
 
 import convertapi
 import openai
@@ -18,8 +18,11 @@ class EnvironmentType(str, Enum):
 class MongoDBCollections(BaseSettings):
     USERS: str = "users"
     CONTRACTS: str = "contracts"
+    CONTRACT_BODIES: str = "contract_bodies"
     CONTRACT_REVIEWS: str = "contract_reviews"
     ANALYTICS: str = "analytics"
+    CLAUSE_REVIEW_CACHE: str = "clause_review_cache"
+    CONTRACT_REVIEW_JOBS: str = "contract_review_jobs"
 
 
 class MongoDBDatabase(BaseSettings):
@@ -47,11 +50,78 @@ class Config(BaseConfig):
     # Database
     MONGODB_URL: str = get_base_secrets().MONGODB_URL
     REDIS_URL: str = "redis://localhost:6379/7"
+    # Create the indexes repositories declare when the API process starts.
+    # The Lambda handler skips startup, so deployments run `make db-indexes`
+    MONGODB_ENSURE_INDEXES: bool = True
 
     # EXTERNAL SERVICES
     OPENAI_API_KEY: str = get_base_secrets().OPENAI_API_KEY
+    OPENAI_API_BASE_URL: str = "https://api.openai.com/v1"  # Or a local mock server
     CONVERT_API_SECRET: str = get_base_secrets().CONVERT_API_SECRET
 
+    # OpenAI HTTP connection pool
+    OPENAI_HTTP_POOL_LIMIT: int = 100
+    OPENAI_HTTP_POOL_LIMIT_PER_HOST: int = 20
+    OPENAI_HTTP_KEEPALIVE_TIMEOUT: float = 60
+    OPENAI_HTTP_DNS_CACHE_TTL: int = 300  # 0 disables DNS caching
+    OPENAI_HTTP_CONNECT_TIMEOUT: float = 10
+
+    # OpenAI rate limits (refined at runtime from the x-ratelimit-* headers)
+    OPENAI_RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis"
+    OPENAI_REQUESTS_PER_MINUTE: int = 3500
+    OPENAI_TOKENS_PER_MINUTE: int = 160000
+
+    # Contract uploads
+    UPLOAD_MAX_BYTES: int = 50 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024  # Read and hashed at a time
+    # Reuse the HTML and clauses of an earlier upload of the same PDF
+    UPLOAD_DEDUP_ENABLED: bool = True
+    PDF_TO_HTML_ENGINE: str = "convertapi"  # "convertapi" or "pdfplumber" (local)
+    CLAUSE_MARKER: str = "streaming"  # "streaming" or "soup" (BeautifulSoup)
+    # PDF parsing and clause marking run in processes (None for one per
+    # available CPU, 0 runs them in threads), blocking network calls
+    # (ConvertAPI) in threads
+    INGESTION_PROCESS_WORKERS: Optional[int] = None
+    INGESTION_THREAD_WORKERS: int = 8
+    INGESTION_MAX_PENDING: int = 8  # Uploads processed at once; others wait
+    INGESTION_ADMISSION_TIMEOUT: float = 30  # Seconds to wait before a 503
+    # Large PDFs are split into page ranges of at least this many pages,
+    # extracted in parallel by the process workers
+    INGESTION_MIN_PAGES_PER_RANGE: int = 25
+
+    # Contract bodies (HTML) are compressed, and processed HTML stored as a
+    # patch over the original HTML
+    CONTRACT_BODY_CODEC: str = "gzip"  # "gzip", "zstd" (needs zstandard) or "none"
+    CONTRACT_BODY_MIN_COMPRESS_BYTES: int = 1024  # Smaller HTML is stored as is
+    CONTRACT_BODY_HTML_PATCH: bool = True
+
+    # Contract listings (pages continue from the X-Next-Cursor header)
+    CONTRACT_LIST_DEFAULT_LIMIT: int = 100
+    CONTRACT_LIST_MAX_LIMIT: int = 500
+
+    # Contract reviews
+    REVIEW_TIMEOUT: int = 60  # Synchronous reviews (same as the lambda timeout)
+    REVIEW_JOB_TIMEOUT: int = 60 * 14  # Background review jobs
+    REVIEW_JOB_QUEUE_BACKEND: str = "mongodb"  # "mongodb" or "in_process"
+    REVIEW_JOB_WORKER_CONCURRENCY: int = 2
+    REVIEW_JOB_LEASE_SECONDS: int = 60 * 5
+    REVIEW_JOB_MAX_ATTEMPTS: int = 3
+    REVIEW_JOB_POLL_INTERVAL: float = 2
+
+    # Clause review cache
+    CLAUSE_REVIEW_CACHE_ENABLED: bool = True
+    CLAUSE_REVIEW_CACHE_BACKEND: str = "mongodb"  # "mongodb" or "redis"
+    CLAUSE_REVIEW_CACHE_TTL: int = 60 * 60 * 24 * 30
+
+    # Clause review batching (token budgets per LLM request)
+    REVIEW_BATCH_PROMPT_TOKEN_BUDGET: int = 6000
+    REVIEW_BATCH_COMPLETION_TOKEN_BUDGET: int = 3000
+    REVIEW_COMPLETION_TOKENS_PER_CLAUSE: int = 60
+    # Keep the clauses of a section in the same request (with a clause index)
+    REVIEW_BATCH_BY_SECTION: bool = True
+    # Clause digest the summary checklist is generated from
+    REVIEW_SUMMARY_DIGEST_TOKEN_BUDGET: int = 4000
+
     # MongoDB Databases and Collections
     MONGODB_COLLECTIONS: ClassVar[MongoDBCollections] = MongoDBCollections()
     MONGODB_DATABASES: ClassVar[MongoDBDatabase] = MongoDBDatabase()
@@ -0,0 +1,110 @@
+import gzip
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type, Union
+
+from bson import Binary
+
+from core.config import config
+
+
+class BaseTextCodec(ABC):
+    """
+    Compresses text stored in MongoDB.
+    """
+
+    name: str
+
+    @abstractmethod
+    def encode(self, text: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> str:
+        pass
+
+
+class IdentityCodec(BaseTextCodec):
+    name = "none"
+
+    def encode(self, text: str) -> bytes:
+        return text.encode()
+
+    def decode(self, data: bytes) -> str:
+        return data.decode()
+
+
+class GzipCodec(BaseTextCodec):
+    name = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def encode(self, text: str) -> bytes:
+        # mtime=0 so that the same text is always encoded the same way
+        return gzip.compress(text.encode(), compresslevel=self.level, mtime=0)
+
+    def decode(self, data: bytes) -> str:
+        return gzip.decompress(data).decode()
+
+
+class ZstdCodec(BaseTextCodec):
+    """
+    Faster than gzip at a similar ratio, but needs the `zstandard` package.
+    """
+
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        import zstandard
+
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, text: str) -> bytes:
+        return self.compressor.compress(text.encode())
+
+    def decode(self, data: bytes) -> str:
+        return self.decompressor.decompress(data).decode()
+
+
+TEXT_CODECS: Dict[str, Type[BaseTextCodec]] = {
+    IdentityCodec.name: IdentityCodec,
+    GzipCodec.name: GzipCodec,
+    ZstdCodec.name: ZstdCodec,
+}
+
+
+def get_text_codec(name: Optional[str] = None) -> BaseTextCodec:
+    """
+    Return the text codec with the given name, or the one selected by
+    `CONTRACT_BODY_CODEC`.
+    """
+    name = name or config.CONTRACT_BODY_CODEC
+    try:
+        return TEXT_CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown text codec: {name}") from None
+
+
+def encode_text(
+    text: str, codec: BaseTextCodec, min_bytes: int = 0
+) -> Union[str, dict]:
+    """
+    Encode text for storage: texts of at least `min_bytes` (UTF-8) are
+    compressed into `{"codec": ..., "data": ...}`, naming their codec so that
+    they can be decoded whatever codec is configured later. Smaller texts,
+    and all texts with the "none" codec, are stored as they are.
+    """
+    data = text.encode()
+    if codec.name == IdentityCodec.name or len(data) < min_bytes:
+        return text
+    return {"codec": codec.name, "data": Binary(codec.encode(text))}
+
+
+def decode_text(value: Union[str, dict]) -> str:
+    """
+    Decode text stored by `encode_text` (or stored as is before it).
+    """
+    if isinstance(value, str):
+        return value
+    return get_text_codec(value["codec"]).decode(value["data"])
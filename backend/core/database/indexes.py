@@ -0,0 +1,92 @@
+import logging
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from pymongo import IndexModel
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoryQuery(BaseModel):
+    """
+    A query a repository runs, with sample values, whose plan is checked to
+    use an index.
+    """
+
+    name: str
+    collection: str  # The repository attribute holding the collection
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+
+
+class QueryPlan(BaseModel):
+    repository: str
+    query: str
+    stages: List[str]  # Of the winning plan, outermost first
+
+    @property
+    def is_collection_scan(self) -> bool:
+        return "COLLSCAN" in self.stages
+
+
+class IndexedRepository:
+    """
+    Mixin for repositories declaring the indexes their queries need.
+
+    `INDEXES` maps the attribute of each collection to its indexes, which
+    `ensure_indexes` creates (doing nothing for indexes that already exist).
+    `QUERIES` lists the repository's queries, which `explain_queries` checks
+    against the database.
+    """
+
+    INDEXES: ClassVar[Dict[str, List[IndexModel]]] = {}
+    QUERIES: ClassVar[List[RepositoryQuery]] = []
+
+    async def ensure_indexes(self) -> List[str]:
+        """
+        Create the declared indexes that do not exist yet.
+
+        Returns:
+            List[str]: The names of the declared indexes.
+        """
+        names = []
+        for attribute, indexes in self.INDEXES.items():
+            collection = getattr(self, attribute)
+            names += await collection.create_indexes(indexes)
+            logger.info(
+                f"Ensured the indexes of {collection.full_name}: "
+                f"{', '.join(index.document['name'] for index in indexes)}"
+            )
+        return names
+
+    async def explain_queries(self) -> List[QueryPlan]:
+        """
+        Explain the declared queries, returning the stages of their plans.
+        """
+        plans = []
+        for query in self.QUERIES:
+            cursor = getattr(self, query.collection).find(query.filter)
+            if query.sort:
+                cursor = cursor.sort(query.sort)
+            explanation = await cursor.explain()
+            plans.append(
+                QueryPlan(
+                    repository=type(self).__name__,
+                    query=query.name,
+                    stages=_plan_stages(explanation["queryPlanner"]["winningPlan"]),
+                )
+            )
+        return plans
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """The stages of a query plan (classic or slot-based), outermost first."""
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in _plan_stages(item)]
+    if not isinstance(plan, dict):
+        return []
+    stages = [plan["stage"]] if isinstance(plan.get("stage"), str) else []
+    for key, value in plan.items():
+        if key != "stage":
+            stages += _plan_stages(value)
+    return stages
@@ -0,0 +1,52 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, id: ObjectId) -> str:
+    """
+    Encode the sort key of the last document of a page as an opaque
+    continuation token.
+    """
+    payload = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a continuation token from `encode_cursor`.
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), ObjectId(id)
+    except (binascii.Error, InvalidId, TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid pagination cursor.") from e
+
+
+def after_cursor(cursor: str) -> dict:
+    """
+    The filter for the documents after a continuation token, in descending
+    `(created_at, _id)` order. With an index on the filtered fields followed
+    by `created_at` and `_id`, MongoDB seeks straight to them rather than
+    skipping the earlier pages.
+    """
+    created_at, id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": id}},
+        ]
+    }
@@ -0,0 +1,15 @@
+from .ingestion_executor import (
+    IngestionExecutor,
+    IngestionExecutorBusy,
+    available_cpus,
+    get_ingestion_executor,
+    shutdown_ingestion_executor,
+)
+
+__all__ = [
+    "IngestionExecutor",
+    "IngestionExecutorBusy",
+    "available_cpus",
+    "get_ingestion_executor",
+    "shutdown_ingestion_executor",
+]
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Callable, Optional, TypeVar
+
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class IngestionExecutorBusy(Exception):
+    """Raised when no ingestion slot frees up within the admission timeout."""
+
+
+class IngestionExecutor:
+    """
+    Runs the blocking stages of contract ingestion off the event loop.
+
+    CPU-bound stages (PDF parsing, clause marking) run in a process pool, so
+    that they neither block the event loop nor hold its GIL, and blocking
+    network calls run in a thread pool. With no process workers, CPU-bound
+    stages run in the thread pool too.
+
+    At most `max_pending` ingestions are admitted at once. Others wait for a
+    slot for up to `admission_timeout` seconds, after which they are rejected,
+    rather than piling more work (and PDF bytes) onto saturated pools.
+    """
+
+    def __init__(
+        self,
+        process_workers: int,
+        thread_workers: int,
+        max_pending: int,
+        admission_timeout: float,
+    ):
+        self.process_workers = process_workers
+        self.thread_workers = thread_workers
+        self.max_pending = max_pending
+        self.admission_timeout = admission_timeout
+        self.pending = 0  # Admitted ingestions
+        self.waiting = 0  # Ingestions waiting for a slot
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[float]:
+        """
+        Wait for an ingestion slot, yielding the seconds spent waiting.
+
+        Raises:
+            IngestionExecutorBusy: If no slot frees up in time.
+        """
+        slots = self._get_slots()
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.admission_timeout)
+        except asyncio.TimeoutError:
+            raise IngestionExecutorBusy(
+                f"No ingestion slot freed up in {self.admission_timeout}s "
+                f"({self.pending} ingestions running, {self.waiting - 1} waiting)"
+            ) from None
+        finally:
+            self.waiting -= 1
+
+        self.pending += 1
+        try:
+            yield time.perf_counter() - start
+        finally:
+            self.pending -= 1
+            slots.release()
+
+    async def run_cpu(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a CPU-bound function in the process pool. The function and its
+        arguments must be picklable.
+        """
+        if not self.process_workers:
+            return await self.run_io(func, *args)
+
+        pool = self._get_process_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, partial(func, *args)
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for running out of memory on a huge
+            # PDF), which breaks the whole pool; start a new one for later calls
+            logger.error("Ingestion process pool broke, starting a new one")
+            if self._process_pool is pool:
+                self._process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    async def run_io(self, func: Callable[..., T], *args) -> T:
+        """Run a blocking (network-bound) function in the thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_thread_pool(), partial(func, *args)
+        )
+
+    def shutdown(self) -> None:
+        """Shut down the pools, cancelling work that has not started."""
+        for pool in (self._process_pool, self._thread_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._process_pool = None
+        self._thread_pool = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores belong to the event loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._loop = loop
+        return self._slots
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers, thread_name_prefix="ingestion"
+            )
+        return self._thread_pool
+
+
+class IngestionExecutorHolder:
+    executor: IngestionExecutor = None
+
+
+ingestion_executor = IngestionExecutorHolder()
+
+
+def available_cpus() -> int:
+    """The number of CPUs this process may run on (e.g. within a container)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS and Windows
+        return os.cpu_count() or 1
+
+
+def get_ingestion_executor() -> IngestionExecutor:
+    """
+    Return the process-wide ingestion executor, creating it on first use.
+
+    On AWS Lambda, which has no /dev/shm for the process pool's semaphores,
+    CPU-bound stages run in the thread pool.
+    """
+    if ingestion_executor.executor is None:
+        process_workers = config.INGESTION_PROCESS_WORKERS
+        if process_workers is None:
+            process_workers = available_cpus()
+        if process_workers and os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+            process_workers = 0
+        ingestion_executor.executor = IngestionExecutor(
+            process_workers=process_workers,
+            thread_workers=config.INGESTION_THREAD_WORKERS,
+            max_pending=config.INGESTION_MAX_PENDING,
+            admission_timeout=config.INGESTION_ADMISSION_TIMEOUT,
+        )
+    return ingestion_executor.executor
+
+
+def shutdown_ingestion_executor() -> None:
+    """Shut down the process-wide ingestion executor's pools."""
+    if ingestion_executor.executor is not None:
+        ingestion_executor.executor.shutdown()
+    ingestion_executor.executor = None
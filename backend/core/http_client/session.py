@@ -0,0 +1,58 @@
+import asyncio
+
+import aiohttp
+
+from core.config import config
+
+
+class HTTPClient:
+    session: aiohttp.ClientSession = None
+    loop: asyncio.AbstractEventLoop = None
+
+
+http_client = HTTPClient()
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create the pooled session used for all OpenAI traffic."""
+    connector = aiohttp.TCPConnector(
+        limit=config.OPENAI_HTTP_POOL_LIMIT,
+        limit_per_host=config.OPENAI_HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=config.OPENAI_HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=config.OPENAI_HTTP_DNS_CACHE_TTL,
+        use_dns_cache=config.OPENAI_HTTP_DNS_CACHE_TTL > 0,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=None, sock_connect=config.OPENAI_HTTP_CONNECT_TIMEOUT
+        ),
+        headers={"Authorization": f"Bearer {config.OPENAI_API_KEY}"},
+    )
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the process-wide HTTP session, creating it on first use.
+
+    The session (and its connection pool) outlives individual requests so that
+    TCP/TLS connections are reused across requests and warm Lambda invocations.
+    It is recreated if it was closed or belongs to a different event loop.
+    """
+    loop = asyncio.get_running_loop()
+    if (
+        http_client.session is None
+        or http_client.session.closed
+        or http_client.loop is not loop
+    ):
+        http_client.session = _create_session()
+        http_client.loop = loop
+    return http_client.session
+
+
+async def close_http_session():
+    """Close the process-wide HTTP session and its connection pool."""
+    if http_client.session and not http_client.session.closed:
+        await http_client.session.close()
+    http_client.session = None
+    http_client.loop = None
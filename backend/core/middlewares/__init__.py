@@ -1,8 +1,10 @@
 from .authentication import AuthBackend, AuthenticationMiddleware
+from .request_size_limit import RequestSizeLimitMiddleware
 from .response_logger import ResponseLoggerMiddleware
 
 __all__ = [
     "ResponseLoggerMiddleware",
     "AuthenticationMiddleware",
     "AuthBackend",
+    "RequestSizeLimitMiddleware",
 ]
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Rejects requests with a body larger than `max_body_size` bytes with a 413.
+
+    Requests that declare a larger Content-Length are rejected before their
+    body is read, and others as soon as the bytes received cross the limit,
+    so an oversized upload is never buffered or spooled in full.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            return await self._reject(scope, receive, send)
+
+        received = 0
+        response_started = False
+
+        async def _limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Routes respond to it like to any other HTTPException
+                    raise HTTPException(
+                        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        detail=self._detail(),
+                    )
+            return message
+
+        async def _tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, _limited_receive, _tracking_send)
+        except HTTPException as e:
+            # The body was read outside a route, e.g. by a middleware
+            if e.status_code != HTTPStatus.REQUEST_ENTITY_TOO_LARGE or response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": self._detail()},
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
+
+    def _detail(self) -> str:
+        return f"Request body larger than {self.max_body_size} bytes."
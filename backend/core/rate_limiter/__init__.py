@@ -0,0 +1,12 @@
+from .base import BaseRateLimiter, RateLimitState
+from .memory_limiter import InMemoryRateLimiter
+from .openai_rate_limiter import get_openai_rate_limiter
+from .redis_limiter import RedisRateLimiter
+
+__all__ = [
+    "BaseRateLimiter",
+    "RateLimitState",
+    "InMemoryRateLimiter",
+    "RedisRateLimiter",
+    "get_openai_rate_limiter",
+]
@@ -0,0 +1,75 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Mapping, Optional
+
+_DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an OpenAI rate-limit reset duration (e.g. "1s", "6m0s", "20ms")
+    into seconds.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitState:
+    """
+    Rate-limit budget reported by OpenAI in the `x-ratelimit-*` response headers.
+    """
+
+    def __init__(self, headers: Mapping[str, str]):
+        self.limit_requests = _parse_int(headers.get("x-ratelimit-limit-requests"))
+        self.limit_tokens = _parse_int(headers.get("x-ratelimit-limit-tokens"))
+        self.remaining_requests = _parse_int(
+            headers.get("x-ratelimit-remaining-requests")
+        )
+        self.remaining_tokens = _parse_int(headers.get("x-ratelimit-remaining-tokens"))
+        self.reset_requests = parse_reset_duration(
+            headers.get("x-ratelimit-reset-requests")
+        )
+        self.reset_tokens = parse_reset_duration(
+            headers.get("x-ratelimit-reset-tokens")
+        )
+
+
+class BaseRateLimiter(ABC):
+    """
+    Shared requests-per-minute / tokens-per-minute budget for an upstream API.
+
+    Callers `acquire` budget before sending a request, so that they wait
+    up front instead of failing with 429s. The budget is kept in sync with the
+    upstream's view through `update_from_headers` and `penalize`.
+    """
+
+    @abstractmethod
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until one request and `tokens` tokens are available and reserve them.
+        Returns the time spent waiting, in seconds.
+        """
+
+    @abstractmethod
+    async def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Reconcile the budget with the `x-ratelimit-*` headers of a response."""
+
+    @abstractmethod
+    async def penalize(self, retry_after: float) -> None:
+        """Hold back every caller for `retry_after` seconds after a 429."""
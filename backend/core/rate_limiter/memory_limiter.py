@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Mapping, Optional
+
+from core.rate_limiter.base import BaseRateLimiter, RateLimitState
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously up to `capacity`, over one minute until
+    the upstream reports when its budget resets.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = float(capacity)
+        self.level = float(capacity)
+        self.refill_rate = self.capacity / 60.0
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.level = min(self.capacity, self.level + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def sync(
+        self, limit: Optional[int], remaining: Optional[int], reset: Optional[float]
+    ) -> None:
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+        # Be full again when the upstream's budget resets, `reset` seconds on
+        if reset and self.level < self.capacity:
+            self.refill_rate = (self.capacity - self.level) / reset
+        else:
+            self.refill_rate = self.capacity / 60.0
+
+
+class InMemoryRateLimiter(BaseRateLimiter):
+    """
+    Rate limiter shared by all coroutines of one process.
+
+    Waiting callers are served in arrival order, so large token reservations
+    are not starved by a stream of small ones.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.blocked_until = 0.0
+        self._lock: asyncio.Lock = None
+        self._loop: asyncio.AbstractEventLoop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Locks are bound to an event loop; recreate it if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self, tokens: int) -> float:
+        started_at = time.monotonic()
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                wait = max(
+                    self.blocked_until - now,
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return now - started_at
+                await asyncio.sleep(wait)
+
+    async def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        state = RateLimitState(headers)
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        self.requests.sync(
+            state.limit_requests, state.remaining_requests, state.reset_requests
+        )
+        self.tokens.sync(state.limit_tokens, state.remaining_tokens, state.reset_tokens)
+
+    async def penalize(self, retry_after: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
@@ -0,0 +1,35 @@
+from redis.asyncio import from_url
+
+from core.config import config
+from core.rate_limiter.base import BaseRateLimiter
+from core.rate_limiter.memory_limiter import InMemoryRateLimiter
+from core.rate_limiter.redis_limiter import RedisRateLimiter
+
+
+class OpenAIRateLimiter:
+    limiter: BaseRateLimiter = None
+
+
+openai_rate_limiter = OpenAIRateLimiter()
+
+
+def get_openai_rate_limiter() -> BaseRateLimiter:
+    """
+    Return the process-wide OpenAI rate limiter, creating it on first use.
+
+    With the "redis" backend the budget is coordinated across Lambda instances;
+    the "memory" backend only coordinates requests within this process.
+    """
+    if openai_rate_limiter.limiter is None:
+        if config.OPENAI_RATE_LIMIT_BACKEND == "redis":
+            openai_rate_limiter.limiter = RedisRateLimiter(
+                redis=from_url(str(config.REDIS_URL)),
+                requests_per_minute=config.OPENAI_REQUESTS_PER_MINUTE,
+                tokens_per_minute=config.OPENAI_TOKENS_PER_MINUTE,
+            )
+        else:
+            openai_rate_limiter.limiter = InMemoryRateLimiter(
+                requests_per_minute=config.OPENAI_REQUESTS_PER_MINUTE,
+                tokens_per_minute=config.OPENAI_TOKENS_PER_MINUTE,
+            )
+    return openai_rate_limiter.limiter
@@ -0,0 +1,162 @@
+import asyncio
+import random
+import time
+from typing import Mapping
+
+from redis.asyncio import Redis
+
+from core.rate_limiter.base import BaseRateLimiter, RateLimitState
+
+# Refills both buckets (at their `rate` per second, by default their capacity
+# over one minute), then reserves one request and ARGV[4] tokens if both have
+# enough budget. Returns the number of seconds to wait (0 if reserved).
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local default_capacities = {tonumber(ARGV[2]), tonumber(ARGV[3])}
+local amounts = {1, tonumber(ARGV[4])}
+local wait = tonumber(redis.call('GET', KEYS[3]) or '0') - now
+local levels, capacities = {}, {}
+for i = 1, 2 do
+    local bucket = redis.call('HMGET', KEYS[i], 'level', 'ts', 'capacity', 'rate')
+    local capacity = tonumber(bucket[3]) or default_capacities[i]
+    local rate = tonumber(bucket[4]) or capacity / 60
+    local level = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    level = math.min(capacity, level + math.max(0, now - updated_at) * rate)
+    amounts[i] = math.min(amounts[i], capacity)
+    if level < amounts[i] then
+        wait = math.max(wait, (amounts[i] - level) / rate)
+    end
+    levels[i] = level
+    capacities[i] = capacity
+end
+for i = 1, 2 do
+    if wait <= 0 then
+        levels[i] = levels[i] - amounts[i]
+    end
+    redis.call('HSET', KEYS[i], 'level', tostring(levels[i]), 'ts', tostring(now),
+        'capacity', tostring(capacities[i]))
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+return tostring(math.max(wait, 0))
+"""
+
+# Refills the bucket, then caps it to the remaining budget reported upstream
+# and sets its rate so that it is full again when the upstream's budget resets
+# (in ARGV[5] seconds).
+_SYNC_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local remaining = tonumber(ARGV[3])
+local reset = tonumber(ARGV[5])
+local bucket = redis.call('HMGET', KEYS[1], 'level', 'ts', 'capacity', 'rate')
+local capacity = limit or tonumber(bucket[3]) or tonumber(ARGV[4])
+local rate = tonumber(bucket[4]) or capacity / 60
+local level = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+level = math.min(capacity, level + math.max(0, now - updated_at) * rate)
+if remaining then
+    level = math.min(level, remaining)
+end
+if reset and reset > 0 and level < capacity then
+    rate = (capacity - level) / reset
+else
+    rate = capacity / 60
+end
+redis.call('HSET', KEYS[1], 'level', tostring(level), 'ts', tostring(now),
+    'capacity', tostring(capacity), 'rate', tostring(rate))
+redis.call('EXPIRE', KEYS[1], 120)
+return 1
+"""
+
+# Blocks every caller until ARGV[1], unless already blocked for longer (so that
+# a shorter Retry-After does not cut a longer block short).
+_PENALIZE_SCRIPT = """
+local blocked_until = tonumber(ARGV[1])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if blocked_until > current then
+    redis.call('SET', KEYS[1], tostring(blocked_until), 'PX', tonumber(ARGV[2]))
+end
+return 1
+"""
+
+
+class RedisRateLimiter(BaseRateLimiter):
+    """
+    Rate limiter whose buckets live in Redis, so that the budget is shared by
+    every process and Lambda instance talking to the same upstream account.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        key_prefix: str = "rate_limit::openai",
+    ):
+        self.redis = redis
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_key = f"{key_prefix}:requests"
+        self.tokens_key = f"{key_prefix}:tokens"
+        self.blocked_until_key = f"{key_prefix}:blocked_until"
+        self._acquire = redis.register_script(_ACQUIRE_SCRIPT)
+        self._sync = redis.register_script(_SYNC_SCRIPT)
+        self._penalize = redis.register_script(_PENALIZE_SCRIPT)
+
+    async def acquire(self, tokens: int) -> float:
+        started_at = time.monotonic()
+        while True:
+            wait = float(
+                await self._acquire(
+                    keys=[self.requests_key, self.tokens_key, self.blocked_until_key],
+                    args=[
+                        time.time(),
+                        self.requests_per_minute,
+                        self.tokens_per_minute,
+                        tokens,
+                    ],
+                )
+            )
+            if wait <= 0:
+                return time.monotonic() - started_at
+            # Jitter so that waiting instances do not retry in lockstep
+            await asyncio.sleep(wait + random.uniform(0, 0.05))
+
+    async def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        state = RateLimitState(headers)
+        now = time.time()
+        for key, limit, remaining, reset, default_capacity in (
+            (
+                self.requests_key,
+                state.limit_requests,
+                state.remaining_requests,
+                state.reset_requests,
+                self.requests_per_minute,
+            ),
+            (
+                self.tokens_key,
+                state.limit_tokens,
+                state.remaining_tokens,
+                state.reset_tokens,
+                self.tokens_per_minute,
+            ),
+        ):
+            if limit is None and remaining is None:
+                continue
+            await self._sync(
+                keys=[key],
+                args=[
+                    now,
+                    "" if limit is None else limit,
+                    "" if remaining is None else remaining,
+                    default_capacity,
+                    "" if reset is None else reset,
+                ],
+            )
+
+    async def penalize(self, retry_after: float) -> None:
+        await self._penalize(
+            keys=[self.blocked_until_key],
+            args=[time.time() + retry_after, max(1, int(retry_after * 1000))],
+        )
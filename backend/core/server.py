@@ -1,3 +1,5 @@
+import logging
+from contextlib import asynccontextmanager
 from typing import List
 
 from fastapi import Depends, FastAPI, Request
@@ -6,16 +8,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from api import router
+from app.container import Container
 from core.cache import Cache, CustomKeyMaker, RedisBackend
 from core.config import config
 from core.dependencies import Logging
 from core.exceptions import CustomException
+from core.executors import shutdown_ingestion_executor
+from core.http_client.session import close_http_session
 from core.middlewares import (
     AuthBackend,
     AuthenticationMiddleware,
+    RequestSizeLimitMiddleware,
     ResponseLoggerMiddleware,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def on_auth_error(request: Request, exc: Exception):
     status_code, error_code, message = 401, None, str(exc)
@@ -61,6 +69,7 @@ def make_middleware() -> List[Middleware]:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["X-Next-Cursor"],
         ),
         Middleware(
             AuthenticationMiddleware,
@@ -68,6 +77,11 @@ def make_middleware() -> List[Middleware]:
             on_error=on_auth_error,
         ),
         Middleware(ResponseLoggerMiddleware),
+        Middleware(
+            RequestSizeLimitMiddleware,
+            # Uploads, plus their form fields and multipart framing
+            max_body_size=config.UPLOAD_MAX_BYTES + 1024 * 1024,
+        ),
     ]
     return middleware
 
@@ -76,6 +90,42 @@ def init_cache() -> None:
     Cache.init(backend=RedisBackend(), key_maker=CustomKeyMaker())
 
 
+class IndexesState:
+    ensured: bool = False
+
+
+indexes_state = IndexesState()
+
+
+async def ensure_indexes() -> None:
+    """
+    Create the declared MongoDB indexes, once per process (they would
+    otherwise cost a round trip per collection each time the app starts).
+    """
+    if not config.MONGODB_ENSURE_INDEXES or indexes_state.ensured:
+        return
+    indexes_state.ensured = True
+    try:
+        await Container.ensure_indexes()
+    except Exception as e:
+        # Serve without them rather than not at all (e.g. if a unique index
+        # cannot be built over duplicates); `python indexes.py` reports why
+        logger.error(f"Could not ensure MongoDB indexes: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    """
+    Startup and shutdown of the API process (uvicorn). The Lambda handler
+    runs without it, so that the HTTP session, the ingestion pools and their
+    admission slots outlive each invocation and are reused by the next.
+    """
+    await ensure_indexes()
+    yield
+    await close_http_session()
+    shutdown_ingestion_executor()
+
+
 def create_app() -> FastAPI:
     app_ = FastAPI(
         title=config.META_APP_NAME,
@@ -85,6 +135,7 @@ def create_app() -> FastAPI:
         redoc_url=("/redoc"),
         dependencies=[Depends(Logging)],
         middleware=make_middleware(),
+        lifespan=lifespan,
     )
     init_routers(app_=app_)
     init_listeners(app_=app_)
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.container import Container
+from core.config import config
+from core.database.mongodb import close_mongo_connection
+
+
+async def ensure_indexes() -> int:
+    """Create the indexes the repositories declare."""
+    try:
+        names = await Container.ensure_indexes()
+        print(f"Ensured {len(names)} indexes")
+        return 0
+    finally:
+        close_mongo_connection()
+
+
+async def check_query_plans() -> int:
+    """
+    Ensure the declared indexes, then explain the repositories' queries and
+    fail if any of them scans a whole collection.
+    """
+    try:
+        await Container.ensure_indexes()
+        plans = await Container.explain_queries()
+    finally:
+        close_mongo_connection()
+
+    for plan in plans:
+        print(
+            f"{'COLLSCAN' if plan.is_collection_scan else 'ok':<10}"
+            f"{plan.repository}: {plan.query} ({' > '.join(plan.stages)})"
+        )
+    collection_scans = [plan for plan in plans if plan.is_collection_scan]
+    if collection_scans:
+        print(f"{len(collection_scans)} of {len(plans)} queries scan a collection")
+        return 1
+    return 0
+
+
+# For local development and deployments
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the MongoDB indexes.")
+    parser.add_argument(
+        "command",
+        choices=["ensure", "check"],
+        help="ensure: create the declared indexes. check: also explain the "
+        "repository queries, failing if any does a collection scan.",
+    )
+    parser.add_argument(
+        "--database",
+        default=config.MONGODB_DATABASES.CORE,
+        help="The database to use, e.g. a test database for `check`.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config.MONGODB_DATABASES.CORE = args.database
+    command = ensure_indexes if args.command == "ensure" else check_query_plans
+    sys.exit(asyncio.run(command()))
@@ -3,8 +3,10 @@ from mangum import Mangum
 from core.config import config
 from core.server import app
 
-# For AWS Lambda (Ignore for local development)
-lambda_handler = Mangum(app)
+# For AWS Lambda (Ignore for local development). Mangum would otherwise run
+# the app's startup and shutdown around every invocation, closing the pooled
+# HTTP session (recreated lazily on use) that warm invocations should reuse
+lambda_handler = Mangum(app, lifespan="off")
 
 # For local development
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.container import Container
+from app.contract.contract_review_queue import MongoReviewJobQueue
+from core.database.mongodb import close_mongo_connection
+from core.http_client.session import close_http_session
+
+
+async def run_review_worker(
+    stop_when_empty: bool = False, deadline: Optional[float] = None
+) -> int:
+    """Process queued contract review jobs from MongoDB."""
+    try:
+        queue = MongoReviewJobQueue(await Container.get_contract_repository())
+        return await queue.run_worker(
+            handler=Container.run_review_job,
+            stop_when_empty=stop_when_empty,
+            deadline=deadline,
+        )
+    finally:
+        await close_http_session()
+        close_mongo_connection()
+
+
+# For AWS Lambda, run every minute by the ReviewWorkerSchedule rule of the
+# backend stack (Ignore for local development)
+def lambda_handler(event, context):
+    # Claim no job that could not finish before the invocation times out
+    deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000
+    processed = asyncio.run(run_review_worker(stop_when_empty=True, deadline=deadline))
+    return {"processed": processed}
+
+
+# For local development
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the contract review worker.")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit once no queued review job is left.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_review_worker(stop_when_empty=args.once))
@@ -10,7 +10,7 @@ import { useParams, useRouter } from '@/routes/hooks';
 import CoreButton from '@/components/core/core-button';
 import { LoadingTopbar } from '@/components/loading-screen';
 import CustomBreadcrumbs from '@/components/custom-breadcrumbs';
-import { ContractReviewPayload } from '@/services/types/contract';
+import { ContractReviewPayload, ContractReviewJobStatus } from '@/services/types/contract';
 
 import { Card, Alert, Select, MenuItem, InputLabel, FormControl } from '@mui/material';
 
@@ -41,6 +41,8 @@ const industryOptions: SelectOption[] = [
   { value: 'healthcare', label: 'Healthcare', disabled: true },
 ];
 
+const REVIEW_JOB_POLL_INTERVAL = 2000;
+
 // ----------------------------------------------------------------------
 
 const ContractIndexView = () => {
@@ -86,7 +88,23 @@ const ContractIndexView = () => {
   const mReviewContract = useMutation({
     mutationKey: 'reviewContract',
     mutationFn: async (input: ContractReviewPayload) => {
-      return await ApiClient.contract.reviewContract(input);
+      // Reviewed by the background worker and polled, as API Gateway buffers
+      // streamed responses and cuts synchronous reviews off after 60s
+      let { data: job } = await ApiClient.contract.createReviewJob(input);
+      while (
+        job.status === ContractReviewJobStatus.QUEUED ||
+        job.status === ContractReviewJobStatus.RUNNING
+      ) {
+        await new Promise((resolve) => setTimeout(resolve, REVIEW_JOB_POLL_INTERVAL));
+        ({ data: job } = await ApiClient.contract.getReviewJob({
+          contractId: input.contractId,
+          jobId: job._id,
+        }));
+      }
+      if (job.status === ContractReviewJobStatus.FAILED) {
+        throw new Error(job.error ?? 'Review failed');
+      }
+      return job;
     },
     onMutate: () => {
       loadingPopup.onToggle();
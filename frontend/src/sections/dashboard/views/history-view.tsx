@@ -1,8 +1,9 @@
 import { paths } from '@/routes/paths';
-import { useQuery } from 'react-query';
+import { useInfiniteQuery } from 'react-query';
 import { useRouter } from '@/routes/hooks';
 import ApiClient from '@/services/api-client';
 import { LoadingTopbar } from '@/components/loading-screen';
+import InfiniteScroll from 'react-infinite-scroll-component';
 import CustomBreadcrumbs from '@/components/custom-breadcrumbs';
 
 import { Alert, Stack } from '@mui/material';
@@ -14,13 +15,17 @@ import FileRecentItem from '../components/file-recent-item';
 const HistoryView = () => {
   const router = useRouter();
 
-  const historyQuery = useQuery({
+  // Pages are followed through the cursor the API returns in `x-next-cursor`
+  const historyQuery = useInfiniteQuery({
     queryKey: ['getAllContracts'],
-    queryFn: async () => {
-      return await ApiClient.contract.getAllContracts({});
+    queryFn: async ({ pageParam }) => {
+      return await ApiClient.contract.getAllContracts({ cursor: pageParam });
     },
+    getNextPageParam: (lastPage) => lastPage.headers['x-next-cursor'] || undefined,
   });
 
+  const contracts = historyQuery.data?.pages.flatMap((page) => page.data) ?? [];
+
   const renderHeader = (
     <CustomBreadcrumbs
       heading="History"
@@ -47,25 +52,33 @@ const HistoryView = () => {
         <Alert severity="info">Loading...</Alert>
       ) : historyQuery.isError ? (
         <Alert severity="error">Error loading history</Alert>
-      ) : !historyQuery?.data?.data?.length ? (
+      ) : !contracts.length ? (
         <Alert severity="info">No contracts found</Alert>
       ) : (
-        <Stack spacing={2}>
-          {historyQuery?.data?.data?.map((file) => (
-            <FileRecentItem
-              key={file._id}
-              file={file}
-              onClick={() => {
-                if (file.has_review) {
-                  router.push(`/dashboard/contract/${file._id}/review`);
-                } else {
-                  router.push(`/dashboard/contract/${file._id}`);
-                }
-              }}
-              onDelete={() => console.info('DELETE', file._id)}
-            />
-          ))}
-        </Stack>
+        <InfiniteScroll
+          dataLength={contracts.length}
+          next={historyQuery.fetchNextPage}
+          hasMore={!!historyQuery.hasNextPage}
+          loader={<LoadingTopbar />}
+          style={{ overflow: 'visible' }}
+        >
+          <Stack spacing={2}>
+            {contracts.map((file) => (
+              <FileRecentItem
+                key={file._id}
+                file={file}
+                onClick={() => {
+                  if (file.has_review) {
+                    router.push(`/dashboard/contract/${file._id}/review`);
+                  } else {
+                    router.push(`/dashboard/contract/${file._id}`);
+                  }
+                }}
+                onDelete={() => console.info('DELETE', file._id)}
+              />
+            ))}
+          </Stack>
+        </InfiniteScroll>
       )}
     </div>
   );
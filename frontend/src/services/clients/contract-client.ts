@@ -4,6 +4,7 @@ import { useAuthStore } from '@/sections/auth/store/auth-store';
 
 import {
   ContractResponse,
+  ContractReviewJob,
   ContractReviewPayload,
   ContractResponseWithReview,
 } from '../types/contract';
@@ -37,18 +38,28 @@ export default class ContractClient {
     });
   }
 
+  /**
+   * Lists the user's contracts, newest first, a page at a time. The cursor of
+   * the next page is returned in the `x-next-cursor` header (absent on the
+   * last page).
+   */
   async getAllContracts({
     page,
     limit,
+    cursor,
   }: {
     page?: number;
     limit?: number;
+    cursor?: string;
   }): Promise<AxiosResponse<ContractResponse[]>> {
     const query = new URLSearchParams();
     if (page && limit) {
       query.append('page', page.toString());
       query.append('limit', limit.toString());
     }
+    if (cursor) {
+      query.append('cursor', cursor);
+    }
 
     const queryStr = query.size ? `?${query.toString()}` : '';
     return this.client.get(`/all${queryStr}`);
@@ -77,6 +88,36 @@ export default class ContractClient {
     return this.client.post(`/${contractId}/review`, payload);
   }
 
+  /**
+   * Queues a review to run in the background. Unlike `reviewContract`, it is
+   * not cut off by the API's 60s timeout; poll `getReviewJob` until it is
+   * completed or failed.
+   */
+  async createReviewJob({
+    contractId,
+    jurisdiction,
+    industry,
+    contractType,
+  }: ContractReviewPayload): Promise<AxiosResponse<ContractReviewJob>> {
+    const payload = {
+      jurisdiction,
+      industry,
+      contract_type: contractType,
+    };
+
+    return this.client.post(`/${contractId}/review/jobs`, payload);
+  }
+
+  async getReviewJob({
+    contractId,
+    jobId,
+  }: {
+    contractId: string;
+    jobId: string;
+  }): Promise<AxiosResponse<ContractReviewJob>> {
+    return this.client.get(`/${contractId}/review/jobs/${jobId}`);
+  }
+
   async getContractReview({
     contractId,
   }: {
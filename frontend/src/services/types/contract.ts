@@ -18,6 +18,13 @@ export enum ContractJurisdiction {
   OTHER = 'other',
 }
 
+export enum ContractReviewJobStatus {
+  QUEUED = 'queued',
+  RUNNING = 'running',
+  COMPLETED = 'completed',
+  FAILED = 'failed',
+}
+
 export interface Clause {
   key: string; // The key of the clause e.g. "1.1" or "2.3.4"
   content: string;
@@ -80,3 +87,16 @@ export interface ContractExplainClauseRequest {
 export interface ContractResponseWithReview extends ContractResponse {
   review: ContractReview | null;
 }
+
+export interface ContractReviewJob {
+  _id: string;
+  contract_id: string;
+  status: ContractReviewJobStatus;
+  batches_done: number;
+  total_batches: number | null;
+  risky_clauses: Clause[];
+  review_id: string | null;
+  error: string | null;
+  created_at: Date;
+  updated_at: Date;
+}
@@ -2,6 +2,8 @@ import * as targets from 'aws-cdk-lib/aws-route53-targets';
 import * as apigateway from 'aws-cdk-lib/aws-apigateway';
 import * as acm from 'aws-cdk-lib/aws-certificatemanager';
 import * as route53 from 'aws-cdk-lib/aws-route53';
+import * as events from 'aws-cdk-lib/aws-events';
+import * as eventTargets from 'aws-cdk-lib/aws-events-targets';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
 import * as iam from 'aws-cdk-lib/aws-iam';
 import * as cdk from 'aws-cdk-lib';
@@ -60,12 +62,31 @@ export class BackendStack extends cdk.Stack {
       layers: [backendLayer],
     });
 
-    backendLambda.addToRolePolicy(new iam.PolicyStatement({
-      actions: ['secretsmanager:GetSecretValue'],
-      resources: [
-        `arn:aws:secretsmanager:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:secret:backend/base-*`
-      ],
-    }));
+    // Processes background review jobs queued in MongoDB (see backend/worker.py)
+    const workerLambda = new lambda.Function(this, 'ReviewWorkerLambda', {
+      runtime: lambda.Runtime.PYTHON_3_11,
+      architecture: lambda.Architecture.X86_64,
+      handler: 'worker.lambda_handler',
+      code: lambda.Code.fromAsset(path.join(__dirname, '..', '..', 'backend', 'dist', 'lambda', 'lambda.zip')),
+      environment: ENV_VARS,
+      memorySize: 512,
+      timeout: cdk.Duration.minutes(15),
+      layers: [backendLayer],
+    });
+
+    new events.Rule(this, 'ReviewWorkerSchedule', {
+      schedule: events.Schedule.rate(cdk.Duration.minutes(1)),
+      targets: [new eventTargets.LambdaFunction(workerLambda, { retryAttempts: 0 })],
+    });
+
+    for (const fn of [backendLambda, workerLambda]) {
+      fn.addToRolePolicy(new iam.PolicyStatement({
+        actions: ['secretsmanager:GetSecretValue'],
+        resources: [
+          `arn:aws:secretsmanager:${cdk.Aws.REGION}:${cdk.Aws.ACCOUNT_ID}:secret:backend/base-*`
+        ],
+      }));
+    }
 
     const certificate = new acm.Certificate(this, 'ApiCertificate', {
       domainName: `api.${this.stage}.jurisai.uk`,